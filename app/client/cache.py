@@ -0,0 +1,83 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.utils.cache import CacheEntry, LRUCache
+
+# Loader result: (payload, etag), or NOT_MODIFIED when the upstream answered 304
+NOT_MODIFIED = object()
+Loader = Callable[[Optional[str]], Awaitable[Any]]
+
+
+class UpstreamCache:
+    """
+    Response cache for upstream API calls.
+
+    Fresh entries are served from memory, expired ones are revalidated with
+    their ETag, and concurrent misses for the same key share one in-flight
+    request (single-flight) instead of each going upstream.
+    """
+
+    def __init__(self, max_entries: int):
+        self._store = LRUCache(max_entries)
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.revalidated = 0
+
+    async def fetch(self, key: str, ttl: float, loader: Loader) -> Any:
+        """
+        Return the cached payload for key, loading it at most once concurrently
+        """
+        entry = self._store.get(key)
+        if entry is not None and entry.fresh:
+            self.hits += 1
+            return entry.value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            inflight = asyncio.ensure_future(self._load(key, ttl, loader, entry))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield so a cancelled caller does not cancel the load shared by the others
+        return await asyncio.shield(inflight)
+
+    async def _load(self, key: str, ttl: float, loader: Loader, stale: Optional[CacheEntry]) -> Any:
+        etag = stale.etag if stale is not None else None
+        result = await loader(etag)
+        if result is NOT_MODIFIED and stale is None:
+            # Nothing cached to answer a 304 with: treat it as a miss and fetch without a validator
+            result = await loader(None)
+        if result is NOT_MODIFIED:
+            if stale is None:
+                raise RuntimeError(f"Upstream answered 304 to an unconditional request for {key}")
+            self.revalidated += 1
+            payload = stale.value
+        else:
+            payload, etag = result
+        self._store.set(key, payload, ttl, etag)
+        return payload
+
+    def invalidate(self, key: str) -> None:
+        self._store.delete(key)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters for sizing the cache
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "revalidated": self.revalidated,
+            "evictions": self._store.evictions,
+            "entries": len(self._store),
+            "max_entries": self._store.max_entries,
+        }
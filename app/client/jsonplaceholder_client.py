@@ -1,61 +1,139 @@
 import httpx
-from typing import List, Optional
+from time import perf_counter
+from typing import Any, Dict, List, Optional
 from app.schemas.jsonplaceholder import PostRequest, PostResponse, UserResponse
+from app.client.cache import NOT_MODIFIED, UpstreamCache
+from app.client.http import create_http_client
+from app.config.settings import settings
 from app.config.logger import logger
+from app.utils.metrics import registry
+
+upstream_duration = registry.histogram(
+    "upstream_request_duration_seconds", "Latency of upstream API calls", ["client", "endpoint", "method", "status"]
+)
 
 
 class JSONPlaceholderClient:
     """Client for interacting with the JSONPlaceholder API"""
-    
+
     BASE_URL = "https://jsonplaceholder.typicode.com"
-    
+
+    # Shared pooled client, created on first use (or injected) and closed by the application lifespan
+    _http_client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def configure(cls, http_client: Optional[httpx.AsyncClient]) -> None:
+        """Inject the shared HTTP client (None to detach it)"""
+        cls._http_client = http_client
+
+    @classmethod
+    def _client(cls) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if cls._http_client is None:
+            cls._http_client = create_http_client()
+        return cls._http_client
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared HTTP client, if one was created"""
+        http_client, cls._http_client = cls._http_client, None
+        if http_client is not None:
+            await http_client.aclose()
+
+    # Cached GET responses, shared by concurrent callers
+    _cache = UpstreamCache(settings.UPSTREAM_CACHE_MAX_ENTRIES)
+
+    @classmethod
+    async def _request(cls, method: str, path: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the shared client, recording its latency per endpoint"""
+        started = perf_counter()
+        status = "error"
+        try:
+            response = await cls._client().request(method, f"{cls.BASE_URL}{path}", **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            upstream_duration.observe(
+                perf_counter() - started, client="jsonplaceholder", endpoint=endpoint, method=method, status=status
+            )
+
+    @classmethod
+    async def _get_json(cls, path: str, endpoint: str, ttl: float) -> Any:
+        """GET a JSON payload through the response cache"""
+        async def load(etag: Optional[str]) -> Any:
+            headers = {"If-None-Match": etag} if etag else None
+            response = await cls._request("GET", path, endpoint, headers=headers)
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                return NOT_MODIFIED
+            response.raise_for_status()
+            return response.json(), response.headers.get("ETag")
+
+        if not settings.UPSTREAM_CACHE_ENABLED:
+            payload, _ = await load(None)
+            return payload
+        return await cls._cache.fetch(path, ttl, load)
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        """Hit/miss/coalesce counters of the response cache"""
+        return cls._cache.stats()
+
     @classmethod
     async def get_posts(cls) -> List[PostResponse]:
         """Get all posts from JSONPlaceholder API"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{cls.BASE_URL}/posts")
-                response.raise_for_status()
-                return [PostResponse(**post) for post in response.json()]
-            except httpx.HTTPError as e:
-                logger.error(f"Error fetching posts: {str(e)}")
-                raise
-    
+        try:
+            posts = await cls._get_json("/posts", "/posts", settings.UPSTREAM_CACHE_TTL_POSTS)
+            return [PostResponse(**post) for post in posts]
+        except httpx.HTTPError as e:
+            logger.error("Error fetching posts: %s", e)
+            raise
+
     @classmethod
     async def get_post(cls, post_id: int) -> Optional[PostResponse]:
         """Get a specific post by ID from JSONPlaceholder API"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{cls.BASE_URL}/posts/{post_id}")
-                response.raise_for_status()
-                return PostResponse(**response.json())
-            except httpx.HTTPError as e:
-                logger.error(f"Error fetching post {post_id}: {str(e)}")
-                raise
-    
+        try:
+            post = await cls._get_json(f"/posts/{post_id}", "/posts/{post_id}", settings.UPSTREAM_CACHE_TTL_POST)
+            return PostResponse(**post)
+        except httpx.HTTPError as e:
+            logger.error("Error fetching post %s: %s", post_id, e)
+            raise
+
     @classmethod
     async def create_post(cls, post_data: PostRequest) -> PostResponse:
         """Create a new post on JSONPlaceholder API"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{cls.BASE_URL}/posts",
-                    json=post_data.model_dump()
-                )
-                response.raise_for_status()
-                return PostResponse(**response.json())
-            except httpx.HTTPError as e:
-                logger.error(f"Error creating post: {str(e)}")
-                raise
-    
+        try:
+            response = await cls._request("POST", "/posts", "/posts", json=post_data.model_dump())
+            response.raise_for_status()
+            cls._cache.invalidate("/posts")
+            return PostResponse(**response.json())
+        except httpx.HTTPError as e:
+            logger.error("Error creating post: %s", e)
+            raise
+
     @classmethod
     async def get_user(cls, user_id: int) -> Optional[UserResponse]:
         """Get a specific user by ID from JSONPlaceholder API"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{cls.BASE_URL}/users/{user_id}")
-                response.raise_for_status()
-                return UserResponse(**response.json())
-            except httpx.HTTPError as e:
-                logger.error(f"Error fetching user {user_id}: {str(e)}")
-                raise
+        try:
+            user = await cls._get_json(f"/users/{user_id}", "/users/{user_id}", settings.UPSTREAM_CACHE_TTL_USER)
+            return UserResponse(**user)
+        except httpx.HTTPError as e:
+            logger.error("Error fetching user %s: %s", user_id, e)
+            raise
+
+
+registry.callback(
+    "upstream_cache_events_total",
+    "Upstream response cache hits, misses, coalesced and revalidated requests, and evictions",
+    lambda: {
+        ("jsonplaceholder", event): JSONPlaceholderClient.cache_stats()[event]
+        for event in ("hits", "misses", "coalesced", "revalidated", "evictions")
+    },
+    ["client", "event"],
+    kind="counter",
+)
+registry.callback(
+    "upstream_cache_entries",
+    "Entries held by the upstream response cache",
+    lambda: {("jsonplaceholder",): JSONPlaceholderClient.cache_stats()["entries"]},
+    ["client"],
+)
@@ -1,25 +1,290 @@
-from sqlalchemy import create_engine
+from contextlib import asynccontextmanager
+import re
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Sequence, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Row, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, Session, SessionTransaction
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool
 
 from app.config.settings import settings
+from app.config.instrumentation import instrument_engine
+
+# Async driver used for each sync driver when DATABASE_ASYNC is enabled
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Translate a sync database URL into its async driver equivalent
+    """
+    parsed = make_url(url)
+    if parsed.get_dialect().is_async:
+        return url
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for database URL {url!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Engine keyword arguments for the configured database profile
+    """
+    if _is_sqlite(url):
+        # Sessions are used from the threadpool, not only the thread that opened them
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas() -> Dict[str, str]:
+    """
+    SQLite pragmas from the engine profile, skipping the ones left empty
+    """
+    pragmas = {
+        "journal_mode": settings.DB_SQLITE_JOURNAL_MODE,
+        "synchronous": settings.DB_SQLITE_SYNCHRONOUS,
+        "cache_size": settings.DB_SQLITE_CACHE_SIZE,
+        "mmap_size": settings.DB_SQLITE_MMAP_SIZE,
+        "busy_timeout": settings.DB_SQLITE_BUSY_TIMEOUT,
+        "temp_store": settings.DB_SQLITE_TEMP_STORE,
+    }
+    for name, value in pragmas.items():
+        if value and not re.fullmatch(r"-?\w+", value):
+            raise ValueError(f"Invalid value {value!r} for SQLite pragma {name}")
+    return {name: value for name, value in pragmas.items() if value}
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    Apply the SQLite pragmas to each new DBAPI connection
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
 
-# Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL)
+
+# Create SQLAlchemy engine (used by migrations, schema creation and the sync session path)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+
+# Create async engine for the default non-blocking session path
+async_engine = (
+    create_async_engine(to_async_url(settings.DATABASE_URL), **_engine_options(settings.DATABASE_URL, is_async=True))
+    if settings.DATABASE_ASYNC
+    else None
+)
+
+if _is_sqlite(settings.DATABASE_URL):
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    if async_engine is not None:
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
 
 # Create Base class for models
 Base = declarative_base()
 
-# Create sessionmaker
+# DB_SCHEMA_INIT values
+SCHEMA_INIT_MODES = ("create", "check", "skip")
+
+
+def create_tables() -> None:
+    """
+    Create the missing tables (with their indexes and triggers) of every model imported so far
+    """
+    Base.metadata.create_all(bind=engine)
+
+
+def schema_fingerprint() -> int:
+    """
+    Checksum of the tables, columns, indexes and DDL hooks of every model imported so far
+    """
+    parts: List[str] = [getattr(listener, "statement", "") for listener in Base.metadata.dispatch.after_create]
+    for table in Base.metadata.sorted_tables:
+        parts.append(table.name)
+        parts.extend(f"{column.name} {column.type!r} {column.nullable}" for column in table.columns)
+        parts.extend(
+            f"{index.name} {[column.name for column in index.columns]}"
+            for index in sorted(table.indexes, key=lambda index: index.name)
+        )
+        parts.extend(getattr(listener, "statement", "") for listener in table.dispatch.after_create)
+    # PRAGMA user_version holds a signed 32-bit integer
+    return zlib.crc32("\n".join(parts).encode()) & 0x7FFFFFFF
+
+
+def init_schema(mode: str) -> None:
+    """
+    Startup schema setup for a DB_SCHEMA_INIT mode.
+
+    "check" records the schema fingerprint in SQLite's user_version once the
+    tables are created, so later starts only read one pragma instead of
+    inspecting every table and re-running the DDL hooks; other databases
+    fall back to "create".
+    """
+    if mode not in SCHEMA_INIT_MODES:
+        raise ValueError(f"Unknown DB_SCHEMA_INIT {mode!r}, expected one of {', '.join(SCHEMA_INIT_MODES)}")
+    if mode == "skip":
+        return
+    if mode == "check" and _is_sqlite(settings.DATABASE_URL):
+        fingerprint = schema_fingerprint()
+        with engine.connect() as connection:
+            if connection.exec_driver_sql("PRAGMA user_version").scalar() == fingerprint:
+                return
+        create_tables()
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f"PRAGMA user_version = {fingerprint}")
+        return
+    create_tables()
+
+
+# Create sessionmakers
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
 
-# Dependency
-def get_db():
+
+class ThreadedSession:
     """
-    Dependency for getting a database session
+    Awaitable facade over a synchronous Session.
+
+    Each database call is offloaded to the threadpool so the sync driver never
+    blocks the event loop, while services keep a single ``await db.execute(...)``
+    code path for both session types.
     """
-    db = SessionLocal()
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Any) -> None:
+        self.sync_session.add_all(instances)
+
+    def get_bind(self) -> Any:
+        return self.sync_session.get_bind()
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.execute, *args, **kwargs)
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.scalar, *args, **kwargs)
+
+    async def scalars(self, *args: Any, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.scalars, *args, **kwargs)
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.get, *args, **kwargs)
+
+    async def delete(self, instance: Any) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def begin_nested(self) -> "ThreadedTransaction":
+        return ThreadedTransaction(await run_in_threadpool(self.sync_session.begin_nested))
+
+    async def refresh(self, instance: Any) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+class ThreadedTransaction:
+    """
+    Awaitable facade over a (nested) SessionTransaction of a ThreadedSession
+    """
+
+    def __init__(self, transaction: SessionTransaction):
+        self.sync_transaction = transaction
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_transaction.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_transaction.rollback)
+
+
+# Session type handed to services, whichever path is configured
+DbSession = Union[AsyncSession, ThreadedSession]
+
+
+async def iter_partitions(db: DbSession, stmt: Select, size: int) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream the rows of a query in partitions of ``size`` from a server-side cursor,
+    so memory stays constant whatever the number of rows
+    """
+    stmt = stmt.execution_options(yield_per=size)
+    if isinstance(db, ThreadedSession):
+        result = await db.execute(stmt)
+        partitions = result.partitions()
+        while True:
+            partition = await run_in_threadpool(next, partitions, None)
+            if partition is None:
+                break
+            yield partition
+        return
+
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        yield partition
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[DbSession]:
+    """
+    Open a database session for the configured (async or sync) path
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = ThreadedSession(SessionLocal(expire_on_commit=False))
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+# Dependency
+async def get_db() -> AsyncIterator[DbSession]:
+    """
+    Dependency for getting a database session
+    """
+    async with session_scope() as db:
+        yield db
+
+
+instrument_engine(engine, "sync")
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine, "async")
@@ -0,0 +1,81 @@
+from time import perf_counter
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.settings import settings
+from app.config.logger import logger
+from app.utils.metrics import LabelValues, registry
+from app.utils.timing import current_timings
+
+query_duration = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ["engine", "operation"]
+)
+pool_checkouts = registry.counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool", ["engine"]
+)
+pool_connections_created = registry.counter(
+    "db_pool_connections_created_total", "New DBAPI connections opened by the pool", ["engine"]
+)
+pool_checked_out = registry.gauge(
+    "db_pool_connections_checked_out", "Connections currently checked out of the pool", ["engine"]
+)
+
+_instrumented: Dict[str, Engine] = {}
+
+
+def _operation(statement: str) -> str:
+    """
+    Low-cardinality label for a SQL statement (SELECT, INSERT, ...)
+    """
+    words = statement.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def _pool_sizes() -> Dict[LabelValues, float]:
+    sizes = {}
+    for name, engine in _instrumented.items():
+        size = getattr(engine.pool, "size", None)
+        if callable(size):
+            sizes[(name,)] = size()
+    return sizes
+
+
+registry.callback("db_pool_size", "Configured size of the connection pool", _pool_sizes, ["engine"])
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Record statement timings, slow queries and pool checkout stats for an engine
+    """
+    _instrumented[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        context._query_started = perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        duration = perf_counter() - context._query_started
+        query_duration.observe(duration, engine=name, operation=_operation(statement))
+
+        timings = current_timings.get()
+        if timings is not None:
+            timings.add_sql(duration)
+
+        if settings.SLOW_QUERY_THRESHOLD_MS and duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            logger.warning("Slow query (%.1f ms on %s engine): %s", duration * 1000, name, statement)
+
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection: Any, connection_record: Any) -> None:
+        pool_connections_created.inc(engine=name)
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        pool_checkouts.inc(engine=name)
+        pool_checked_out.inc(engine=name)
+
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        pool_checked_out.dec(engine=name)
@@ -1,26 +1,162 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from time import monotonic
+from typing import Any, Dict, List, Optional
 
 from app.config.settings import settings
+from app.utils.metrics import registry
+from app.utils.request_context import current_request
+
+dropped_records = registry.counter(
+    "log_records_dropped_total", "Log records dropped by rate limiting or a full log queue", ["reason"]
+)
+
+# LogRecord attributes that are not extra fields
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger and message, then the
+    request context and any extra fields passed to the logging call
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in record.__dict__.items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Attach the current request's ID and elapsed time to records logged while handling it
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = current_request.get()
+        if context is not None:
+            record.request_id = context.request_id
+            record.elapsed_ms = round(context.elapsed_ms(), 2)
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most `limit` records per category every `window` seconds.
+
+    Only records logged with a category (extra={"category": ...}, e.g. an
+    error code) are limited. The first record let through after some were
+    dropped carries their number in its `suppressed` field.
+    """
+
+    def __init__(self, limit: int, window: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        # category -> [window start, records let through, records dropped]
+        self._windows: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+        if category is None or self.limit <= 0:
+            return True
+        now = monotonic()
+        with self._lock:
+            state = self._windows.get(category)
+            if state is None or now - state[0] >= self.window:
+                state = self._windows[category] = [now, 0, state[2] if state else 0]
+            if state[1] >= self.limit:
+                state[2] += 1
+                dropped_records.inc(reason="rate_limited")
+                return False
+            state[1] += 1
+            suppressed, state[2] = state[2], 0
+        if suppressed:
+            record.suppressed = int(suppressed)
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Hand records to the background listener without formatting them.
+
+    The queue never leaves the process, so records need not be made
+    picklable: the message is merged with its arguments (and rendered) by the
+    listener thread. When the queue is full the record is dropped and counted
+    rather than blocking the request.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records.inc(reason="queue_full")
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    Queue listener that waits for room for its stop sentinel, so a full queue is still drained on exit
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+# Background thread writing the queued records, when LOG_QUEUE_ENABLED is set
+_listener: Optional[QueueListener] = None
+
+
+def _formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter("%(levelname)s: %(message)s")
+
 
 # Configure logger
 def setup_logger():
+    global _listener
     logger = logging.getLogger("app")
-    logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
-    
-    # Create formatter for console output
-    console_formatter = logging.Formatter(
-        "%(levelname)s: %(message)s"
-    )
-    
-    # Create console handler only
+    level = logging.DEBUG if settings.DEBUG else settings.LOG_LEVEL.upper()
+    logger.setLevel(level)
+
+    # Create console handler (it writes from the background listener when the queue is enabled)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(console_formatter)
-    console_handler.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
-    
+    console_handler.setFormatter(_formatter(settings.LOG_FORMAT.lower()))
+    console_handler.setLevel(level)
+
+    if settings.LOG_QUEUE_ENABLED:
+        handler: logging.Handler = DeferredQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+        _listener = DrainingQueueListener(handler.queue, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    else:
+        handler = console_handler
+
+    # Handler filters run in the thread making the logging call, where the request context is
+    # visible; records dropped by the rate limit never reach the queue
+    handler.addFilter(RateLimitFilter(settings.LOG_RATE_LIMIT, settings.LOG_RATE_LIMIT_WINDOW))
+    handler.addFilter(RequestContextFilter())
+
     # Add handler to logger
-    logger.addHandler(console_handler)
-    
+    logger.addHandler(handler)
+
     return logger
 
 # Create logger instance
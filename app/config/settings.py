@@ -1,10 +1,15 @@
 from pydantic_settings import BaseSettings
+from pathlib import Path
 from typing import List
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from the project's .env file, when there is one
+# (deployments configured through the environment skip importing python-dotenv)
+ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
+if ENV_FILE.is_file():
+    from dotenv import load_dotenv
+
+    load_dotenv(ENV_FILE)
 
 class Settings(BaseSettings):
     # Application settings
@@ -17,13 +22,147 @@ class Settings(BaseSettings):
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
     
+    # Worker processes started by the launcher (python main.py / python -m app.server);
+    # 0 starts one per CPU. Workers get GRACEFUL_SHUTDOWN_TIMEOUT seconds to finish
+    # in-flight requests when stopped or replaced
+    WORKERS: int = int(os.getenv("WORKERS", "0"))
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+
     # CORS settings
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
         "http://localhost:8000",
     ]
     
+    # Response class for routes without their own: "json" keeps FastAPI's default (Pydantic
+    # serializes response models directly), "fast" renders every response with orjson
+    DEFAULT_RESPONSE_CLASS: str = os.getenv("DEFAULT_RESPONSE_CLASS", "json")
+
+    # Response compression: codings in server preference order (br needs the brotli package,
+    # zstd the zstandard package; missing ones are skipped), applied to the listed media types
+    # when the body is at least COMPRESSION_MINIMUM_SIZE bytes (streamed bodies always)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "True").lower() == "true"
+    COMPRESSION_ENCODINGS: List[str] = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "500"))
+    COMPRESSION_CONTENT_TYPES: List[str] = os.getenv(
+        "COMPRESSION_CONTENT_TYPES", "application/json,application/x-ndjson,text/csv,text/html,text/plain"
+    ).split(",")
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "3"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+    # Admission control: at most ADMISSION_MAX_CONCURRENCY requests run at once, up to
+    # ADMISSION_MAX_QUEUE more wait (reads before writes) for ADMISSION_QUEUE_TIMEOUT seconds,
+    # the rest get 503 with Retry-After; ADMISSION_BYPASS_PATHS are always admitted
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "False").lower() == "true"
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "256"))
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+    ADMISSION_BYPASS_PATHS: List[str] = os.getenv("ADMISSION_BYPASS_PATHS", "/healthz,/metrics").split(",")
+
+    # Per-client rate limit (token bucket): RATE_LIMIT_RATE (> 0) requests per second with bursts of
+    # RATE_LIMIT_BURST (>= 1), keyed by the RATE_LIMIT_KEY_HEADER header (client address when empty);
+    # over the limit, 429 with Retry-After
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "False").lower() == "true"
+    RATE_LIMIT_RATE: float = float(os.getenv("RATE_LIMIT_RATE", "50"))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "100"))
+    RATE_LIMIT_KEY_HEADER: str = os.getenv("RATE_LIMIT_KEY_HEADER", "")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+
+    # Expose Prometheus metrics at /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
+    # Request profiling: Server-Timing breakdowns, on-demand cProfile captures
+    # (per request via PROFILING_HEADER or sampled) and the slow-query log (0 disables it)
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "False").lower() == "true"
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "False").lower() == "true"
+    PROFILING_HEADER: str = os.getenv("PROFILING_HEADER", "X-Profile")
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_MAX_STORED: int = int(os.getenv("PROFILING_MAX_STORED", "50"))
+    PROFILING_TOP_FUNCTIONS: int = int(os.getenv("PROFILING_TOP_FUNCTIONS", "50"))
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./tasks.db")
+    # Use the async driver (e.g. aiosqlite) instead of the sync Session in the threadpool
+    DATABASE_ASYNC: bool = os.getenv("DATABASE_ASYNC", "True").lower() == "true"
+
+    # Schema setup when the app is created: "create" creates missing tables, "check" only
+    # does so when the schema recorded in the database (SQLite) differs from the models,
+    # "skip" leaves it to the launcher (which does it once before starting workers) or to Alembic
+    DB_SCHEMA_INIT: str = os.getenv("DB_SCHEMA_INIT", "create")
+
+    # Database engine profile: SQLite pragmas applied on every new connection
+    # (leave a value empty to keep SQLite's default)
+    DB_SQLITE_JOURNAL_MODE: str = os.getenv("DB_SQLITE_JOURNAL_MODE", "WAL")
+    DB_SQLITE_SYNCHRONOUS: str = os.getenv("DB_SQLITE_SYNCHRONOUS", "NORMAL")
+    DB_SQLITE_CACHE_SIZE: str = os.getenv("DB_SQLITE_CACHE_SIZE", "-64000")
+    DB_SQLITE_MMAP_SIZE: str = os.getenv("DB_SQLITE_MMAP_SIZE", "268435456")
+    DB_SQLITE_BUSY_TIMEOUT: str = os.getenv("DB_SQLITE_BUSY_TIMEOUT", "5000")
+    DB_SQLITE_TEMP_STORE: str = os.getenv("DB_SQLITE_TEMP_STORE", "MEMORY")
+
+    # Database engine profile: connection pool for server databases
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+
+    # Rows fetched per round-trip when streaming task exports
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    # Rows inserted per transaction by task imports, and rejected lines reported back
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+
+    # Group commit: queue concurrent single-task writes and commit them together, once
+    # WRITE_BATCH_MAX_SIZE writes are queued or WRITE_BATCH_WINDOW_MS after the first one
+    WRITE_BATCH_ENABLED: bool = os.getenv("WRITE_BATCH_ENABLED", "False").lower() == "true"
+    WRITE_BATCH_MAX_SIZE: int = int(os.getenv("WRITE_BATCH_MAX_SIZE", "100"))
+    WRITE_BATCH_WINDOW_MS: float = float(os.getenv("WRITE_BATCH_WINDOW_MS", "2"))
+
+    # Task read cache settings (TTL in seconds)
+    TASK_CACHE_ENABLED: bool = os.getenv("TASK_CACHE_ENABLED", "True").lower() == "true"
+    TASK_CACHE_MAX_ENTRIES: int = int(os.getenv("TASK_CACHE_MAX_ENTRIES", "10000"))
+    TASK_CACHE_TTL: float = float(os.getenv("TASK_CACHE_TTL", "30"))
+
+    # Task change feed (GET /api/tasks/events, WebSocket /api/tasks/events/ws): "memory" keeps
+    # it per process, "database" shares it between workers through the task_events table (polled
+    # every EVENTS_POLL_INTERVAL seconds). Subscribers buffering more than EVENTS_BUFFER_SIZE events
+    # are disconnected; the last EVENTS_HISTORY_SIZE events are kept for Last-Event-ID resumption
+    EVENTS_ENABLED: bool = os.getenv("EVENTS_ENABLED", "True").lower() == "true"
+    EVENTS_BROKER: str = os.getenv("EVENTS_BROKER", "memory")
+    EVENTS_BUFFER_SIZE: int = int(os.getenv("EVENTS_BUFFER_SIZE", "2000"))
+    EVENTS_HISTORY_SIZE: int = int(os.getenv("EVENTS_HISTORY_SIZE", "10000"))
+    EVENTS_HEARTBEAT: float = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+    EVENTS_POLL_INTERVAL: float = float(os.getenv("EVENTS_POLL_INTERVAL", "0.25"))
+
+    # External HTTP client settings (shared connection pool)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "30"))
+    HTTP_CLIENT_TIMEOUT: float = float(os.getenv("HTTP_CLIENT_TIMEOUT", "10"))
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT", "5"))
+    HTTP_CLIENT_HTTP2: bool = os.getenv("HTTP_CLIENT_HTTP2", "False").lower() == "true"
+
+    # Upstream response cache settings (TTLs in seconds)
+    UPSTREAM_CACHE_ENABLED: bool = os.getenv("UPSTREAM_CACHE_ENABLED", "True").lower() == "true"
+    UPSTREAM_CACHE_MAX_ENTRIES: int = int(os.getenv("UPSTREAM_CACHE_MAX_ENTRIES", "1024"))
+    UPSTREAM_CACHE_TTL_POSTS: float = float(os.getenv("UPSTREAM_CACHE_TTL_POSTS", "60"))
+    UPSTREAM_CACHE_TTL_POST: float = float(os.getenv("UPSTREAM_CACHE_TTL_POST", "300"))
+    UPSTREAM_CACHE_TTL_USER: float = float(os.getenv("UPSTREAM_CACHE_TTL_USER", "300"))
+
+    # Logging settings: "text" or "json" (one object per line, with the request ID and
+    # time since the request started); records are written from a background thread
+    # through a queue of LOG_QUEUE_SIZE records (overflow is dropped and counted)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    LOG_QUEUE_ENABLED: bool = os.getenv("LOG_QUEUE_ENABLED", "True").lower() == "true"
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Error logs of each category (error code) beyond LOG_RATE_LIMIT per LOG_RATE_LIMIT_WINDOW
+    # seconds are dropped, the next one reporting how many were; 0 disables the limit
+    LOG_RATE_LIMIT: int = int(os.getenv("LOG_RATE_LIMIT", "10"))
+    LOG_RATE_LIMIT_WINDOW: float = float(os.getenv("LOG_RATE_LIMIT_WINDOW", "1"))
+    # Log one structured line per request (method, route, status, duration)
+    ACCESS_LOG_ENABLED: bool = os.getenv("ACCESS_LOG_ENABLED", "False").lower() == "true"
 
 settings = Settings()
@@ -1,64 +1,362 @@
-from fastapi import Depends, Query, Path, status
-from sqlalchemy.orm import Session
-from typing import List
+import asyncio
+from fastapi import Depends, Header, Query, Path, Request, Response, WebSocket, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import AsyncContextManager, AsyncIterator, List, Optional
 
-from app.schemas.task import TaskResponse, TaskCreate, TaskUpdate
+from app.schemas.task import (
+    TaskResponse, TaskCreate, TaskUpdate, TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskBulkResponse,
+    TaskFileFormat, TaskImportResult, TaskSort, TaskFilter, TaskStatsResponse,
+    TaskChangesResponse
+)
 from app.services.task_service import TaskService
-from app.config.database import get_db
+from app.config.database import DbSession, get_db
+from app.config.settings import settings
+from app.utils.conditional import REVALIDATE, http_date, is_not_modified, parse_etags
+from app.utils.errors import AppException
+from app.utils.events import Subscription, SubscriptionClosed, format_sse
+from app.utils.responses import FastJSONResponse
+from app.utils.timing import timed
 
 class TaskController:
     """
     Controller for handling task-related HTTP requests
     """
     
+    NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+    COLLECTION_ETAG_PREFIX = "tasks-"
+
+    # WebSocket close codes: going away (shutdown) and try again later (fell behind)
+    WS_CLOSE_CODES = {"shutdown": 1001, "slow_consumer": 1013}
+
+    EXPORT_MEDIA_TYPES = {
+        TaskFileFormat.NDJSON: "application/x-ndjson",
+        TaskFileFormat.CSV: "text/csv",
+    }
+
+    @staticmethod
+    def _task_etag(task: TaskResponse) -> str:
+        """
+        Strong ETag of a task revision
+        """
+        return f'"{task.id}-{task.version}"'
+
+    @staticmethod
+    def _expected_versions(task_id: int, if_match: Optional[str]) -> Optional[List[int]]:
+        """
+        Task versions an If-Match header accepts; None when any version does
+        (no header, or "*"). Tags of other tasks or other resources match nothing.
+        """
+        tags = parse_etags(if_match)
+        if not tags or "*" in tags:
+            return None
+        versions = []
+        for tag in tags:
+            if tag.startswith("W/"):
+                continue
+            tag_id, _, version = tag.strip('"').partition("-")
+            if tag_id == str(task_id) and version.isdigit():
+                versions.append(int(version))
+        return versions
+
+    @staticmethod
+    def _not_modified(headers: dict) -> Response:
+        """
+        Empty 304 response repeating the validators
+        """
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
     @staticmethod
     async def get_tasks(
+        request: Request,
         skip: int = Query(0, ge=0, description="Number of tasks to skip"),
         limit: int = Query(100, ge=1, le=100, description="Maximum number of tasks to return"),
-        db: Session = Depends(get_db)
-    ) -> List[TaskResponse]:
+        cursor: Optional[str] = Query(None, description="Opaque cursor for keyset pagination"),
+        completed: Optional[bool] = Query(None, description="Only completed or only pending tasks"),
+        created_after: Optional[datetime] = Query(None, description="Created at or after this time"),
+        created_before: Optional[datetime] = Query(None, description="Created before this time"),
+        updated_after: Optional[datetime] = Query(None, description="Last updated at or after this time"),
+        updated_before: Optional[datetime] = Query(None, description="Last updated before this time"),
+        sort: TaskSort = Query(TaskSort.ID, description="Sort order; prefix with '-' for descending"),
+        db: DbSession = Depends(get_db)
+    ) -> Response:
         """
-        Get all tasks with pagination
+        Get tasks with filtering, sorting and pagination.
+
+        Passing a cursor (empty for the first page) switches from skip/limit to
+        keyset pagination; the next page's cursor is returned in X-Next-Cursor.
+
+        The rows already have the TaskResponse shape, so they are serialized
+        directly instead of being validated again against the response model.
+        Pages carry an ETag from the table version, read before the page; when
+        it still matches If-None-Match, 304 is returned without reading the page.
         """
-        return await TaskService.get_tasks(db, skip, limit)
-    
+        headers = {}
+        with timed("service"):
+            version = await TaskService.get_collection_version(db)
+        if version is not None:
+            headers = {"ETag": f'"{TaskController.COLLECTION_ETAG_PREFIX}{version}"', "Cache-Control": REVALIDATE}
+            if is_not_modified(request.headers, headers["ETag"]):
+                return TaskController._not_modified(headers)
+
+        filters = TaskFilter(
+            completed=completed,
+            created_after=created_after,
+            created_before=created_before,
+            updated_after=updated_after,
+            updated_before=updated_before,
+        )
+        if cursor is None:
+            with timed("service"):
+                tasks = await TaskService.get_tasks(db, skip, limit, filters, sort, version)
+            return FastJSONResponse(tasks, headers=headers)
+
+        with timed("service"):
+            tasks, next_cursor = await TaskService.get_tasks_page(db, cursor, limit, filters, sort, version)
+        if next_cursor is not None:
+            headers[TaskController.NEXT_CURSOR_HEADER] = next_cursor
+        return FastJSONResponse(tasks, headers=headers)
+
+    @staticmethod
+    async def get_stats(db: DbSession = Depends(get_db)) -> TaskStatsResponse:
+        """
+        Get task totals by status
+        """
+        with timed("service"):
+            return await TaskService.get_stats(db)
+
+    @staticmethod
+    async def get_changes(
+        since: int = Query(0, ge=0, description="Watermark from the previous response; 0 for every task"),
+        limit: int = Query(1000, ge=1, le=10000, description="Maximum number of changes to return"),
+        db: DbSession = Depends(get_db)
+    ) -> TaskChangesResponse:
+        """
+        Get the IDs of the tasks inserted, updated and deleted after a watermark
+        """
+        with timed("service"):
+            return await TaskService.get_changes(db, since, limit)
+
+    @staticmethod
+    async def search_tasks(
+        q: str = Query(..., min_length=1, max_length=200, description="Words to search for"),
+        skip: int = Query(0, ge=0, description="Number of tasks to skip"),
+        limit: int = Query(100, ge=1, le=100, description="Maximum number of tasks to return"),
+        cursor: Optional[str] = Query(None, description="Opaque cursor for keyset pagination"),
+        db: DbSession = Depends(get_db)
+    ) -> FastJSONResponse:
+        """
+        Search tasks by title and description, best matches first.
+
+        Paginates like get_tasks: skip/limit, or a cursor with the next one in X-Next-Cursor.
+        """
+        if cursor is None:
+            with timed("service"):
+                tasks = await TaskService.search_tasks(db, q, skip, limit)
+            return FastJSONResponse(tasks)
+
+        with timed("service"):
+            tasks, next_cursor = await TaskService.search_tasks_page(db, q, cursor, limit)
+        headers = {TaskController.NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else None
+        return FastJSONResponse(tasks, headers=headers)
+
     @staticmethod
     async def get_task(
+        request: Request,
+        response: Response,
         task_id: int = Path(..., gt=0, description="The ID of the task to retrieve"),
-        db: Session = Depends(get_db)
+        db: DbSession = Depends(get_db)
     ) -> TaskResponse:
         """
-        Get a task by ID
+        Get a task by ID, or 304 when the client's copy (If-None-Match / If-Modified-Since) is current
         """
-        return await TaskService.get_task(db, task_id)
+        with timed("service"):
+            task = await TaskService.get_task(db, task_id)
+        etag = TaskController._task_etag(task)
+        last_modified = task.updated_at or task.created_at
+        headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified)
+        if is_not_modified(request.headers, etag, last_modified):
+            return TaskController._not_modified(headers)
+        response.headers.update(headers)
+        return task
     
     @staticmethod
     async def create_task(
         task_data: TaskCreate,
-        db: Session = Depends(get_db)
+        response: Response,
+        db: DbSession = Depends(get_db)
     ) -> TaskResponse:
         """
         Create a new task
         """
-        return await TaskService.create_task(db, task_data)
+        with timed("service"):
+            task = await TaskService.create_task(db, task_data)
+        response.headers["ETag"] = TaskController._task_etag(task)
+        return task
     
     @staticmethod
     async def update_task(
+        response: Response,
         task_id: int = Path(..., gt=0, description="The ID of the task to update"),
         task_data: TaskUpdate = ...,
-        db: Session = Depends(get_db)
+        if_match: Optional[str] = Header(None, description="Only update if the task still has one of these ETags"),
+        db: DbSession = Depends(get_db)
     ) -> TaskResponse:
         """
-        Update an existing task
+        Update an existing task; with If-Match, only if it has not changed since (412 otherwise)
         """
-        return await TaskService.update_task(db, task_id, task_data)
+        expected_versions = TaskController._expected_versions(task_id, if_match)
+        with timed("service"):
+            task = await TaskService.update_task(db, task_id, task_data, expected_versions)
+        response.headers["ETag"] = TaskController._task_etag(task)
+        return task
     
     @staticmethod
     async def delete_task(
         task_id: int = Path(..., gt=0, description="The ID of the task to delete"),
-        db: Session = Depends(get_db)
+        if_match: Optional[str] = Header(None, description="Only delete if the task still has one of these ETags"),
+        db: DbSession = Depends(get_db)
     ) -> None:
         """
-        Delete a task
+        Delete a task; with If-Match, only if it has not changed since (412 otherwise)
         """
-        await TaskService.delete_task(db, task_id)
+        expected_versions = TaskController._expected_versions(task_id, if_match)
+        with timed("service"):
+            await TaskService.delete_task(db, task_id, expected_versions)
+
+    @staticmethod
+    async def bulk_create_tasks(
+        task_data: TaskBulkCreate,
+        db: DbSession = Depends(get_db)
+    ) -> TaskBulkResponse:
+        """
+        Create several tasks in one transaction
+        """
+        with timed("service"):
+            results = await TaskService.bulk_create_tasks(db, task_data.items)
+        return TaskBulkResponse(results=results)
+
+    @staticmethod
+    async def bulk_update_tasks(
+        task_data: TaskBulkUpdate,
+        db: DbSession = Depends(get_db)
+    ) -> TaskBulkResponse:
+        """
+        Update several tasks in one transaction
+        """
+        with timed("service"):
+            results = await TaskService.bulk_update_tasks(db, task_data.items)
+        return TaskBulkResponse(results=results)
+
+    @staticmethod
+    async def bulk_delete_tasks(
+        task_data: TaskBulkDelete,
+        db: DbSession = Depends(get_db)
+    ) -> TaskBulkResponse:
+        """
+        Delete several tasks in one transaction
+        """
+        with timed("service"):
+            results = await TaskService.bulk_delete_tasks(db, task_data.ids)
+        return TaskBulkResponse(results=results)
+
+    @staticmethod
+    async def export_tasks(
+        file_format: TaskFileFormat = Query(TaskFileFormat.NDJSON, alias="format", description="Export format")
+    ) -> StreamingResponse:
+        """
+        Stream all tasks as a downloadable file
+        """
+        return StreamingResponse(
+            TaskService.export_tasks(file_format),
+            media_type=TaskController.EXPORT_MEDIA_TYPES[file_format],
+            headers={"Content-Disposition": f'attachment; filename="tasks.{file_format.value}"'},
+        )
+
+    @staticmethod
+    async def import_tasks(
+        request: Request,
+        file_format: TaskFileFormat = Query(TaskFileFormat.NDJSON, alias="format", description="Import format"),
+        db: DbSession = Depends(get_db)
+    ) -> TaskImportResult:
+        """
+        Create tasks from the streamed request body
+        """
+        with timed("service"):
+            return await TaskService.import_tasks(db, request.stream(), file_format)
+
+    @staticmethod
+    def _resume_position(last_event_id: Optional[str]) -> Optional[int]:
+        """
+        Event ID to resume after, from a Last-Event-ID value; None for a fresh subscription
+        """
+        if last_event_id is None or not last_event_id.strip().isdigit():
+            return None
+        return int(last_event_id)
+
+    @staticmethod
+    async def _event_stream(subscription_context: AsyncContextManager[Subscription]) -> AsyncIterator[bytes]:
+        """
+        Server-Sent Events body: one message per event, a comment line as
+        heartbeat when idle, ended when the subscription is closed
+        """
+        async with subscription_context as subscription:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), settings.EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                except SubscriptionClosed:
+                    return
+                yield format_sse(event)
+
+    @staticmethod
+    async def stream_events(
+        last_event_id_query: Optional[str] = Query(None, alias="last_event_id", description="Resume after this event"),
+        last_event_id: Optional[str] = Header(None, description="Resume after this event (sent by EventSource)"),
+    ) -> StreamingResponse:
+        """
+        Stream task changes as Server-Sent Events
+        """
+        position = TaskController._resume_position(last_event_id or last_event_id_query)
+        subscription = TaskService.subscribe_events(position)
+        return StreamingResponse(
+            TaskController._event_stream(subscription),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @staticmethod
+    async def stream_events_websocket(websocket: WebSocket, last_event_id: Optional[str] = None) -> None:
+        """
+        Send task changes as JSON messages over a WebSocket; messages from the client are ignored
+        """
+        try:
+            subscription_context = TaskService.subscribe_events(TaskController._resume_position(last_event_id))
+        except AppException as exc:
+            await websocket.close(code=1008, reason=exc.detail)
+            return
+        await websocket.accept()
+
+        async with subscription_context as subscription:
+            async def drain() -> None:
+                while (await websocket.receive())["type"] != "websocket.disconnect":
+                    pass
+                subscription.close("disconnect")
+
+            receiver = asyncio.create_task(drain())
+            try:
+                while True:
+                    event = await subscription.get()
+                    await websocket.send_json({"id": event.id, "type": event.type, "data": event.data})
+            except SubscriptionClosed as exc:
+                closed = exc
+            finally:
+                receiver.cancel()
+            if closed.reason != "disconnect":
+                code = TaskController.WS_CLOSE_CODES.get(closed.reason, 1011)
+                await websocket.close(code=code, reason=closed.reason)
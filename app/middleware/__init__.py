@@ -0,0 +1,7 @@
+from app.middleware.admission import AdmissionControlMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+
+__all__ = ["AdmissionControlMiddleware", "CompressionMiddleware", "MetricsMiddleware", "ProfilingMiddleware", "RequestContextMiddleware"]
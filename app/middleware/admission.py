@@ -0,0 +1,124 @@
+import math
+from time import perf_counter
+from typing import Optional, Sequence
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.logger import logger
+from app.utils.admission import (
+    PRIORITY_CRITICAL, PRIORITY_NAMES, PRIORITY_READ, PRIORITY_WRITE,
+    AdmissionRejected, PriorityLimiter, TokenBucketLimiter
+)
+from app.utils.metrics import registry
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+shed_requests = registry.counter(
+    "http_requests_shed_total", "Requests rejected by admission control or the rate limiter", ["reason", "priority"]
+)
+queue_wait = registry.histogram(
+    "admission_queue_wait_seconds", "Time admitted requests waited for a slot", ["priority"]
+)
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware shedding load before it reaches the application.
+
+    With a rate limiter, clients over their budget get 429; with a limiter,
+    requests beyond its concurrency wait in its priority queue (reads before
+    writes) and get 503 when the queue is full or the wait times out. Both
+    responses carry Retry-After. Bypass paths (health checks, metrics) are
+    never limited. Stream paths (Server-Sent Events) are rate limited but do
+    not hold a concurrency slot for as long as the client listens; WebSockets
+    are not limited.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[PriorityLimiter] = None,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        bypass_paths: Sequence[str] = ("/healthz",),
+        stream_paths: Sequence[str] = (),
+        retry_after: int = 1,
+        key_header: str = "",
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.rate_limiter = rate_limiter
+        self.bypass_paths = frozenset(bypass_paths)
+        self.stream_paths = frozenset(stream_paths)
+        self.retry_after = retry_after
+        self.key_header = key_header
+        if limiter is not None:
+            registry.callback(
+                "admission_active_requests", "Requests holding an admission slot", lambda: {(): limiter.active}
+            )
+            registry.callback(
+                "admission_queue_depth", "Requests waiting for an admission slot", lambda: {(): limiter.queued}
+            )
+
+    def _priority(self, scope: Scope) -> int:
+        if scope["path"] in self.bypass_paths:
+            return PRIORITY_CRITICAL
+        return PRIORITY_READ if scope["method"] in READ_METHODS else PRIORITY_WRITE
+
+    def _client_key(self, scope: Scope) -> str:
+        if self.key_header:
+            key = Headers(scope=scope).get(self.key_header)
+            if key:
+                return key
+        client = scope.get("client")
+        return client[0] if client else "anonymous"
+
+    @staticmethod
+    def _reject(status_code: int, code: str, detail: str, retry_after: float) -> JSONResponse:
+        return JSONResponse(
+            {"detail": detail, "code": code},
+            status_code=status_code,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        priority = self._priority(scope)
+        if priority == PRIORITY_CRITICAL:
+            await self.app(scope, receive, send)
+            return
+        priority_name = PRIORITY_NAMES[priority]
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.acquire(self._client_key(scope))
+            if wait:
+                shed_requests.inc(reason="rate_limited", priority=priority_name)
+                logger.warning("Rate limited %s %s", scope["method"], scope["path"], extra={"category": "RATE_LIMITED"})
+                response = self._reject(429, "RATE_LIMITED", "Too many requests", wait)
+                await response(scope, receive, send)
+                return
+
+        if self.limiter is None or scope["path"] in self.stream_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        try:
+            await self.limiter.acquire(priority)
+        except AdmissionRejected as exc:
+            shed_requests.inc(reason=exc.reason, priority=priority_name)
+            logger.warning(
+                "Request shed (%s): %s %s", exc.reason, scope["method"], scope["path"],
+                extra={"category": "SERVICE_OVERLOADED"},
+            )
+            response = self._reject(503, "SERVICE_OVERLOADED", "Server overloaded, retry later", self.retry_after)
+            await response(scope, receive, send)
+            return
+        queue_wait.observe(perf_counter() - started, priority=priority_name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
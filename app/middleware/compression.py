@@ -0,0 +1,120 @@
+from typing import Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.compression import COMPRESSORS, Compressor, available_encodings, negotiate_encoding
+from app.utils.metrics import registry
+
+compression_bytes = registry.counter(
+    "http_response_compression_bytes_total",
+    "Response body bytes before (stage=in) and after (stage=out) compression",
+    ["encoding", "stage"],
+)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with the best coding the client accepts.
+
+    Only responses whose media type is listed in content_types are compressed,
+    and only when they are at least minimum_size bytes long; streamed bodies
+    of unknown length are always compressed. Streamed chunks are compressed
+    and flushed one by one as they are sent, so the body is never buffered.
+    ETags are left as they are: they identify a task revision, whatever the
+    coding, and Vary: Accept-Encoding keeps caches from mixing codings.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str] = ("gzip",),
+        minimum_size: int = 500,
+        content_types: Sequence[str] = ("application/json",),
+        levels: Optional[Dict[str, int]] = None,
+    ):
+        self.app = app
+        self.encodings = available_encodings(encodings)
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(content_types)
+        self.levels = {"gzip": 3, "br": 4, "zstd": 3, **(levels or {})}
+
+    def _compressible(self, message: Message) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in self.content_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # The response start is held back until the first body chunk shows whether to compress
+        start: Optional[Message] = None
+        compressor: Optional[Compressor] = None
+
+        async def send_compressed(body: bytes, more_body: bool) -> None:
+            data = compressor.compress(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            compression_bytes.inc(len(body), encoding=encoding, stage="in")
+            compression_bytes.inc(len(data), encoding=encoding, stage="out")
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                if self._compressible(message):
+                    start = message
+                else:
+                    await send(message)
+                return
+
+            if start is not None:
+                pending, start = start, None
+                if message["type"] != "http.response.body":
+                    await send(pending)
+                    await send(message)
+                    return
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                headers = MutableHeaders(scope=pending)
+                length = headers.get("content-length", "")
+                size = len(body) if not more_body else int(length) if length.isdigit() else None
+                if size is not None and size < self.minimum_size:
+                    await send(pending)
+                    await send(message)
+                    return
+
+                compressor = COMPRESSORS[encoding](self.levels[encoding])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                del headers["Content-Length"]
+                if not more_body:
+                    # Whole body at once: it can still carry a Content-Length
+                    data = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(data))
+                    compression_bytes.inc(len(body), encoding=encoding, stage="in")
+                    compression_bytes.inc(len(data), encoding=encoding, stage="out")
+                    await send(pending)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                await send(pending)
+                await send_compressed(body, more_body)
+                return
+
+            if compressor is not None and message["type"] == "http.response.body":
+                await send_compressed(message.get("body", b""), message.get("more_body", False))
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
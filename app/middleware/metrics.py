@@ -0,0 +1,61 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import registry
+
+requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served", ["method"]
+)
+request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response is fully sent", ["method", "route"]
+)
+responses_total = registry.counter(
+    "http_responses_total", "HTTP responses by status code", ["method", "route", "status"]
+)
+
+
+def route_path(scope: Scope) -> str:
+    """
+    Route template for a request (e.g. /api/tasks/{task_id}), keeping label cardinality bounded.
+
+    Rebuilt from the request path and its path params, so the prefixes of
+    included routers are kept whatever the FastAPI version.
+    """
+    if scope.get("route") is None and scope.get("endpoint") is None:
+        return "<unmatched>"
+    placeholders = {str(value): f"{{{name}}}" for name, value in (scope.get("path_params") or {}).items()}
+    return "/".join(placeholders.get(segment, segment) for segment in scope["path"].split("/"))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, in-flight requests and status codes
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_progress.inc(method=method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            requests_in_progress.dec(method=method)
+            route = route_path(scope)
+            request_duration.observe(perf_counter() - started, method=method, route=route)
+            responses_total.inc(method=method, route=route, status=str(status_code))
@@ -0,0 +1,86 @@
+import cProfile
+import random
+import uuid
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.config.logger import logger
+from app.utils.profiling import ProfileRecord, ProfileStore, render_profile
+from app.utils.timing import RequestTimings, current_timings
+
+profile_store = ProfileStore(settings.PROFILING_MAX_STORED)
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware adding Server-Timing breakdowns and on-demand request profiles.
+
+    A request is profiled when it carries the PROFILING_HEADER header or is
+    picked by PROFILING_SAMPLE_RATE. cProfile sees the whole event loop
+    thread, so only one request is profiled at a time.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._profiling = False
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if not settings.PROFILING_ENABLED or self._profiling:
+            return False
+        if Headers(scope=scope).get(settings.PROFILING_HEADER):
+            return True
+        return random.random() < settings.PROFILING_SAMPLE_RATE
+
+    def _start_profiler(self) -> Optional[cProfile.Profile]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return None
+        self._profiling = True
+        return profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings() if settings.SERVER_TIMING_ENABLED else None
+        profiler = self._start_profiler() if self._should_profile(scope) else None
+        profile_id = uuid.uuid4().hex if profiler is not None else None
+        started = perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if timings is not None:
+                    headers.append("Server-Timing", timings.server_timing(perf_counter()))
+                if profile_id is not None:
+                    headers[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        token = current_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timings.reset(token)
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+                profile_store.add(ProfileRecord(
+                    id=profile_id,
+                    method=scope["method"],
+                    path=scope["path"],
+                    created_at=datetime.now(timezone.utc),
+                    duration_ms=(perf_counter() - started) * 1000,
+                    report=render_profile(profiler, settings.PROFILING_TOP_FUNCTIONS),
+                ))
+                logger.info("Stored profile %s for %s %s", profile_id, scope["method"], scope["path"])
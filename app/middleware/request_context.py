@@ -0,0 +1,57 @@
+import logging
+from time import perf_counter
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.metrics import route_path
+from app.utils.request_context import RequestContext, current_request, request_id_from
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+access_logger = logging.getLogger("app.access")
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware giving every request an ID (the client's X-Request-ID when
+    well formed), returned in the response and attached to the records logged
+    while handling it; optionally logs one access record per request
+    """
+
+    def __init__(self, app: ASGIApp, access_log: bool = False):
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext(
+            request_id=request_id_from(Headers(scope=scope).get(REQUEST_ID_HEADER)), started=perf_counter()
+        )
+        token = current_request.set(context)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = context.request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Logged before the context is reset, so the record also carries elapsed_ms
+            if self.access_log:
+                route = route_path(scope)
+                access_logger.info(
+                    "%s %s %s",
+                    scope["method"],
+                    route,
+                    status_code,
+                    extra={"method": scope["method"], "route": route, "status": status_code},
+                )
+            current_request.reset(token)
@@ -0,0 +1,61 @@
+"""Add task change tracking
+
+Revision ID: 73c927d75cf2
+Revises: 8c3e51f0a7d2
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '73c927d75cf2'
+down_revision = '8c3e51f0a7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Latest change version of every task, deleted ones included
+    op.create_table('task_changes',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('created_version', sa.Integer(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), server_default=sa.text('0'), nullable=False),
+        sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_task_changes_version', 'task_changes', ['version'], unique=False)
+
+    # Versions are assigned by SQLite triggers; other backends record no changes
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    next_version = "(SELECT COALESCE(MAX(version), 0) + 1 FROM task_changes)"
+    op.execute(
+        "CREATE TRIGGER task_changes_insert AFTER INSERT ON tasks BEGIN "
+        "INSERT OR REPLACE INTO task_changes (task_id, version, created_version, deleted) "
+        f"SELECT new.id, next.version, next.version, 0 FROM (SELECT {next_version} AS version) AS next; END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_changes_update AFTER UPDATE ON tasks BEGIN "
+        f"UPDATE task_changes SET version = {next_version} WHERE task_id = new.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_changes_delete AFTER DELETE ON tasks BEGIN "
+        f"UPDATE task_changes SET version = {next_version}, deleted = 1 WHERE task_id = old.id; END"
+    )
+    # The existing tasks count as created in ID order
+    op.execute(
+        "INSERT INTO task_changes (task_id, version, created_version, deleted) "
+        "SELECT id, id, id, 0 FROM tasks"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS task_changes_delete")
+        op.execute("DROP TRIGGER IF EXISTS task_changes_update")
+        op.execute("DROP TRIGGER IF EXISTS task_changes_insert")
+    op.drop_index('ix_task_changes_version', table_name='task_changes')
+    op.drop_table('task_changes')
@@ -0,0 +1,32 @@
+"""Add task change feed table
+
+Revision ID: 8c3e51f0a7d2
+Revises: 25aaf690666a
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3e51f0a7d2'
+down_revision = '25aaf690666a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Recent task change events, shared by the workers' event brokers
+    op.create_table('task_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('data', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_events')
@@ -0,0 +1,69 @@
+"""Add task list indexes and task stats counters
+
+Revision ID: 4f198b199474
+Revises: 475e7e283ddb
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f198b199474'
+down_revision = '475e7e283ddb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite indexes for filtered and sorted list reads
+    op.create_index('ix_tasks_completed_id', 'tasks', ['completed', 'id'], unique=False)
+    op.create_index('ix_tasks_completed_created_at_id', 'tasks', ['completed', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_updated_at_id', 'tasks', ['updated_at', 'id'], unique=False)
+
+    # Task totals by status, in a single row
+    op.create_table('task_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Counters are maintained by SQLite triggers; other backends count on read
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        "CREATE TRIGGER task_stats_insert AFTER INSERT ON tasks BEGIN "
+        "UPDATE task_stats SET total = total + 1, completed = completed + COALESCE(new.completed, 0) "
+        "WHERE id = 1; END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_stats_delete AFTER DELETE ON tasks BEGIN "
+        "UPDATE task_stats SET total = total - 1, completed = completed - COALESCE(old.completed, 0) "
+        "WHERE id = 1; END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_stats_update AFTER UPDATE OF completed ON tasks BEGIN "
+        "UPDATE task_stats SET completed = completed + COALESCE(new.completed, 0) - COALESCE(old.completed, 0) "
+        "WHERE id = 1; END"
+    )
+    # Seed the counters from the existing tasks
+    op.execute(
+        "INSERT INTO task_stats (id, total, completed) "
+        "SELECT 1, COUNT(*), COALESCE(SUM(completed), 0) FROM tasks"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS task_stats_update")
+        op.execute("DROP TRIGGER IF EXISTS task_stats_delete")
+        op.execute("DROP TRIGGER IF EXISTS task_stats_insert")
+    op.drop_table('task_stats')
+    op.drop_index('ix_tasks_updated_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_completed_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_completed_id', table_name='tasks')
@@ -0,0 +1,73 @@
+"""Add task and task table versions
+
+Revision ID: 25aaf690666a
+Revises: 4f198b199474
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '25aaf690666a'
+down_revision = '4f198b199474'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-task revision (incremented by the application on update) and table-level version
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.add_column('task_stats', sa.Column('version', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # Bump the table version on every write, and the counters on any update
+    op.execute("DROP TRIGGER IF EXISTS task_stats_insert")
+    op.execute("DROP TRIGGER IF EXISTS task_stats_delete")
+    op.execute("DROP TRIGGER IF EXISTS task_stats_update")
+    op.execute(
+        "CREATE TRIGGER task_stats_insert AFTER INSERT ON tasks BEGIN "
+        "UPDATE task_stats SET total = total + 1, completed = completed + COALESCE(new.completed, 0), "
+        "version = version + 1 WHERE id = 1; END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_stats_delete AFTER DELETE ON tasks BEGIN "
+        "UPDATE task_stats SET total = total - 1, completed = completed - COALESCE(old.completed, 0), "
+        "version = version + 1 WHERE id = 1; END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_stats_update AFTER UPDATE ON tasks BEGIN "
+        "UPDATE task_stats SET completed = completed + COALESCE(new.completed, 0) - COALESCE(old.completed, 0), "
+        "version = version + 1 WHERE id = 1; END"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS task_stats_insert")
+        op.execute("DROP TRIGGER IF EXISTS task_stats_delete")
+        op.execute("DROP TRIGGER IF EXISTS task_stats_update")
+
+    # Plain ALTER TABLE ... DROP COLUMN (SQLite 3.35+): a batch copy would drop the table's triggers
+    op.drop_column('task_stats', 'version')
+    op.drop_column('tasks', 'version')
+
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "CREATE TRIGGER task_stats_insert AFTER INSERT ON tasks BEGIN "
+            "UPDATE task_stats SET total = total + 1, completed = completed + COALESCE(new.completed, 0) "
+            "WHERE id = 1; END"
+        )
+        op.execute(
+            "CREATE TRIGGER task_stats_delete AFTER DELETE ON tasks BEGIN "
+            "UPDATE task_stats SET total = total - 1, completed = completed - COALESCE(old.completed, 0) "
+            "WHERE id = 1; END"
+        )
+        op.execute(
+            "CREATE TRIGGER task_stats_update AFTER UPDATE OF completed ON tasks BEGIN "
+            "UPDATE task_stats SET completed = completed + COALESCE(new.completed, 0) - COALESCE(old.completed, 0) "
+            "WHERE id = 1; END"
+        )
@@ -1,3 +1,3 @@
-from app.models.task import Task
+from app.models.task import Task, TaskChange, TaskEvent, TaskStats
 
-__all__ = ["Task"]
+__all__ = ["Task", "TaskChange", "TaskEvent", "TaskStats"]
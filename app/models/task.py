@@ -1,17 +1,143 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, DDL, Index, Integer, String, Boolean, DateTime, event
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.sql import column, func, literal_column, table, text
 
 from app.config.database import Base
 
+# SQLite stores timestamps as text, and func.now() (CURRENT_TIMESTAMP) writes them to the
+# second: bind datetimes in that same format so range filters and keyset cursors compare equal
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
 class Task(Base):
     """
     Task model for storing task data
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Filtered and sorted list reads, ties broken by ID for keyset pagination
+        Index("ix_tasks_completed_id", "completed", "id"),
+        Index("ix_tasks_completed_created_at_id", "completed", "created_at", "id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     completed = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
+    # Incremented by every UPDATE statement; identifies the revision in ETags
+    version = Column(Integer, nullable=False, server_default=text("1"), onupdate=literal_column("version") + 1)
+
+class TaskStats(Base):
+    """
+    Task totals by status in a single row, kept up to date by triggers on tasks,
+    with a version bumped by every write to the table
+    """
+    __tablename__ = "task_stats"
+
+    id = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, server_default=text("0"))
+
+class TaskChange(Base):
+    """
+    Latest change of each task, kept up to date by triggers on tasks: rows of
+    deleted tasks stay behind as tombstones. Every change takes the next
+    version, so the changes after a client's watermark are one index range.
+    """
+    __tablename__ = "task_changes"
+
+    # No foreign key: the row outlives the task
+    task_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, index=True)
+    # Version of the change that created the task
+    created_version = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, server_default=text("0"))
+
+class TaskEvent(Base):
+    """
+    Task change feed entry, for sharing the feed between worker processes
+    (EVENTS_BROKER=database); only the most recent entries are kept
+    """
+    __tablename__ = "task_events"
+    # Never reuse the IDs of pruned entries: they are the clients' resume positions
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    type = Column(String, nullable=False)
+    data = Column(String, nullable=False)
+    created_at = Column(Timestamp, server_default=func.now())
+
+# SQLite FTS5 index over task titles and descriptions (external content: the
+# text lives in tasks only), kept in sync by triggers on every write
+TASK_SEARCH_TABLE = "tasks_fts"
+task_search = table(TASK_SEARCH_TABLE, column("rowid", Integer))
+
+TASK_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TASK_SEARCH_TABLE} USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO {TASK_SEARCH_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO {TASK_SEARCH_TABLE}({TASK_SEARCH_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN "
+    f"INSERT INTO {TASK_SEARCH_TABLE}({TASK_SEARCH_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {TASK_SEARCH_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
+
+# Databases created from the metadata get the index with the table; existing ones through the migration
+for statement in TASK_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {TASK_SEARCH_TABLE}").execute_if(dialect="sqlite")
+)
+
+# Adjust the TaskStats row on every write to tasks, instead of counting on each read
+TASK_STATS_ID = 1
+TASK_STATS_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS task_stats_insert AFTER INSERT ON tasks BEGIN "
+    "UPDATE task_stats SET total = total + 1, completed = completed + COALESCE(new.completed, 0), "
+    f"version = version + 1 WHERE id = {TASK_STATS_ID}; END",
+    "CREATE TRIGGER IF NOT EXISTS task_stats_delete AFTER DELETE ON tasks BEGIN "
+    "UPDATE task_stats SET total = total - 1, completed = completed - COALESCE(old.completed, 0), "
+    f"version = version + 1 WHERE id = {TASK_STATS_ID}; END",
+    "CREATE TRIGGER IF NOT EXISTS task_stats_update AFTER UPDATE ON tasks BEGIN "
+    "UPDATE task_stats SET completed = completed + COALESCE(new.completed, 0) - COALESCE(old.completed, 0), "
+    f"version = version + 1 WHERE id = {TASK_STATS_ID}; END",
+    # Seed the row from the existing tasks the first time
+    "INSERT OR IGNORE INTO task_stats (id, total, completed) "
+    f"SELECT {TASK_STATS_ID}, COUNT(*), COALESCE(SUM(completed), 0) FROM tasks",
+)
+
+# Runs after every create_all, once both tables exist; each statement is idempotent
+for statement in TASK_STATS_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+# Record every write to tasks in task_changes. Triggers run once per row, so
+# rows written by one statement still get distinct versions
+NEXT_CHANGE_VERSION = "(SELECT COALESCE(MAX(version), 0) + 1 FROM task_changes)"
+TASK_CHANGES_DDL = (
+    # Replaces the tombstone when SQLite reuses the ID of a deleted task
+    "CREATE TRIGGER IF NOT EXISTS task_changes_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT OR REPLACE INTO task_changes (task_id, version, created_version, deleted) "
+    f"SELECT new.id, next.version, next.version, 0 FROM (SELECT {NEXT_CHANGE_VERSION} AS version) AS next; END",
+    # Every task has its row from the insert trigger or the seed below: update it in place
+    "CREATE TRIGGER IF NOT EXISTS task_changes_update AFTER UPDATE ON tasks BEGIN "
+    f"UPDATE task_changes SET version = {NEXT_CHANGE_VERSION} WHERE task_id = new.id; END",
+    "CREATE TRIGGER IF NOT EXISTS task_changes_delete AFTER DELETE ON tasks BEGIN "
+    f"UPDATE task_changes SET version = {NEXT_CHANGE_VERSION}, deleted = 1 WHERE task_id = old.id; END",
+    # Record the existing tasks the first time, as created in ID order
+    "INSERT OR IGNORE INTO task_changes (task_id, version, created_version, deleted) "
+    "SELECT id, id, id, 0 FROM tasks",
+)
+
+for statement in TASK_CHANGES_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -1,3 +1,5 @@
 from app.routes.task_routes import router as task_router
+from app.routes.metrics_routes import router as metrics_router
+from app.routes.profiling_routes import router as profiling_router
 
-__all__ = ["task_router"]
+__all__ = ["task_router", "metrics_router", "profiling_router"]
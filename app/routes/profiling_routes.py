@@ -0,0 +1,38 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+from typing import List
+
+from app.middleware.profiling import profile_store
+from app.schemas.profiling import ProfileSummary
+from app.utils.errors import NotFoundException
+
+router = APIRouter(prefix="/debug/profiles", tags=["Profiling"])
+
+@router.get(
+    "",
+    response_model=List[ProfileSummary],
+    status_code=status.HTTP_200_OK,
+    summary="List request profiles",
+    description="List the most recent request profiles, newest first"
+)
+async def list_profiles():
+    """
+    List stored profiles
+    """
+    return [ProfileSummary.model_validate(record) for record in profile_store.list()]
+
+@router.get(
+    "/{profile_id}",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get a request profile",
+    description="Call-stack profile of a request, sorted by cumulative time"
+)
+async def get_profile(profile_id: str):
+    """
+    Get a stored profile report
+    """
+    record = profile_store.get(profile_id)
+    if record is None:
+        raise NotFoundException(f"Profile with ID {profile_id} not found")
+    return PlainTextResponse(record.report)
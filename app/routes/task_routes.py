@@ -1,10 +1,14 @@
-from fastapi import APIRouter, status, Depends
-from typing import List
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Header, Query, Request, Response, WebSocket, status, Depends
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import List, Optional
 
 from app.controllers.task_controller import TaskController
-from app.schemas.task import TaskResponse, TaskCreate, TaskUpdate
-from app.config.database import get_db
+from app.schemas.task import (
+    TaskResponse, TaskCreate, TaskUpdate, TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskBulkResponse,
+    TaskFileFormat, TaskImportResult, TaskSort, TaskStatsResponse, TaskChangesResponse
+)
+from app.config.database import DbSession, get_db
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -13,26 +17,171 @@ router = APIRouter(prefix="/tasks", tags=["Tasks"])
     response_model=List[TaskResponse],
     status_code=status.HTTP_200_OK,
     summary="Get all tasks",
-    description="Retrieve a list of all tasks with pagination"
+    description=(
+        "Retrieve a list of all tasks with pagination. Filter by `completed` and by creation or "
+        "update time ranges (`*_after` is inclusive, `*_before` exclusive), and order with `sort` "
+        "(`id`, `created_at` or `title`, prefixed with `-` for descending). Pass `cursor` (empty for "
+        "the first page) to use keyset pagination instead of skip/limit; the next page's cursor is "
+        "returned in the `X-Next-Cursor` header and is absent on the last page. A cursor is only "
+        "valid with the sort it was issued for. Pages carry an `ETag` that changes with every write "
+        "to the tasks table; send it back in `If-None-Match` to get `304 Not Modified` while nothing changed."
+    ),
+    responses={304: {"description": "No task changed since the ETag in If-None-Match"}},
 )
-async def get_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_tasks(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    completed: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    sort: TaskSort = TaskSort.ID,
+    db: DbSession = Depends(get_db)
+):
     """
     Get all tasks with pagination
     """
-    return await TaskController.get_tasks(skip=skip, limit=limit, db=db)
+    return await TaskController.get_tasks(
+        request=request,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        completed=completed,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        sort=sort,
+        db=db,
+    )
+
+@router.get(
+    "/stats",
+    response_model=TaskStatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get task totals",
+    description="Number of tasks in total and by status, read from counters kept up to date on every write"
+)
+async def get_stats(db: DbSession = Depends(get_db)):
+    """
+    Get task totals by status
+    """
+    return await TaskController.get_stats(db=db)
+
+@router.get(
+    "/changes",
+    response_model=TaskChangesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get task changes since a watermark",
+    description=(
+        "IDs of the tasks inserted, updated and deleted after `since`, for clients keeping a local copy. "
+        "Every write to a task gives it a new, higher change version; each task is listed once, under its "
+        "latest change. Pass the returned `watermark` as `since` on the next call, and keep calling while "
+        "`has_more` is true. Start with `since=0`, which lists every existing task as inserted. "
+        "Deleted IDs may include tasks the client never received."
+    ),
+)
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Get task changes since a watermark
+    """
+    return await TaskController.get_changes(since=since, limit=limit, db=db)
+
+@router.get(
+    "/search",
+    response_model=List[TaskResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Search tasks",
+    description=(
+        "Full-text search over task titles and descriptions. Every word in `q` must match, "
+        "as a prefix (`rep` matches `report`); results are ranked by relevance, title matches first. "
+        "Paginates like the task list: `skip`/`limit`, or `cursor` with the next page's cursor "
+        "in the `X-Next-Cursor` header."
+    )
+)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: DbSession = Depends(get_db)
+):
+    """
+    Search tasks
+    """
+    return await TaskController.search_tasks(q=q, skip=skip, limit=limit, cursor=cursor, db=db)
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export all tasks",
+    description=(
+        "Stream every task as NDJSON (one JSON object per line) or CSV with a header row. "
+        "Rows are read in batches from a server-side cursor, so memory use does not grow with the table."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_tasks(file_format: TaskFileFormat = Query(TaskFileFormat.NDJSON, alias="format")):
+    """
+    Export all tasks
+    """
+    return await TaskController.export_tasks(file_format=file_format)
+
+@router.get(
+    "/events",
+    status_code=status.HTTP_200_OK,
+    summary="Stream task changes",
+    description=(
+        "Server-Sent Events feed of task changes: `task.created` and `task.updated` carry the task, "
+        "`task.deleted` its `id`, and `tasks.imported` the number of tasks an import chunk added. "
+        "Reconnect with the last received event ID in `Last-Event-ID` (or `last_event_id`) to resume; "
+        "when the missed events are no longer available a `reset` event is sent instead and the client "
+        "should reload the list. Clients that fall too far behind are disconnected and can resume the same way."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_events(
+    last_event_id_query: Optional[str] = Query(None, alias="last_event_id"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Stream task changes
+    """
+    return await TaskController.stream_events(last_event_id_query=last_event_id_query, last_event_id=last_event_id)
+
+@router.websocket("/events/ws")
+async def stream_events_websocket(websocket: WebSocket, last_event_id: Optional[str] = None):
+    """
+    Task changes over a WebSocket: one JSON message ({"id", "type", "data"}) per event
+    """
+    await TaskController.stream_events_websocket(websocket=websocket, last_event_id=last_event_id)
 
 @router.get(
     "/{task_id}",
     response_model=TaskResponse,
     status_code=status.HTTP_200_OK,
     summary="Get a task by ID",
-    description="Retrieve a specific task by its ID"
+    description=(
+        "Retrieve a specific task by its ID. The response carries an `ETag` and `Last-Modified`; "
+        "send them back in `If-None-Match` or `If-Modified-Since` to get `304 Not Modified` "
+        "while the task is unchanged."
+    ),
+    responses={304: {"description": "The task is unchanged"}},
 )
-async def get_task(task_id: int, db: Session = Depends(get_db)):
+async def get_task(task_id: int, request: Request, response: Response, db: DbSession = Depends(get_db)):
     """
     Get a task by ID
     """
-    return await TaskController.get_task(task_id=task_id, db=db)
+    return await TaskController.get_task(request=request, response=response, task_id=task_id, db=db)
 
 @router.post(
     "",
@@ -41,33 +190,122 @@ async def get_task(task_id: int, db: Session = Depends(get_db)):
     summary="Create a new task",
     description="Create a new task with the provided data"
 )
-async def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task_data: TaskCreate, response: Response, db: DbSession = Depends(get_db)):
     """
     Create a new task
     """
-    return await TaskController.create_task(task_data=task_data, db=db)
+    return await TaskController.create_task(task_data=task_data, response=response, db=db)
+
+@router.post(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create tasks in bulk",
+    description="Create several tasks in a single transaction, returning one result per item in request order"
+)
+async def bulk_create_tasks(task_data: TaskBulkCreate, db: DbSession = Depends(get_db)):
+    """
+    Create several tasks in one transaction
+    """
+    return await TaskController.bulk_create_tasks(task_data=task_data, db=db)
+
+@router.post(
+    "/import",
+    response_model=TaskImportResult,
+    status_code=status.HTTP_200_OK,
+    summary="Import tasks",
+    description=(
+        "Create tasks from an NDJSON or CSV (with header row) request body. The body is read "
+        "incrementally, each line (CSV row, whose quoted fields may span lines) is validated like "
+        "`POST /api/tasks`, and rows are committed in chunks. Invalid lines are skipped and "
+        "reported with their line numbers."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    file_format: TaskFileFormat = Query(TaskFileFormat.NDJSON, alias="format"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Import tasks
+    """
+    return await TaskController.import_tasks(request=request, file_format=file_format, db=db)
+
+@router.patch(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update tasks in bulk",
+    description=(
+        "Update several tasks in a single transaction; unknown IDs are reported as `not_found` "
+        "and items without fields to change as `unchanged`"
+    )
+)
+async def bulk_update_tasks(task_data: TaskBulkUpdate, db: DbSession = Depends(get_db)):
+    """
+    Update several tasks in one transaction
+    """
+    return await TaskController.bulk_update_tasks(task_data=task_data, db=db)
+
+@router.delete(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete tasks in bulk",
+    description="Delete several tasks in a single transaction; unknown IDs are reported as `not_found`"
+)
+async def bulk_delete_tasks(task_data: TaskBulkDelete, db: DbSession = Depends(get_db)):
+    """
+    Delete several tasks in one transaction
+    """
+    return await TaskController.bulk_delete_tasks(task_data=task_data, db=db)
 
 @router.patch(
     "/{task_id}",
     response_model=TaskResponse,
     status_code=status.HTTP_200_OK,
     summary="Update a task",
-    description="Update an existing task with the provided data"
+    description=(
+        "Update an existing task with the provided data. With `If-Match` (the task's `ETag`), "
+        "the update only applies if nobody changed the task in between; otherwise it fails with 412."
+    ),
+    responses={412: {"description": "The task changed since the ETag in If-Match"}},
 )
-async def update_task(task_id: int, task_data: TaskUpdate, db: Session = Depends(get_db)):
+async def update_task(
+    task_id: int,
+    task_data: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_db)
+):
     """
     Update an existing task
     """
-    return await TaskController.update_task(task_id=task_id, task_data=task_data, db=db)
+    return await TaskController.update_task(
+        response=response, task_id=task_id, task_data=task_data, if_match=if_match, db=db
+    )
 
 @router.delete(
     "/{task_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete a task",
-    description="Delete a task by its ID"
+    description=(
+        "Delete a task by its ID. With `If-Match` (the task's `ETag`), the task is only deleted "
+        "if nobody changed it in between; otherwise the request fails with 412."
+    ),
+    responses={412: {"description": "The task changed since the ETag in If-Match"}},
 )
-async def delete_task(task_id: int, db: Session = Depends(get_db)):
+async def delete_task(task_id: int, if_match: Optional[str] = Header(None), db: DbSession = Depends(get_db)):
     """
     Delete a task
     """
-    await TaskController.delete_task(task_id=task_id, db=db)
+    await TaskController.delete_task(task_id=task_id, if_match=if_match, db=db)
@@ -1,9 +1,21 @@
-from app.schemas.task import TaskBase, TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task import (
+    TaskBase, TaskCreate, TaskUpdate, TaskResponse,
+    TaskBulkCreate, TaskBulkUpdateItem, TaskBulkUpdate, TaskBulkDelete, TaskBulkItemResult, TaskBulkResponse,
+    TaskFileFormat, TaskImportError, TaskImportResult, TaskSort, TaskFilter, TaskStatsResponse,
+    TaskChangesResponse
+)
+from app.schemas.profiling import ProfileSummary
 from app.schemas.jsonplaceholder import PostBase, PostRequest, PostResponse, UserResponse, UserAddress, UserCompany, GeoLocation
 
 __all__ = [
     # Task schemas
     "TaskBase", "TaskCreate", "TaskUpdate", "TaskResponse",
+    "TaskBulkCreate", "TaskBulkUpdateItem", "TaskBulkUpdate", "TaskBulkDelete",
+    "TaskBulkItemResult", "TaskBulkResponse", "TaskFileFormat",
+    "TaskImportError", "TaskImportResult", "TaskSort", "TaskFilter", "TaskStatsResponse",
+    "TaskChangesResponse",
+    # Profiling schemas
+    "ProfileSummary",
     # JSONPlaceholder schemas
     "PostBase", "PostRequest", "PostResponse", "UserResponse", 
     "UserAddress", "UserCompany", "GeoLocation"
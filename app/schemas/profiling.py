@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+class ProfileSummary(BaseModel):
+    """Schema for a stored request profile"""
+    id: str = Field(..., description="Profile ID, also returned in the X-Profile-Id response header")
+    method: str = Field(..., description="HTTP method of the profiled request")
+    path: str = Field(..., description="Path of the profiled request")
+    created_at: datetime = Field(..., description="When the profile was captured")
+    duration_ms: float = Field(..., description="Request duration in milliseconds")
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
+from enum import Enum
 
 class TaskBase(BaseModel):
     """Base schema for task data"""
@@ -23,6 +24,83 @@ class TaskResponse(TaskBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int = Field(1, description="Revision number, incremented on every update")
 
     class Config:
         from_attributes = True
+
+# Maximum number of items accepted by a single bulk request
+BULK_MAX_ITEMS = 1000
+
+class TaskBulkCreate(BaseModel):
+    """Schema for creating several tasks in one request"""
+    items: List[TaskCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS, description="Tasks to create")
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """Schema for one entry of a bulk update"""
+    id: int = Field(..., gt=0, description="ID of the task to update")
+
+class TaskBulkUpdate(BaseModel):
+    """Schema for updating several tasks in one request"""
+    items: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS, description="Task updates to apply")
+
+class TaskBulkDelete(BaseModel):
+    """Schema for deleting several tasks in one request"""
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS, description="IDs of the tasks to delete")
+
+class TaskBulkItemResult(BaseModel):
+    """Schema for the outcome of one item of a bulk request"""
+    id: Optional[int] = Field(None, description="Task ID")
+    status: Literal["created", "updated", "unchanged", "deleted", "not_found"] = Field(..., description="Item outcome")
+    task: Optional[TaskResponse] = Field(None, description="Resulting task, when it exists")
+
+class TaskBulkResponse(BaseModel):
+    """Schema for bulk request responses, with one result per item in request order"""
+    results: List[TaskBulkItemResult]
+
+class TaskFileFormat(str, Enum):
+    """Line-oriented file formats for exporting and importing tasks"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class TaskImportError(BaseModel):
+    """Schema for a line rejected by a task import"""
+    line: int = Field(..., description="1-based line number in the uploaded file (a CSV row's last line)")
+    detail: str = Field(..., description="Why the line was rejected")
+
+class TaskImportResult(BaseModel):
+    """Schema for the outcome of a task import"""
+    imported: int = Field(..., description="Number of tasks created")
+    failed: int = Field(..., description="Number of lines rejected")
+    errors: List[TaskImportError] = Field(default_factory=list, description="Rejected lines (truncated to the first few)")
+
+class TaskSort(str, Enum):
+    """Sort orders accepted by the task list (a leading '-' sorts descending, ties broken by ID)"""
+    ID = "id"
+    ID_DESC = "-id"
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    TITLE = "title"
+    TITLE_DESC = "-title"
+
+class TaskFilter(BaseModel):
+    """Schema for task list filters (date ranges include their start and exclude their end)"""
+    completed: Optional[bool] = Field(None, description="Only completed or only pending tasks")
+    created_after: Optional[datetime] = Field(None, description="Created at or after this time")
+    created_before: Optional[datetime] = Field(None, description="Created before this time")
+    updated_after: Optional[datetime] = Field(None, description="Last updated at or after this time")
+    updated_before: Optional[datetime] = Field(None, description="Last updated before this time")
+
+class TaskStatsResponse(BaseModel):
+    """Schema for task totals by status"""
+    total: int = Field(..., description="Number of tasks")
+    completed: int = Field(..., description="Number of completed tasks")
+    pending: int = Field(..., description="Number of tasks not completed yet")
+
+class TaskChangesResponse(BaseModel):
+    """Schema for the task IDs changed after a watermark, each listed once under its latest change"""
+    inserted: List[int] = Field(..., description="Tasks created after the watermark")
+    updated: List[int] = Field(..., description="Tasks created before the watermark and changed since")
+    deleted: List[int] = Field(..., description="Tasks deleted after the watermark")
+    watermark: int = Field(..., description="Pass as `since` to get the changes after these")
+    has_more: bool = Field(..., description="More changes follow: request again with the new watermark")
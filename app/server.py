@@ -0,0 +1,102 @@
+"""
+Production launcher: prepares the database once, then serves the app from N worker processes.
+
+    python -m app.server --workers 4 --migrate
+
+uvicorn binds the socket in this (supervisor) process and shares it with the
+workers, restarts workers that die, replaces them one by one on SIGHUP
+(graceful reload) and adds or removes one on SIGTTIN / SIGTTOU.
+"""
+import argparse
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import uvicorn
+
+from app.config.database import create_tables
+from app.config.logger import logger
+from app.config.settings import settings
+
+APP = "main:app"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def prepare_database(migrate: bool = False) -> None:
+    """
+    Bring the schema up to date before any worker starts: apply the Alembic
+    migrations, or create the missing tables
+    """
+    if migrate:
+        from alembic import command
+        from alembic.config import Config
+
+        config = Config(str(PROJECT_ROOT / "alembic.ini"))
+        config.set_main_option("script_location", str(PROJECT_ROOT / "app" / "migrations"))
+        # Keep the launcher's logging: alembic.ini's would disable the "app" logger
+        config.attributes["configure_logger"] = False
+        command.upgrade(config, "head")
+        return
+
+    import app.models  # noqa: F401 - registers the tables on Base.metadata
+    create_tables()
+
+
+def worker_count(requested: Optional[int] = None) -> int:
+    """
+    Workers to start: the requested number, else WORKERS, else one per CPU
+    """
+    return requested or settings.WORKERS or os.cpu_count() or 1
+
+
+def run(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    migrate: bool = False,
+) -> None:
+    """
+    Prepare the database, then serve the app (with auto-reload instead when DEBUG is set)
+    """
+    host = host or settings.HOST
+    port = port or settings.PORT
+    if settings.DEBUG:
+        uvicorn.run(APP, host=host, port=port, reload=True, log_level="info")
+        return
+
+    workers = worker_count(workers)
+    prepare_database(migrate)
+
+    # Workers import the app with this environment: the schema is already in place,
+    # and an in-process cache would miss the writes made through the other workers
+    os.environ["DB_SCHEMA_INIT"] = "skip"
+    if workers > 1 and settings.TASK_CACHE_ENABLED:
+        logger.info("Task read cache disabled: it is per process and would serve stale reads across workers")
+        os.environ["TASK_CACHE_ENABLED"] = "False"
+    if workers > 1 and settings.EVENTS_ENABLED and settings.EVENTS_BROKER == "memory":
+        logger.info("Task change feed shared through the database, so every worker sees every write")
+        os.environ["EVENTS_BROKER"] = "database"
+
+    logger.info("Starting %d worker(s) on %s:%s", workers, host, port)
+    uvicorn.run(
+        APP,
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+        log_level="info",
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the API from several worker processes")
+    parser.add_argument("--host", default=None, help=f"Bind address (default: HOST, {settings.HOST})")
+    parser.add_argument("--port", type=int, default=None, help=f"Bind port (default: PORT, {settings.PORT})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: WORKERS, or one per CPU)")
+    parser.add_argument("--migrate", action="store_true", help="Apply Alembic migrations instead of creating missing tables")
+    args = parser.parse_args(argv)
+    run(host=args.host, port=args.port, workers=args.workers, migrate=args.migrate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+from app.config.settings import settings
+from app.utils.cache import CacheBackend, InMemoryCacheBackend
+from app.utils.metrics import registry
+
+
+class TaskCache:
+    """
+    Read-through cache for task reads.
+
+    Single tasks are cached by ID and deleted when that task is written.
+    List pages are keyed by a generation counter that every write bumps, so
+    pages computed before a write can never be served after it.
+    """
+
+    GENERATION_KEY = "tasks:generation"
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _record(self, family: str, hit: bool) -> None:
+        stats = self._stats.setdefault(family, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+
+    async def _read_through(
+        self, family: str, key: str, generation: int, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = await self.backend.get(key)
+        if value is not None:
+            self._record(family, hit=True)
+            return value
+
+        self._record(family, hit=False)
+        value = await loader()
+        # Only store what was read if no write committed in the meantime
+        if await self.backend.counter(self.GENERATION_KEY) == generation:
+            await self.backend.set(key, value, self.ttl)
+        return value
+
+    async def get_task(self, task_id: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a cached task, loading and caching it on a miss
+        """
+        if not self.enabled:
+            return await loader()
+        generation = await self.backend.counter(self.GENERATION_KEY)
+        return await self._read_through("task", f"tasks:item:{task_id}", generation, loader)
+
+    async def get_list(self, params: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a cached list page for the given query parameters
+        """
+        if not self.enabled:
+            return await loader()
+        generation = await self.backend.counter(self.GENERATION_KEY)
+        return await self._read_through("list", f"tasks:list:{generation}:{params}", generation, loader)
+
+    async def invalidate(self, task_ids: Iterable[int] = ()) -> None:
+        """
+        Drop the given tasks and every cached list page; call after each committed write
+        """
+        if not self.enabled:
+            return
+        await self.backend.delete(*(f"tasks:item:{task_id}" for task_id in task_ids))
+        await self.backend.incr(self.GENERATION_KEY)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Hits, misses and hit rate per key family ("task" and "list")
+        """
+        result: Dict[str, Dict[str, float]] = {}
+        for family, stats in self._stats.items():
+            total = stats["hits"] + stats["misses"]
+            result[family] = {**stats, "hit_rate": stats["hits"] / total if total else 0.0}
+        return result
+
+
+task_cache = TaskCache(
+    InMemoryCacheBackend(settings.TASK_CACHE_MAX_ENTRIES),
+    ttl=settings.TASK_CACHE_TTL,
+    enabled=settings.TASK_CACHE_ENABLED,
+)
+
+registry.callback(
+    "task_cache_requests_total",
+    "Task cache lookups by key family and result",
+    lambda: {
+        (family, result): stats[result]
+        for family, stats in task_cache.stats().items()
+        for result in ("hits", "misses")
+    },
+    ["family", "result"],
+    kind="counter",
+)
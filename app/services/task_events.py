@@ -0,0 +1,174 @@
+import asyncio
+import json
+from contextlib import suppress
+from typing import Any, AsyncContextManager, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config.database import DbSession, session_scope
+from app.config.logger import logger
+from app.config.settings import settings
+from app.models.task import TaskEvent
+from app.schemas.task import TaskResponse
+from app.utils.events import Event, EventBroker, InMemoryEventBroker, Subscription
+from app.utils.metrics import registry
+
+published_events = registry.counter("task_events_published_total", "Task change events published", ["type"])
+
+
+class DatabaseEventBroker(EventBroker):
+    """
+    Broker sharing the feed between the worker processes of one host through
+    the task_events table: events are inserted there and every process polls
+    for new rows (waking up early after its own publishes), so event IDs and
+    resume positions are the same on every worker.
+
+    A local stand-in for a shared message bus; it relies on SQLite committing
+    one writer at a time, so rows become visible in ID order.
+    """
+
+    POLL_BATCH = 500
+
+    def __init__(self, buffer_size: int, history_size: int, poll_interval: float):
+        super().__init__(buffer_size)
+        self.history_size = history_size
+        self.poll_interval = poll_interval
+        self._poller: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._since_prune = 0
+
+    async def start(self) -> None:
+        if self._poller is not None:
+            return
+        async with session_scope() as db:
+            self.last_id = await db.scalar(select(func.max(TaskEvent.id))) or 0
+        self._wake = asyncio.Event()
+        self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            poller, self._poller = self._poller, None
+            poller.cancel()
+            with suppress(asyncio.CancelledError):
+                await poller
+        await super().stop()
+
+    async def publish(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        async with session_scope() as db:
+            rows = [{"type": event_type, "data": json.dumps(data)} for event_type, data in events]
+            await db.execute(insert(TaskEvent), rows)
+            self._since_prune += len(events)
+            # Keep the newest history_size entries, trimming every tenth of that
+            if self._since_prune >= max(1, self.history_size // 10):
+                self._since_prune = 0
+                newest = await db.scalar(select(func.max(TaskEvent.id)))
+                await db.execute(delete(TaskEvent).where(TaskEvent.id <= newest - self.history_size))
+            await db.commit()
+        if self._wake is not None:
+            self._wake.set()
+
+    @staticmethod
+    async def _fetch(db: DbSession, after_id: int, limit: int) -> List[Event]:
+        rows = await db.execute(
+            select(TaskEvent.id, TaskEvent.type, TaskEvent.data)
+            .where(TaskEvent.id > after_id)
+            .order_by(TaskEvent.id)
+            .limit(limit)
+        )
+        return [Event(row.id, row.type, json.loads(row.data)) for row in rows.all()]
+
+    async def _poll(self) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            self._wake.clear()
+            try:
+                async with session_scope() as db:
+                    events = await self._fetch(db, self.last_id, self.POLL_BATCH)
+            except SQLAlchemyError as exc:
+                logger.warning("Task event poll failed: %s", exc)
+                continue
+            self._fan_out(events)
+            if len(events) == self.POLL_BATCH:
+                self._wake.set()
+
+    async def events_after(self, last_id: int) -> Optional[List[Event]]:
+        async with session_scope() as db:
+            oldest, newest = (await db.execute(select(func.min(TaskEvent.id), func.max(TaskEvent.id)))).one()
+            if oldest is None:
+                return [] if last_id == 0 else None
+            # Behind the retained history, or ahead of every event ever published
+            if last_id < oldest - 1 or last_id > newest:
+                return None
+            # One more than a subscriber can buffer is enough to tell that it cannot catch up
+            return await self._fetch(db, last_id, self.buffer_size + 1)
+
+
+class TaskEvents:
+    """
+    Task change feed: create, update and delete events published by
+    TaskService after each committed write, for SSE and WebSocket subscribers
+    """
+
+    CREATED = "task.created"
+    UPDATED = "task.updated"
+    DELETED = "task.deleted"
+    # Imports insert in chunks without reading the rows back: one event per chunk
+    IMPORTED = "tasks.imported"
+
+    def __init__(self, broker: EventBroker, enabled: bool = True):
+        self.broker = broker
+        self.enabled = enabled
+
+    async def _publish(self, event_type: str, payloads: Sequence[Dict[str, Any]]) -> None:
+        if not self.enabled or not payloads:
+            return
+        try:
+            await self.broker.publish([(event_type, payload) for payload in payloads])
+        except SQLAlchemyError as exc:
+            # The write itself is committed: a lost event must not fail the request
+            logger.warning("Publishing %d %s events failed: %s", len(payloads), event_type, exc)
+            return
+        published_events.inc(len(payloads), type=event_type)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> AsyncContextManager[Subscription]:
+        return self.broker.subscribe(last_event_id)
+
+    async def created(self, tasks: Sequence[TaskResponse]) -> None:
+        await self._publish(self.CREATED, [task.model_dump(mode="json") for task in tasks])
+
+    async def updated(self, tasks: Sequence[TaskResponse]) -> None:
+        await self._publish(self.UPDATED, [task.model_dump(mode="json") for task in tasks])
+
+    async def deleted(self, task_ids: Sequence[int]) -> None:
+        await self._publish(self.DELETED, [{"id": task_id} for task_id in task_ids])
+
+    async def imported(self, count: int) -> None:
+        await self._publish(self.IMPORTED, [{"count": count}])
+
+
+def create_broker() -> EventBroker:
+    """
+    Event broker selected by EVENTS_BROKER ("memory" or "database")
+    """
+    if settings.EVENTS_BROKER == "database":
+        return DatabaseEventBroker(
+            settings.EVENTS_BUFFER_SIZE, settings.EVENTS_HISTORY_SIZE, settings.EVENTS_POLL_INTERVAL
+        )
+    if settings.EVENTS_BROKER != "memory":
+        raise ValueError(f"Unknown EVENTS_BROKER {settings.EVENTS_BROKER!r}, expected memory or database")
+    return InMemoryEventBroker(settings.EVENTS_BUFFER_SIZE, settings.EVENTS_HISTORY_SIZE)
+
+
+task_events = TaskEvents(create_broker(), enabled=settings.EVENTS_ENABLED)
+
+registry.callback(
+    "task_event_subscribers", "Open task change feed subscriptions", lambda: {(): task_events.broker.subscribers}
+)
+registry.callback(
+    "task_event_subscribers_dropped_total",
+    "Subscribers disconnected for falling a whole buffer behind",
+    lambda: {(): task_events.broker.dropped},
+    kind="counter",
+)
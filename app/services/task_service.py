@@ -1,76 +1,697 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import csv
+import io
+import operator
+import re
+from datetime import datetime, timezone
+from typing import (
+    Any, AsyncContextManager, AsyncIterable, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple, Union
+)
+from pydantic import ValidationError
+from sqlalchemy import and_, case, delete, func, insert, literal, literal_column, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import ColumnElement, Select
 
-from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
-from app.utils.errors import NotFoundException
+from app.config.database import DbSession, iter_partitions, session_scope
+from app.config.settings import settings
+from app.models.task import Task, TaskChange, TaskStats, TASK_SEARCH_TABLE, TASK_STATS_ID, task_search
+from app.services.task_cache import task_cache
+from app.services.task_events import task_events
+from app.services.write_batcher import WriteOp, write_batcher
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskBulkUpdateItem, TaskBulkItemResult, TaskFileFormat,
+    TaskImportError, TaskImportResult, TaskSort, TaskFilter, TaskStatsResponse, TaskChangesResponse
+)
+from app.utils.errors import BadRequestException, NotFoundException, PreconditionFailedException
+from app.utils.events import Subscription
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.responses import json_dumps
+from app.utils.streaming import iter_csv_rows, iter_lines
+
+# Columns written by exports, in output order
+EXPORT_COLUMNS = (Task.id, Task.title, Task.description, Task.completed, Task.created_at, Task.updated_at)
+# Columns selected by list reads, in TaskResponse field order
+RESPONSE_COLUMNS = tuple(getattr(Task, name) for name in TaskResponse.model_fields)
+# Columns the task list can be sorted on (see TaskSort)
+SORT_COLUMNS = {"id": Task.id, "created_at": Task.created_at, "title": Task.title}
+# bm25 weights of the indexed columns (title, description): title matches rank first
+SEARCH_WEIGHTS = (2.0, 1.0)
+
+def _encode_ndjson(rows: Sequence[Row]) -> bytes:
+    return b"".join(json_dumps(row._asdict()) + b"\n" for row in rows)
+
+def _encode_csv(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(value.isoformat() if isinstance(value, datetime) else value for value in row)
+    return buffer.getvalue().encode()
+
+def _utc_naive(value: datetime) -> datetime:
+    # Timestamps are stored in UTC without an offset
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+def _filter_clauses(filters: TaskFilter) -> List[ColumnElement]:
+    clauses = []
+    if filters.completed is not None:
+        clauses.append(Task.completed == filters.completed)
+    if filters.created_after is not None:
+        clauses.append(Task.created_at >= _utc_naive(filters.created_after))
+    if filters.created_before is not None:
+        clauses.append(Task.created_at < _utc_naive(filters.created_before))
+    if filters.updated_after is not None:
+        clauses.append(Task.updated_at >= _utc_naive(filters.updated_after))
+    if filters.updated_before is not None:
+        clauses.append(Task.updated_at < _utc_naive(filters.updated_before))
+    return clauses
+
+def _list_key(filters: TaskFilter, sort: TaskSort, version: Optional[int] = None) -> str:
+    # Cache key part for the filters and sort of a list read, and the table version it is tagged with
+    values = filters.model_dump(mode="json", exclude_none=True)
+    parts = [f"sort={sort.value}", *(f"{name}={value}" for name, value in sorted(values.items()))]
+    if version is not None:
+        parts.append(f"version={version}")
+    return "&".join(parts)
+
+def _search_terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query)
+
+def _describe_error(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'line'}: {error['msg']}"
+            for error in exc.errors()
+        )
+    return str(exc)
+
+async def _iter_import_rows(
+    chunks: AsyncIterable[bytes], file_format: TaskFileFormat
+) -> AsyncIterator[Tuple[int, Union[str, List[str], csv.Error]]]:
+    if file_format == TaskFileFormat.CSV:
+        async for row in iter_csv_rows(iter_lines(chunks, keepends=True)):
+            yield row
+    else:
+        line_number = 0
+        async for line in iter_lines(chunks):
+            line_number += 1
+            yield line_number, line
 
 class TaskService:
     """
     Service for handling task operations
     """
-    
+
     @staticmethod
     def _to_response(task: Task) -> TaskResponse:
         """
         Convert Task ORM model to TaskResponse schema
         """
         return TaskResponse.model_validate(task)
-    
+
+    @staticmethod
+    async def _get_or_404(db: DbSession, task_id: int) -> Task:
+        """
+        Load a task by ID or raise NotFoundException
+        """
+        task = await db.get(Task, task_id)
+        if task is None:
+            raise NotFoundException(f"Task with ID {task_id} not found")
+        return task
+
+    @staticmethod
+    def _list_statement(filters: TaskFilter, sort: TaskSort) -> Select:
+        """
+        Select the filtered tasks in the requested order, ties broken by ID
+        """
+        key = SORT_COLUMNS[sort.value.lstrip("-")]
+        descending = sort.value.startswith("-")
+        order = [key] if key is Task.id else [key, Task.id]
+        return (
+            select(*RESPONSE_COLUMNS)
+            .where(*_filter_clauses(filters))
+            .order_by(*(column.desc() if descending else column for column in order))
+        )
+
+    @staticmethod
+    def _seek_clause(position: Dict[str, Any], sort: TaskSort) -> Optional[ColumnElement]:
+        """
+        Keyset condition for the rows after a decoded cursor position, None for the first page
+        """
+        if not position:
+            return None
+        invalid = BadRequestException("Invalid pagination cursor", code="INVALID_CURSOR")
+        after_id = position.get("id")
+        if position.get("sort", TaskSort.ID.value) != sort.value or not isinstance(after_id, int) or after_id < 0:
+            raise invalid
+
+        key = SORT_COLUMNS[sort.value.lstrip("-")]
+        after = operator.lt if sort.value.startswith("-") else operator.gt
+        if key is Task.id:
+            return after(Task.id, after_id)
+        after_key = position.get("key")
+        if not isinstance(after_key, str):
+            raise invalid
+        if key is Task.created_at:
+            try:
+                after_key = datetime.fromisoformat(after_key)
+            except ValueError:
+                raise invalid
+        return or_(after(key, after_key), and_(key == after_key, after(Task.id, after_id)))
+
+    @staticmethod
+    def _cursor_after(row: Row, sort: TaskSort) -> str:
+        """
+        Encode the cursor positioned on a row for the given sort
+        """
+        position: Dict[str, Any] = {"id": row.id}
+        if sort != TaskSort.ID:
+            position["sort"] = sort.value
+        name = sort.value.lstrip("-")
+        if name != "id":
+            value = getattr(row, name)
+            position["key"] = value.isoformat() if isinstance(value, datetime) else value
+        return encode_cursor(position)
+
     @staticmethod
-    async def get_tasks(db: Session, skip: int = 0, limit: int = 100) -> List[TaskResponse]:
+    async def get_tasks(
+        db: DbSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[TaskFilter] = None,
+        sort: TaskSort = TaskSort.ID,
+        version: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Get all tasks with pagination
+        Get the tasks matching the filters, sorted and paginated.
+
+        Rows are read as plain column values shaped like TaskResponse, without
+        building ORM objects or models, ready to be serialized once. A table
+        version read beforehand keys the cached page, so a page is never
+        served under a newer version than its rows.
+        """
+        filters = filters or TaskFilter()
+
+        async def load() -> List[Dict[str, Any]]:
+            result = await db.execute(TaskService._list_statement(filters, sort).offset(skip).limit(limit))
+            return [row._asdict() for row in result.all()]
+
+        return await task_cache.get_list(f"skip={skip}&limit={limit}&{_list_key(filters, sort, version)}", load)
+
+    @staticmethod
+    async def get_tasks_page(
+        db: DbSession,
+        cursor: str = "",
+        limit: int = 100,
+        filters: Optional[TaskFilter] = None,
+        sort: TaskSort = TaskSort.ID,
+        version: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get a page of the tasks matching the filters after the given cursor,
+        seeking on the sort key and the primary key.
+
+        Returns the page as plain rows (see get_tasks) and the cursor for the
+        next one (None on the last page).
         """
-        tasks = db.query(Task).offset(skip).limit(limit).all()
-        return [TaskService._to_response(task) for task in tasks]
-    
+        filters = filters or TaskFilter()
+        position = decode_cursor(cursor)
+        seek = TaskService._seek_clause(position, sort)
+
+        async def load() -> Tuple[List[Dict[str, Any]], Optional[str]]:
+            stmt = TaskService._list_statement(filters, sort)
+            if seek is not None:
+                stmt = stmt.where(seek)
+            # Fetch one extra row to know whether another page follows
+            result = await db.execute(stmt.limit(limit + 1))
+            rows = result.all()
+            next_cursor = TaskService._cursor_after(rows[limit - 1], sort) if len(rows) > limit else None
+            return [row._asdict() for row in rows[:limit]], next_cursor
+
+        return await task_cache.get_list(f"after={cursor}&limit={limit}&{_list_key(filters, sort, version)}", load)
+
+    @staticmethod
+    async def get_stats(db: DbSession) -> TaskStatsResponse:
+        """
+        Get task totals by status.
+
+        Reads the counters maintained by the SQLite triggers on tasks; databases
+        without them fall back to counting (through the read cache).
+        """
+        result = await db.execute(
+            select(TaskStats.total, TaskStats.completed).where(TaskStats.id == TASK_STATS_ID)
+        )
+        row = result.one_or_none()
+        if row is None:
+            async def load() -> Tuple[int, int]:
+                counts = await db.execute(
+                    select(func.count(Task.id), func.coalesce(func.sum(case((Task.completed.is_(True), 1), else_=0)), 0))
+                )
+                return tuple(counts.one())
+
+            row = await task_cache.get_list("stats", load)
+        total, completed = row
+        return TaskStatsResponse(total=total, completed=completed, pending=total - completed)
+
+    @staticmethod
+    async def get_collection_version(db: DbSession) -> Optional[int]:
+        """
+        Version of the tasks table, bumped by the SQLite triggers on every write;
+        None on databases without them
+        """
+        return await db.scalar(select(TaskStats.version).where(TaskStats.id == TASK_STATS_ID))
+
+    @staticmethod
+    async def get_changes(db: DbSession, since: int = 0, limit: int = 1000) -> TaskChangesResponse:
+        """
+        IDs of the tasks changed after the since watermark, oldest change first.
+
+        Reads the task_changes rows maintained by the SQLite triggers on tasks
+        through their version index, so the cost follows the number of changes.
+        """
+        if db.get_bind().dialect.name != "sqlite":
+            raise NotFoundException("Task change tracking is not available on this database")
+
+        result = await db.execute(
+            select(TaskChange.task_id, TaskChange.version, TaskChange.created_version, TaskChange.deleted)
+            .where(TaskChange.version > since)
+            .order_by(TaskChange.version)
+            .limit(limit + 1)
+        )
+        rows = result.all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        inserted, updated, deleted = [], [], []
+        for row in rows:
+            # Deletions are always reported: the ID may have belonged to an older task
+            if row.deleted:
+                deleted.append(row.task_id)
+            elif row.created_version > since:
+                inserted.append(row.task_id)
+            else:
+                updated.append(row.task_id)
+        watermark = rows[-1].version if rows else since
+        return TaskChangesResponse(
+            inserted=inserted, updated=updated, deleted=deleted, watermark=watermark, has_more=has_more
+        )
+
+    @staticmethod
+    def _search_statement(db: DbSession, terms: List[str]) -> Tuple[Select, ColumnElement]:
+        """
+        Select the tasks matching every term as a prefix, and their rank (lower ranks first).
+
+        SQLite reads the FTS5 index and ranks with bm25; other backends fall back
+        to unranked LIKE matching.
+        """
+        if db.get_bind().dialect.name == "sqlite":
+            search = literal_column(TASK_SEARCH_TABLE)
+            rank = func.bm25(search, *SEARCH_WEIGHTS)
+            match = " ".join(f'"{term}"*' for term in terms)
+            stmt = (
+                select(*RESPONSE_COLUMNS, rank.label("rank"))
+                .join_from(task_search, Task, Task.id == task_search.c.rowid)
+                .where(search.op("MATCH")(match))
+            )
+            return stmt, rank
+
+        rank = literal(0.0)
+        stmt = select(*RESPONSE_COLUMNS, rank.label("rank")).where(
+            *(
+                or_(Task.title.icontains(term, autoescape=True), Task.description.icontains(term, autoescape=True))
+                for term in terms
+            )
+        )
+        return stmt, rank
+
+    @staticmethod
+    def _search_row(row: Row) -> Dict[str, Any]:
+        values = row._asdict()
+        del values["rank"]
+        return values
+
+    @staticmethod
+    async def search_tasks(db: DbSession, query: str, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Search task titles and descriptions, best matches first, with skip/limit pagination
+        """
+        terms = _search_terms(query)
+        if not terms:
+            return []
+
+        async def load() -> List[Dict[str, Any]]:
+            stmt, rank = TaskService._search_statement(db, terms)
+            result = await db.execute(stmt.order_by(rank, Task.id).offset(skip).limit(limit))
+            return [TaskService._search_row(row) for row in result.all()]
+
+        return await task_cache.get_list(f"search={' '.join(terms)}&skip={skip}&limit={limit}", load)
+
+    @staticmethod
+    async def search_tasks_page(
+        db: DbSession, query: str, cursor: str = "", limit: int = 100
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Search task titles and descriptions, best matches first, seeking on (rank, id)
+        after the given cursor.
+
+        Returns the page and the cursor for the next one (None on the last page).
+        """
+        position = decode_cursor(cursor)
+        after_rank, after_id = position.get("rank"), position.get("id", 0)
+        if (
+            not isinstance(after_id, int) or after_id < 0
+            or not (after_rank is None or isinstance(after_rank, (int, float)))
+        ):
+            raise BadRequestException("Invalid pagination cursor", code="INVALID_CURSOR")
+        terms = _search_terms(query)
+        if not terms:
+            return [], None
+
+        async def load() -> Tuple[List[Dict[str, Any]], Optional[str]]:
+            stmt, rank = TaskService._search_statement(db, terms)
+            if after_rank is not None:
+                stmt = stmt.where(or_(rank > after_rank, (rank == after_rank) & (Task.id > after_id)))
+            # Fetch one extra row to know whether another page follows
+            result = await db.execute(stmt.order_by(rank, Task.id).limit(limit + 1))
+            rows = result.all()
+            next_cursor = (
+                encode_cursor({"rank": rows[limit - 1].rank, "id": rows[limit - 1].id}) if len(rows) > limit else None
+            )
+            return [TaskService._search_row(row) for row in rows[:limit]], next_cursor
+
+        return await task_cache.get_list(
+            f"search={' '.join(terms)}&after={after_rank},{after_id}&limit={limit}", load
+        )
+
     @staticmethod
-    async def get_task(db: Session, task_id: int) -> TaskResponse:
+    async def get_task(db: DbSession, task_id: int) -> TaskResponse:
         """
         Get a task by ID
         """
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task is None:
-            raise NotFoundException(f"Task with ID {task_id} not found")
-        return TaskService._to_response(task)
-    
+        async def load() -> TaskResponse:
+            return TaskService._to_response(await TaskService._get_or_404(db, task_id))
+
+        return await task_cache.get_task(task_id, load)
+
+    @staticmethod
+    def _supports_returning(db: DbSession, statement: str) -> bool:
+        """
+        Whether the database supports RETURNING on "insert", "update" or "delete"
+        """
+        return getattr(db.get_bind().dialect, f"{statement}_returning")
+
+    @staticmethod
+    async def _commit_write(db: DbSession, op: WriteOp) -> Any:
+        """
+        Apply a single-task write and commit it: batched with concurrent writes
+        when group commit is running, otherwise in the request's own session
+        """
+        if write_batcher.running:
+            return await write_batcher.submit(op)
+        try:
+            result = await op(db)
+        except Exception:
+            await db.rollback()
+            raise
+        await db.commit()
+        return result
+
+    @staticmethod
+    async def _insert_task(db: DbSession, task_data: TaskCreate) -> TaskResponse:
+        """
+        Insert a task with a single INSERT ... RETURNING, without committing
+        """
+        if not TaskService._supports_returning(db, "insert"):
+            task = Task(**task_data.model_dump())
+            db.add(task)
+            await db.flush()
+            await db.refresh(task)
+            return TaskService._to_response(task)
+
+        result = await db.execute(insert(Task).values(**task_data.model_dump()).returning(*RESPONSE_COLUMNS))
+        return TaskResponse.model_validate(result.one()._asdict())
+
+    @staticmethod
+    def _check_version(task_id: int, version: int, expected_versions: Optional[List[int]]) -> None:
+        """
+        Raise PreconditionFailedException when a task's version is not one the client expects
+        """
+        if expected_versions is not None and version not in expected_versions:
+            raise PreconditionFailedException(f"Task with ID {task_id} has been modified")
+
+    @staticmethod
+    async def _not_found_or_modified(db: DbSession, task_id: int) -> Exception:
+        """
+        Why a conditional write matched no row: the task is missing or its version differs
+        """
+        if await db.scalar(select(Task.id).where(Task.id == task_id)) is None:
+            return NotFoundException(f"Task with ID {task_id} not found")
+        return PreconditionFailedException(f"Task with ID {task_id} has been modified")
+
+    @staticmethod
+    async def _update_task(
+        db: DbSession, task_id: int, update_data: Dict[str, Any], expected_versions: Optional[List[int]] = None
+    ) -> TaskResponse:
+        """
+        Update a task with a single UPDATE ... WHERE id = ... RETURNING, without committing.
+
+        With expected_versions the UPDATE also matches on the version, so a task
+        changed concurrently is rejected without a separate read.
+        """
+        if not TaskService._supports_returning(db, "update"):
+            task = await TaskService._get_or_404(db, task_id)
+            TaskService._check_version(task_id, task.version, expected_versions)
+            for key, value in update_data.items():
+                setattr(task, key, value)
+            await db.flush()
+            await db.refresh(task)
+            return TaskService._to_response(task)
+
+        stmt = update(Task).where(Task.id == task_id)
+        if expected_versions is not None:
+            stmt = stmt.where(Task.version.in_(expected_versions))
+        result = await db.execute(
+            stmt.values(**update_data).returning(*RESPONSE_COLUMNS).execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise await TaskService._not_found_or_modified(db, task_id)
+        return TaskResponse.model_validate(row._asdict())
+
+    @staticmethod
+    async def _delete_task(db: DbSession, task_id: int, expected_versions: Optional[List[int]] = None) -> None:
+        """
+        Delete a task with a single DELETE ... RETURNING (row count where unsupported), without committing
+        """
+        stmt = delete(Task).where(Task.id == task_id).execution_options(synchronize_session=False)
+        if expected_versions is not None:
+            stmt = stmt.where(Task.version.in_(expected_versions))
+        if TaskService._supports_returning(db, "delete"):
+            result = await db.execute(stmt.returning(Task.id))
+            deleted = result.scalar_one_or_none() is not None
+        else:
+            result = await db.execute(stmt)
+            deleted = result.rowcount > 0
+        if not deleted:
+            raise await TaskService._not_found_or_modified(db, task_id)
+
     @staticmethod
-    async def create_task(db: Session, task_data: TaskCreate) -> TaskResponse:
+    async def create_task(db: DbSession, task_data: TaskCreate) -> TaskResponse:
         """
         Create a new task
         """
-        task = Task(**task_data.model_dump())
-        db.add(task)
-        db.commit()
-        db.refresh(task)
-        return TaskService._to_response(task)
-    
+        task = await TaskService._commit_write(db, lambda session: TaskService._insert_task(session, task_data))
+        await task_cache.invalidate()
+        await task_events.created([task])
+        return task
+
     @staticmethod
-    async def update_task(db: Session, task_id: int, task_data: TaskUpdate) -> TaskResponse:
+    async def update_task(
+        db: DbSession, task_id: int, task_data: TaskUpdate, expected_versions: Optional[List[int]] = None
+    ) -> TaskResponse:
         """
-        Update an existing task
+        Update an existing task, optionally only if it is still at one of the expected versions
         """
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task is None:
-            raise NotFoundException(f"Task with ID {task_id} not found")
-        
         # Update only provided fields
         update_data = task_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(task, key, value)
-        
-        db.commit()
-        db.refresh(task)
-        return TaskService._to_response(task)
-    
+        if not update_data:
+            task = await TaskService.get_task(db, task_id)
+            TaskService._check_version(task_id, task.version, expected_versions)
+            return task
+
+        task = await TaskService._commit_write(
+            db, lambda session: TaskService._update_task(session, task_id, update_data, expected_versions)
+        )
+        await task_cache.invalidate([task_id])
+        await task_events.updated([task])
+        return task
+
     @staticmethod
-    async def delete_task(db: Session, task_id: int) -> None:
+    async def delete_task(db: DbSession, task_id: int, expected_versions: Optional[List[int]] = None) -> None:
         """
-        Delete a task
+        Delete a task, optionally only if it is still at one of the expected versions
         """
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task is None:
-            raise NotFoundException(f"Task with ID {task_id} not found")
-        db.delete(task)
-        db.commit()
+        await TaskService._commit_write(
+            db, lambda session: TaskService._delete_task(session, task_id, expected_versions)
+        )
+        await task_cache.invalidate([task_id])
+        await task_events.deleted([task_id])
+
+    @staticmethod
+    async def _existing_ids(db: DbSession, task_ids: List[int]) -> Set[int]:
+        """
+        Return which of the given task IDs exist
+        """
+        result = await db.scalars(select(Task.id).where(Task.id.in_(set(task_ids))))
+        return set(result.all())
+
+    @staticmethod
+    async def bulk_create_tasks(db: DbSession, items: List[TaskCreate]) -> List[TaskBulkItemResult]:
+        """
+        Create several tasks in a single transaction
+        """
+        # One executemany-style INSERT ... RETURNING per distinct set of provided columns
+        result = await db.scalars(
+            insert(Task).returning(Task, sort_by_parameter_order=True),
+            [item.model_dump() for item in items],
+        )
+        tasks = [TaskService._to_response(task) for task in result.all()]
+        await db.commit()
+        await task_cache.invalidate()
+        await task_events.created(tasks)
+        return [TaskBulkItemResult(id=task.id, status="created", task=task) for task in tasks]
+
+    @staticmethod
+    async def bulk_update_tasks(db: DbSession, items: List[TaskBulkUpdateItem]) -> List[TaskBulkItemResult]:
+        """
+        Update several tasks in a single transaction, reporting missing IDs as not_found
+        and items without fields to change as unchanged
+        """
+        existing = await TaskService._existing_ids(db, [item.id for item in items])
+
+        # Update only provided fields, batched by primary key
+        rows = []
+        for item in items:
+            values = item.model_dump(exclude_unset=True, exclude={"id"})
+            if item.id in existing and values:
+                rows.append({"id": item.id, **values})
+        changed = {row["id"] for row in rows}
+        if rows:
+            await db.execute(update(Task), rows)
+        await db.commit()
+        if changed:
+            await task_cache.invalidate(changed)
+
+        result = await db.scalars(
+            select(Task).where(Task.id.in_(existing)).execution_options(populate_existing=True)
+        )
+        tasks = {task.id: TaskService._to_response(task) for task in result.all()}
+        await task_events.updated([task for task_id, task in tasks.items() if task_id in changed])
+        return [
+            TaskBulkItemResult(
+                id=item.id, status="updated" if item.model_fields_set - {"id"} else "unchanged", task=tasks[item.id]
+            )
+            if item.id in tasks
+            else TaskBulkItemResult(id=item.id, status="not_found")
+            for item in items
+        ]
+
+    @staticmethod
+    async def bulk_delete_tasks(db: DbSession, task_ids: List[int]) -> List[TaskBulkItemResult]:
+        """
+        Delete several tasks in a single transaction, reporting missing IDs as not_found
+        """
+        existing = await TaskService._existing_ids(db, task_ids)
+        if existing:
+            await db.execute(
+                delete(Task).where(Task.id.in_(existing)).execution_options(synchronize_session=False)
+            )
+        await db.commit()
+        await task_cache.invalidate(existing)
+        await task_events.deleted(sorted(existing))
+        return [
+            TaskBulkItemResult(id=task_id, status="deleted" if task_id in existing else "not_found")
+            for task_id in task_ids
+        ]
+
+    @staticmethod
+    def subscribe_events(last_event_id: Optional[int] = None) -> AsyncContextManager[Subscription]:
+        """
+        Subscribe to the task change feed, resuming after last_event_id when given
+        """
+        if not task_events.enabled:
+            raise NotFoundException("Task change feed is disabled")
+        return task_events.subscribe(last_event_id)
+
+    @staticmethod
+    async def export_tasks(file_format: TaskFileFormat) -> AsyncIterator[bytes]:
+        """
+        Stream every task as NDJSON or CSV, yielding one encoded chunk per fetched batch.
+
+        Opens its own session because the response body is sent after the
+        request handler (and its get_db session) has finished.
+        """
+        if file_format == TaskFileFormat.CSV:
+            encode = _encode_csv
+            yield ",".join(column.key for column in EXPORT_COLUMNS).encode() + b"\r\n"
+        else:
+            encode = _encode_ndjson
+
+        stmt = select(*EXPORT_COLUMNS).order_by(Task.id)
+        async with session_scope() as db:
+            async for rows in iter_partitions(db, stmt, settings.EXPORT_BATCH_SIZE):
+                yield encode(rows)
+
+    @staticmethod
+    async def import_tasks(
+        db: DbSession, chunks: AsyncIterable[bytes], file_format: TaskFileFormat
+    ) -> TaskImportResult:
+        """
+        Create tasks from an NDJSON or CSV byte stream.
+
+        Lines are validated against TaskCreate as they arrive and inserted in
+        chunks of IMPORT_CHUNK_SIZE rows with one commit per chunk, so the
+        upload is never held in memory. Invalid lines are skipped and reported.
+        CSV input needs a header row; quoted fields may span lines (errors
+        report a row's last line) and unknown columns (e.g. id from an export)
+        are ignored.
+        """
+        result = TaskImportResult(imported=0, failed=0)
+        batch: List[Dict[str, Any]] = []
+        header: Optional[List[str]] = None
+
+        async def flush() -> None:
+            await db.execute(insert(Task), batch)
+            await db.commit()
+            await task_cache.invalidate()
+            await task_events.imported(len(batch))
+            result.imported += len(batch)
+            batch.clear()
+
+        async for line_number, row in _iter_import_rows(chunks, file_format):
+            # Skip blank lines (and CSV rows whose fields are all empty)
+            if not isinstance(row, csv.Error) and not "".join(row).strip():
+                continue
+            try:
+                if isinstance(row, csv.Error):
+                    raise row
+                if isinstance(row, list):
+                    if header is None:
+                        header = [name.strip() for name in row]
+                        continue
+                    task_data = TaskCreate.model_validate(
+                        {name: value for name, value in zip(header, row) if value != ""}
+                    )
+                else:
+                    task_data = TaskCreate.model_validate_json(row)
+            except (ValidationError, csv.Error) as e:
+                result.failed += 1
+                if len(result.errors) < settings.IMPORT_MAX_ERRORS:
+                    result.errors.append(TaskImportError(line=line_number, detail=_describe_error(e)))
+                continue
+
+            batch.append(task_data.model_dump())
+            if len(batch) >= settings.IMPORT_CHUNK_SIZE:
+                await flush()
+
+        if batch:
+            await flush()
+        return result
@@ -0,0 +1,157 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.config.database import DbSession, session_scope
+from app.config.logger import logger
+from app.config.settings import settings
+from app.utils.metrics import registry
+
+# A write to apply inside the shared transaction: statements only, no commit
+WriteOp = Callable[[DbSession], Awaitable[Any]]
+
+batch_size = registry.histogram(
+    "task_write_batch_size",
+    "Writes committed together per group-commit transaction",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+
+class WriteBatcher:
+    """
+    Group commit for single-task writes.
+
+    Writes submitted while the batcher runs are queued and applied together in
+    one transaction, flushed once ``max_size`` writes are queued or ``window``
+    seconds after the first one. When a write fails, the batch is replayed with
+    a savepoint per write so the failure only rolls back that write; each caller
+    gets its own result or exception once the shared commit is done.
+    """
+
+    def __init__(self, max_size: int, window: float):
+        self.max_size = max_size
+        self.window = window
+        self._queue: Optional["asyncio.Queue[Optional[Tuple[WriteOp, asyncio.Future]]]"] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None
+
+    def start(self) -> None:
+        """
+        Start the flush loop on the running event loop
+        """
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Flush the queued writes and stop the flush loop
+        """
+        if self._worker is None:
+            return
+        worker, self._worker = self._worker, None
+        self._queue.put_nowait(None)
+        await worker
+
+    async def submit(self, op: WriteOp) -> Any:
+        """
+        Queue a write and wait for the commit of the batch it lands in
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, future))
+        return await future
+
+    async def _collect(self) -> Tuple[List[Tuple[WriteOp, asyncio.Future]], bool]:
+        """
+        Wait for the next batch; the flag is False once stop() was requested
+        """
+        item = await self._queue.get()
+        if item is None:
+            return [], False
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_size:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            if item is None:
+                return batch, False
+            batch.append(item)
+        return batch, True
+
+    async def _run(self) -> None:
+        running = True
+        while running:
+            batch, running = await self._collect()
+            if batch:
+                await self._flush(batch)
+
+    async def _apply(
+        self, db: DbSession, batch: List[Tuple[WriteOp, asyncio.Future]], isolate: bool
+    ) -> List[Tuple[bool, Any]]:
+        """
+        Run the writes of a batch and commit them at once.
+
+        Without isolation the first failing write raises; with it each write runs
+        in its own savepoint, so a failure only rolls back that write.
+        """
+        if isolate and db.get_bind().dialect.name == "sqlite":
+            # Take the write lock up front; the driver would otherwise leave the
+            # first savepoint as the outermost transaction and commit on its release
+            await db.execute(text("BEGIN IMMEDIATE"))
+        outcomes: List[Tuple[bool, Any]] = []
+        for op, _ in batch:
+            if not isolate:
+                outcomes.append((True, await op(db)))
+                continue
+            savepoint = await db.begin_nested()
+            try:
+                result = await op(db)
+            except Exception as exc:
+                await savepoint.rollback()
+                outcomes.append((False, exc))
+            else:
+                await savepoint.commit()
+                outcomes.append((True, result))
+        await db.commit()
+        return outcomes
+
+    async def _flush(self, batch: List[Tuple[WriteOp, asyncio.Future]]) -> None:
+        """
+        Apply a batch of writes in one transaction and resolve their futures
+        """
+        try:
+            async with session_scope() as db:
+                try:
+                    outcomes = await self._apply(db, batch, isolate=False)
+                except Exception:
+                    # Replay the batch with a savepoint per write, so only the failing ones are rejected
+                    await db.rollback()
+                    outcomes = await self._apply(db, batch, isolate=True)
+        except Exception as exc:
+            logger.error("Group commit of %d writes failed: %s", len(batch), exc)
+            outcomes = [(False, exc)] * len(batch)
+
+        batch_size.observe(len(batch))
+        for (_, future), (ok, value) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+write_batcher = WriteBatcher(settings.WRITE_BATCH_MAX_SIZE, settings.WRITE_BATCH_WINDOW_MS / 1000)
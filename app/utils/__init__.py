@@ -1,3 +1,3 @@
-from app.utils.errors import AppException, NotFoundException, UnauthorizedException, ForbiddenException
+from app.utils.errors import AppException, NotFoundException, UnauthorizedException, ForbiddenException, BadRequestException, PreconditionFailedException
 
-__all__ = ["AppException", "NotFoundException", "UnauthorizedException", "ForbiddenException"]
+__all__ = ["AppException", "NotFoundException", "UnauthorizedException", "ForbiddenException", "BadRequestException", "PreconditionFailedException"]
@@ -0,0 +1,131 @@
+import asyncio
+import heapq
+from collections import OrderedDict
+from itertools import count
+from time import monotonic
+from typing import List, Optional, Tuple
+
+# Priority classes, most important first; CRITICAL requests are never queued or shed
+PRIORITY_CRITICAL = 0
+PRIORITY_READ = 1
+PRIORITY_WRITE = 2
+PRIORITY_NAMES = {PRIORITY_CRITICAL: "critical", PRIORITY_READ: "read", PRIORITY_WRITE: "write"}
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is not admitted: "queue_full", "queue_timeout" or
+    "evicted" (pushed out of a full queue by a more important request)
+    """
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(reason)
+
+
+class PriorityLimiter:
+    """
+    Concurrency limit with a bounded wait queue served in priority order.
+
+    Up to max_concurrency holders run at once; the others wait, at most
+    max_queue of them and for at most timeout seconds. A freed slot is handed
+    to the most important waiter (FIFO within a priority). When the queue is
+    full, a newcomer pushes out the least important waiter if it outranks it.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = count()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _remove(self, entry: Tuple[int, int, asyncio.Future]) -> None:
+        self._waiters.remove(entry)
+        heapq.heapify(self._waiters)
+
+    async def acquire(self, priority: int) -> None:
+        """
+        Wait for a slot; raises AdmissionRejected when the request is shed
+        """
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            worst = max(self._waiters, default=None)
+            if worst is None or worst[0] <= priority:
+                raise AdmissionRejected("queue_full")
+            self._remove(worst)
+            worst[2].set_exception(AdmissionRejected("evicted"))
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait((future,), timeout=self.timeout)
+        except asyncio.CancelledError:
+            # The client went away while queued: give back a slot handed over meanwhile
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()
+            elif not future.done():
+                self._remove(entry)
+                future.cancel()
+            raise
+        if not future.done():
+            self._remove(entry)
+            future.cancel()
+            raise AdmissionRejected("queue_timeout")
+        # Raises AdmissionRejected when evicted; otherwise release() handed this waiter its slot
+        future.result()
+
+    def release(self) -> None:
+        """
+        Free a slot, handing it straight to the most important waiter
+        """
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets: `rate` requests per second with bursts of up to
+    `burst`. Only the max_keys most recently seen keys are tracked.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000):
+        # A bucket that never refills would ask clients to retry after an infinite wait
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid rate limit {rate}/s with bursts of {burst}, both must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> [tokens, last refill time]
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def acquire(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Take a token for key: 0 when allowed, else the seconds until one is available
+        """
+        now = monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
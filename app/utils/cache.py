@@ -0,0 +1,122 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its expiry time and optional validator"""
+    value: Any
+    expires_at: float
+    etag: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class LRUCache:
+    """
+    Bounded in-process LRU cache with a TTL per entry.
+
+    Expired entries are kept until evicted so callers can revalidate them
+    (e.g. with If-None-Match) instead of refetching from scratch.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Return the entry for key, fresh or expired, marking it recently used
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, value: Any, ttl: float, etag: Optional[str] = None) -> None:
+        """
+        Store value for ttl seconds, evicting the least recently used entries when full
+        """
+        self._entries[key] = CacheEntry(value, time.monotonic() + ttl, etag)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CacheBackend(ABC):
+    """
+    Async key/value store used by application caches.
+
+    The in-process implementation below is the default; a shared cache
+    (or a local stand-in for one) only needs to implement these methods.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the live value for key, or None"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store value for ttl seconds"""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove keys if present"""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically increment a counter (starting at 0) and return its new value"""
+
+    @abstractmethod
+    async def counter(self, key: str) -> int:
+        """Return the current value of a counter"""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Process-local cache backend on top of LRUCache
+    """
+
+    def __init__(self, max_entries: int):
+        self._store = LRUCache(max_entries)
+        # Counters are kept apart from the LRU so they are never evicted
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        if not entry.fresh:
+            self._store.delete(key)
+            return None
+        return entry.value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._store.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._store.delete(key)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
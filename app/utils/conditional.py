@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import List, Optional
+
+from starlette.datastructures import Headers
+
+# Validators only tell caches how to revalidate: never reuse a response without asking
+REVALIDATE = "no-cache"
+
+
+def parse_etags(header: Optional[str]) -> List[str]:
+    """
+    Entity tags listed in an If-Match / If-None-Match header ("*" kept as is)
+    """
+    if not header:
+        return []
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    """
+    Whether an ETag satisfies a list of entity tags; weak comparison (for
+    If-None-Match) ignores the W/ prefix, strong comparison (for If-Match) rejects it
+    """
+    for tag in parse_etags(header):
+        if tag == "*":
+            return True
+        if weak and _opaque(tag) == _opaque(etag):
+            return True
+        if not weak and tag == etag and not tag.startswith("W/"):
+            return True
+    return False
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a timestamp (naive values are UTC) as an HTTP date
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an HTTP date into an aware datetime, None when missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def is_not_modified(headers: Headers, etag: Optional[str], last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match (or, without it, If-Modified-Since) against the current validators
+    """
+    if "if-none-match" in headers:
+        return etag is not None and etag_matches(headers["if-none-match"], etag, weak=True)
+    since = parse_http_date(headers.get("if-modified-since"))
+    if since is None or last_modified is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
@@ -8,12 +8,15 @@ from app.config.logger import logger
 
 def add_exception_handlers(app: FastAPI) -> None:
     """
-    Add exception handlers to the FastAPI application
+    Add exception handlers to the FastAPI application.
+
+    Client errors are logged with their error code as category, so bursts of
+    the same error are rate limited; server errors are always logged.
     """
     
     @app.exception_handler(AppException)
     async def app_exception_handler(request: Request, exc: AppException):
-        logger.error(f"Application error: {exc.detail}")
+        logger.error("Application error: %s", exc.detail, extra={"category": exc.code, "status": exc.status_code})
         return JSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail, "code": exc.code}
@@ -21,7 +24,7 @@ def add_exception_handlers(app: FastAPI) -> None:
     
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
-        logger.error(f"Validation error: {exc.errors()}")
+        logger.error("Validation error: %s", exc.errors(), extra={"category": "VALIDATION_ERROR", "status": 422})
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={"detail": exc.errors(), "code": "VALIDATION_ERROR"}
@@ -29,7 +32,7 @@ def add_exception_handlers(app: FastAPI) -> None:
     
     @app.exception_handler(SQLAlchemyError)
     async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-        logger.error(f"Database error: {str(exc)}")
+        logger.error("Database error: %s", exc)
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": "Database error", "code": "DATABASE_ERROR"}
@@ -37,7 +40,7 @@ def add_exception_handlers(app: FastAPI) -> None:
     
     @app.exception_handler(Exception)
     async def generic_exception_handler(request: Request, exc: Exception):
-        logger.error(f"Internal server error: {str(exc)}")
+        logger.error("Internal server error: %s", exc)
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": "Internal server error", "code": "INTERNAL_SERVER_ERROR"}
@@ -35,3 +35,17 @@ class ForbiddenException(AppException):
     """
     def __init__(self, detail: str = "Forbidden", code: str = "FORBIDDEN"):
         super().__init__(detail=detail, code=code, status_code=status.HTTP_403_FORBIDDEN)
+
+class BadRequestException(AppException):
+    """
+    Exception raised when a request is malformed
+    """
+    def __init__(self, detail: str = "Bad request", code: str = "BAD_REQUEST"):
+        super().__init__(detail=detail, code=code, status_code=status.HTTP_400_BAD_REQUEST)
+
+class PreconditionFailedException(AppException):
+    """
+    Exception raised when a conditional request's precondition (e.g. If-Match) does not hold
+    """
+    def __init__(self, detail: str = "Precondition failed", code: str = "PRECONDITION_FAILED"):
+        super().__init__(detail=detail, code=code, status_code=status.HTTP_412_PRECONDITION_FAILED)
@@ -0,0 +1,206 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+# Sent instead of a replay when the events after a client's Last-Event-ID are
+# gone (or the ID is unknown): the client must reload its state
+RESET_EVENT = "reset"
+
+
+@dataclass(frozen=True)
+class Event:
+    """A published event; IDs increase with every event of a broker"""
+    id: int
+    type: str
+    data: Dict[str, Any]
+
+
+def format_sse(event: Event) -> bytes:
+    """
+    Render an event as a Server-Sent Events message
+    """
+    return f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data)}\n\n".encode()
+
+
+class SubscriptionClosed(Exception):
+    """
+    Raised to a subscriber once its subscription is closed: "slow_consumer"
+    when it fell a whole buffer behind, "shutdown" when the broker stopped,
+    or the reason its owner closed it with
+    """
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(reason)
+
+
+class Subscription:
+    """
+    One subscriber's bounded buffer of events.
+
+    A subscriber that lets the buffer fill up is disconnected rather than
+    slowing down the publisher or the other subscribers; it can resume from
+    the last event it received.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.last_id = 0
+        self.closed_reason: Optional[str] = None
+        self._queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue(buffer_size)
+        # Live events received while the subscription replays history
+        self._pending: Optional[List[Event]] = None
+
+    def deliver(self, event: Event) -> bool:
+        """
+        Buffer an event; False when the subscription is (or just got) closed
+        """
+        if self.closed_reason is not None:
+            return False
+        if self._pending is not None:
+            self._pending.append(event)
+            return True
+        if event.id <= self.last_id and event.type != RESET_EVENT:
+            return True
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close("slow_consumer")
+            return False
+        self.last_id = event.id
+        return True
+
+    def hold(self) -> None:
+        """
+        Keep live events aside until replay() has delivered the history
+        """
+        self._pending = []
+
+    def replay(self, last_event_id: int, history: Optional[List[Event]], position: int) -> None:
+        """
+        Deliver the events after last_event_id, or a reset event at position
+        when history is None, then the live events held meanwhile
+        """
+        pending, self._pending = self._pending or [], None
+        if history is None:
+            self.deliver(Event(position, RESET_EVENT, {}))
+        else:
+            self.last_id = last_event_id
+            for event in history:
+                self.deliver(event)
+        for event in pending:
+            self.deliver(event)
+
+    def close(self, reason: str) -> None:
+        if self.closed_reason is not None:
+            return
+        self.closed_reason = reason
+        # Drop what is buffered so the subscriber sees the close right away
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Event:
+        """
+        Wait for the next event; raises SubscriptionClosed once closed
+        """
+        event = await self._queue.get()
+        if event is None:
+            raise SubscriptionClosed(self.closed_reason)
+        return event
+
+
+class EventBroker(ABC):
+    """
+    Publish/subscribe hub for one event feed.
+
+    The in-process broker below is the default; a broker shared by several
+    processes (or a local stand-in for one) publishes events to its store
+    and hands them to _fan_out as they come back.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self.last_id = 0
+        self.dropped = 0
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self) -> None:
+        """Start any background work (called from the application lifespan)"""
+
+    async def stop(self) -> None:
+        """Close every subscription"""
+        for subscription in list(self._subscribers):
+            subscription.close("shutdown")
+
+    @abstractmethod
+    async def publish(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Publish (type, data) events, in order"""
+
+    @abstractmethod
+    async def events_after(self, last_id: int) -> Optional[List[Event]]:
+        """The retained events after last_id, or None when some of them are no longer available"""
+
+    def _fan_out(self, events: Sequence[Event]) -> None:
+        for event in events:
+            self.last_id = max(self.last_id, event.id)
+            for subscription in list(self._subscribers):
+                if not subscription.deliver(event):
+                    self._subscribers.discard(subscription)
+                    if subscription.closed_reason == "slow_consumer":
+                        self.dropped += 1
+
+    @asynccontextmanager
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[Subscription]:
+        """
+        Subscribe for the duration of the block, first replaying the events after
+        last_event_id (or a reset event when they cannot all be replayed)
+        """
+        subscription = Subscription(self.buffer_size)
+        self._subscribers.add(subscription)
+        try:
+            if last_event_id is not None:
+                subscription.hold()
+                history = await self.events_after(last_event_id)
+                if history is not None and len(history) > self.buffer_size:
+                    history = None
+                subscription.replay(last_event_id, history, self.last_id)
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+
+class InMemoryEventBroker(EventBroker):
+    """
+    Broker for a single process, keeping the last history_size events for resumption
+    """
+
+    def __init__(self, buffer_size: int, history_size: int):
+        super().__init__(buffer_size)
+        self._history: Deque[Event] = deque(maxlen=history_size)
+
+    async def publish(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        published = []
+        for event_type, data in events:
+            event = Event(self.last_id + 1, event_type, data)
+            self._history.append(event)
+            published.append(event)
+            self.last_id = event.id
+        self._fan_out(published)
+
+    async def events_after(self, last_id: int) -> Optional[List[Event]]:
+        # IDs restart with the process: a position ahead of ours comes from an earlier run
+        if last_id > self.last_id:
+            return None
+        if last_id == self.last_id:
+            return []
+        if not self._history or last_id < self._history[0].id - 1:
+            return None
+        return [event for event in self._history if event.id > last_id]
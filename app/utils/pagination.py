@@ -0,0 +1,30 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+from app.utils.errors import BadRequestException
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor
+    """
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor, an empty cursor starts from the beginning
+    """
+    if not cursor:
+        return {}
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise BadRequestException("Invalid pagination cursor", code="INVALID_CURSOR")
+    if not isinstance(position, dict):
+        raise BadRequestException("Invalid pagination cursor", code="INVALID_CURSOR")
+    return position
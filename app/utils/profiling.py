@@ -0,0 +1,48 @@
+import cProfile
+import io
+import pstats
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class ProfileRecord:
+    """A call-stack profile captured for one request"""
+    id: str
+    method: str
+    path: str
+    created_at: datetime
+    duration_ms: float
+    report: str
+
+
+def render_profile(profiler: cProfile.Profile, limit: int) -> str:
+    """
+    Render the hottest functions of a profile, sorted by cumulative time
+    """
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+class ProfileStore:
+    """
+    Keeps the most recent request profiles for retrieval
+    """
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, ProfileRecord]" = OrderedDict()
+
+    def add(self, record: ProfileRecord) -> None:
+        self._profiles[record.id] = record
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[ProfileRecord]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[ProfileRecord]:
+        return list(reversed(self._profiles.values()))
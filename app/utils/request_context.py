@@ -0,0 +1,31 @@
+import re
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Optional
+
+# Incoming request IDs are echoed back and logged: accept only short, printable tokens
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:\-]{1,128}$")
+
+
+@dataclass
+class RequestContext:
+    """Identity and start time of the request being handled, attached to its log records"""
+    request_id: str
+    started: float
+
+    def elapsed_ms(self) -> float:
+        return (perf_counter() - self.started) * 1000
+
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+
+def request_id_from(header: Optional[str]) -> str:
+    """
+    The client's request ID when it is well formed, else a new random one
+    """
+    if header and REQUEST_ID_PATTERN.match(header):
+        return header
+    return uuid.uuid4().hex
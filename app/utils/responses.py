@@ -0,0 +1,57 @@
+import json
+from datetime import datetime
+from typing import Any, Type
+
+from fastapi.responses import JSONResponse
+
+from app.config.logger import logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def json_default(value: Any) -> str:
+    """
+    Encode the values the stdlib JSON encoder does not handle natively
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    """
+    Serialize plain Python data (dicts, lists, scalars and datetimes) to JSON bytes,
+    with orjson when it is installed and the stdlib encoder otherwise
+    """
+    if orjson is not None:
+        # Z suffix for UTC, as Pydantic renders it
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with json_dumps.
+
+    The content must already be plain data: unlike the default response path it is
+    not run through jsonable_encoder or a response model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def default_response_class(name: str) -> Type[JSONResponse]:
+    """
+    Resolve the DEFAULT_RESPONSE_CLASS setting to a response class
+    """
+    if name == "fast":
+        if orjson is None:
+            logger.warning("DEFAULT_RESPONSE_CLASS=fast without orjson installed; using the stdlib JSON encoder")
+        return FastJSONResponse
+    if name != "json":
+        raise ValueError(f"Invalid DEFAULT_RESPONSE_CLASS {name!r}, expected 'json' or 'fast'")
+    return JSONResponse
@@ -0,0 +1,123 @@
+import codecs
+import csv
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Deque, Iterator, List, Optional, Tuple, Union
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], encoding: str = "utf-8", keepends: bool = False
+) -> AsyncIterator[str]:
+    """
+    Split a byte stream into decoded lines without buffering more than one partial line
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n" if keepends else line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending if keepends else pending.rstrip("\r")
+
+
+class _Incomplete(Exception):
+    """The buffered lines end inside a record"""
+
+
+class _LineFeed:
+    """
+    Line source for csv.reader that stops with _Incomplete instead of ending
+    the stream when it runs dry before close(), keeping the lines of the
+    unfinished record so they can be replayed.
+    """
+
+    def __init__(self) -> None:
+        self.lines: Deque[str] = deque()
+        self.record: List[str] = []
+        self.replayed = 0
+        self.size = 0
+        self.closed = False
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            if self.closed:
+                raise StopIteration
+            raise _Incomplete
+        line = self.lines.popleft()
+        self.size -= len(line)
+        self.record.append(line)
+        return line
+
+    def push(self, line: str) -> None:
+        self.lines.append(line)
+        self.size += len(line)
+
+    def rewind(self) -> None:
+        self.lines.extendleft(reversed(self.record))
+        self.size += sum(map(len, self.record))
+        self.replayed += len(self.record)
+        self.record.clear()
+
+    def skip(self) -> None:
+        """Drop the buffered lines, counting them as read"""
+        self.replayed -= len(self.lines)
+        self.lines.clear()
+        self.size = 0
+
+
+async def iter_csv_rows(
+    lines: AsyncIterable[str], max_row_size: Optional[int] = None
+) -> AsyncIterator[Tuple[int, Union[List[str], csv.Error]]]:
+    """
+    Parse lines (with their line endings) as one CSV document, yielding each
+    row, or the csv.Error it raised, with the number of its last line.
+
+    Quoted fields may span lines: a row is parsed once the line closing its
+    quotes has arrived, so only the lines of the current row are buffered.
+    A row still open after max_row_size characters (csv.field_size_limit()
+    by default), e.g. behind an unterminated quote, is reported as an error
+    and parsing starts again with the next line.
+    """
+    if max_row_size is None:
+        max_row_size = csv.field_size_limit()
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    waiting = False
+
+    def parse() -> Iterator[Tuple[int, Union[List[str], csv.Error]]]:
+        nonlocal waiting
+        while True:
+            feed.record.clear()
+            try:
+                row: Union[List[str], csv.Error] = next(reader)
+            except _Incomplete:
+                # Without a closing quote the row cannot end; wait for one
+                waiting = bool(feed.record)
+                feed.rewind()
+                return
+            except StopIteration:
+                return
+            except csv.Error as e:
+                row = e
+            yield reader.line_num - feed.replayed, row
+
+    async for line in lines:
+        feed.push(line)
+        if waiting:
+            if feed.size > max_row_size:
+                feed.skip()
+                waiting = False
+                yield reader.line_num - feed.replayed, csv.Error(f"row larger than {max_row_size} characters")
+                continue
+            if '"' not in line:
+                continue
+        for parsed in parse():
+            yield parsed
+    feed.closed = True
+    for parsed in parse():
+        yield parsed
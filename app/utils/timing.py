@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional
+
+
+class RequestTimings:
+    """
+    Time spent in each phase of a request, reported in the Server-Timing header.
+
+    Time before the first span is attributed to request validation (routing,
+    dependencies and body parsing) and time after the last span to response
+    serialization.
+    """
+
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        self.spans: Dict[str, float] = {}
+        self.first_span_start: Optional[float] = None
+        self.last_span_end: Optional[float] = None
+        self.sql_count = 0
+        self.sql_time = 0.0
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        if self.first_span_start is None:
+            self.first_span_start = started
+        try:
+            yield
+        finally:
+            self.last_span_end = perf_counter()
+            self.spans[name] = self.spans.get(name, 0.0) + self.last_span_end - started
+
+    def add_sql(self, duration: float) -> None:
+        self.sql_count += 1
+        self.sql_time += duration
+
+    def server_timing(self, response_started: float) -> str:
+        """
+        Render the Server-Timing header value, durations in milliseconds
+        """
+        entries: List[str] = []
+        if self.first_span_start is not None and self.last_span_end is not None:
+            entries.append(f"validation;dur={(self.first_span_start - self.started) * 1000:.2f}")
+            entries.extend(f"{name};dur={duration * 1000:.2f}" for name, duration in self.spans.items())
+        entries.append(f'db;dur={self.sql_time * 1000:.2f};desc="{self.sql_count} queries"')
+        if self.last_span_end is not None:
+            entries.append(f"serialization;dur={(response_started - self.last_span_end) * 1000:.2f}")
+        entries.append(f"total;dur={(response_started - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+# Timings of the request being handled, when Server-Timing is enabled
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """
+    Attribute the enclosed block to a named phase of the current request, if timed
+    """
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    with timings.span(name):
+        yield
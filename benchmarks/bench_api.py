@@ -0,0 +1,185 @@
+"""
+Task API benchmarks, driving the app in-process through httpx's ASGI transport.
+
+Import this module only after DATABASE_URL points at a scratch database
+(benchmarks.run takes care of it): the app reads its settings on import.
+"""
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.common import BenchResult, run_load
+
+# Seeding batch size for the dataset
+SEED_BATCH = 10_000
+# Items per bulk request and lines per import request
+BATCH_ITEMS = 100
+
+
+def seed_tasks(count: int) -> None:
+    """
+    Insert `count` tasks straight through the sync engine
+    """
+    from sqlalchemy import insert
+
+    from app.config.database import engine
+    from app.models.task import Task
+
+    with engine.begin() as conn:
+        for start in range(0, count, SEED_BATCH):
+            conn.execute(
+                insert(Task.__table__),
+                [
+                    {"title": f"Task {i}", "description": f"Seeded task number {i}", "completed": i % 3 == 0}
+                    for i in range(start, min(start + SEED_BATCH, count))
+                ],
+            )
+
+
+def _scenarios(client: httpx.AsyncClient, dataset: int, requests: int) -> List[Tuple[str, int, Callable[[int], Awaitable[bool]]]]:
+    """
+    (name, request count, call) for every route in app/routes/task_routes.py
+    """
+    from app.utils.pagination import encode_cursor
+
+    rng = random.Random(42)
+    # IDs above the seeded range are created by the write scenarios, then deleted
+    created: List[int] = []
+    bulk_created: List[List[int]] = []
+    etags: Dict[str, str] = {}
+
+    async def send(method: str, url: str, expected: int, **kwargs: Any) -> httpx.Response:
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response if response.status_code == expected else None
+
+    def call(fn: Callable[[int], Awaitable[Any]]) -> Callable[[int], Awaitable[bool]]:
+        async def wrapped(i: int) -> bool:
+            try:
+                return await fn(i) is not None
+            except httpx.HTTPError:
+                return False
+        return wrapped
+
+    async def list_tasks(i: int) -> Any:
+        return await send("GET", "/api/tasks", 200, params={"skip": rng.randrange(dataset), "limit": 100})
+
+    async def list_tasks_cursor(i: int) -> Any:
+        cursor = encode_cursor({"id": rng.randrange(dataset)})
+        return await send("GET", "/api/tasks", 200, params={"cursor": cursor, "limit": 100})
+
+    async def list_tasks_filtered(i: int) -> Any:
+        params = {"completed": i % 2 == 0, "sort": "-created_at", "cursor": "", "limit": 100}
+        return await send("GET", "/api/tasks", 200, params=params)
+
+    async def get_stats(i: int) -> Any:
+        return await send("GET", "/api/tasks/stats", 200)
+
+    async def get_changes(i: int) -> Any:
+        # Seeded tasks take change versions 1..dataset: the last 100 of them, whatever the table size
+        return await send("GET", "/api/tasks/changes", 200, params={"since": max(0, dataset - 100), "limit": 100})
+
+    async def search_tasks(i: int) -> Any:
+        return await send("GET", "/api/tasks/search", 200, params={"q": f"number {rng.randrange(dataset)}", "limit": 20})
+
+    async def get_task(i: int) -> Any:
+        return await send("GET", f"/api/tasks/{rng.randrange(1, dataset + 1)}", 200)
+
+    async def get_missing_task(i: int) -> Any:
+        # Error path: every request logs a NOT_FOUND error
+        response = await client.get(f"/api/tasks/{dataset + 1_000_000 + i}")
+        return response if response.status_code == 404 else None
+
+    async def revalidate(url: str, etag: str) -> Any:
+        response = await client.get(url, headers={"If-None-Match": etag})
+        return response if response.status_code == 304 else None
+
+    async def get_task_not_modified(i: int) -> Any:
+        # Seeded tasks are all at their first revision
+        task_id = rng.randrange(1, dataset + 1)
+        return await revalidate(f"/api/tasks/{task_id}", f'"{task_id}-1"')
+
+    async def list_tasks_not_modified(i: int) -> Any:
+        if "list" not in etags:
+            etags["list"] = (await send("GET", "/api/tasks", 200)).headers["ETag"]
+        return await revalidate("/api/tasks", etags["list"])
+
+    async def create_task(i: int) -> Any:
+        response = await send("POST", "/api/tasks", 201, json={"title": f"Bench {i}", "description": "benchmark"})
+        if response is not None:
+            created.append(response.json()["id"])
+        return response
+
+    async def update_task(i: int) -> Any:
+        return await send("PATCH", f"/api/tasks/{rng.randrange(1, dataset + 1)}", 200, json={"completed": i % 2 == 0})
+
+    async def delete_task(i: int) -> Any:
+        return await send("DELETE", f"/api/tasks/{created.pop()}", 204)
+
+    async def bulk_create(i: int) -> Any:
+        items = [{"title": f"Bulk {i}-{j}"} for j in range(BATCH_ITEMS)]
+        response = await send("POST", "/api/tasks/bulk", 201, json={"items": items})
+        if response is not None:
+            bulk_created.append([result["id"] for result in response.json()["results"]])
+        return response
+
+    async def bulk_update(i: int) -> Any:
+        start = rng.randrange(1, max(2, dataset - BATCH_ITEMS))
+        items = [{"id": task_id, "completed": True} for task_id in range(start, start + BATCH_ITEMS)]
+        return await send("PATCH", "/api/tasks/bulk", 200, json={"items": items})
+
+    async def bulk_delete(i: int) -> Any:
+        return await send("DELETE", "/api/tasks/bulk", 200, json={"ids": bulk_created.pop()})
+
+    async def export_tasks(i: int) -> Any:
+        return await send("GET", "/api/tasks/export", 200, params={"format": "ndjson" if i % 2 else "csv"})
+
+    async def import_tasks(i: int) -> Any:
+        body = "".join(f'{{"title": "Imported {i}-{j}"}}\n' for j in range(BATCH_ITEMS))
+        return await send("POST", "/api/tasks/import", 200, content=body.encode())
+
+    # Exports read the whole table, so they run a bounded number of times
+    export_requests = max(1, min(requests, 20_000_000 // max(dataset, 1) // 100))
+    bulk_requests = max(1, requests // 10)
+    return [
+        ("list_skip_limit", requests, call(list_tasks)),
+        ("list_cursor", requests, call(list_tasks_cursor)),
+        ("list_filtered", requests, call(list_tasks_filtered)),
+        ("stats", requests, call(get_stats)),
+        ("changes", requests, call(get_changes)),
+        ("search", requests, call(search_tasks)),
+        ("get", requests, call(get_task)),
+        ("get_missing", requests, call(get_missing_task)),
+        ("get_not_modified", requests, call(get_task_not_modified)),
+        ("list_not_modified", requests, call(list_tasks_not_modified)),
+        ("create", requests, call(create_task)),
+        ("update", requests, call(update_task)),
+        ("delete", requests, call(delete_task)),
+        ("bulk_create", bulk_requests, call(bulk_create)),
+        ("bulk_update", bulk_requests, call(bulk_update)),
+        ("bulk_delete", bulk_requests, call(bulk_delete)),
+        ("import", bulk_requests, call(import_tasks)),
+        ("export", export_requests, call(export_tasks)),
+    ]
+
+
+async def run(dataset_name: str, dataset: int, concurrency: int, requests: int, only: List[str]) -> Dict[str, BenchResult]:
+    """
+    Seed the dataset and run every task API scenario against it
+    """
+    import main
+
+    seed_tasks(dataset)
+    results: Dict[str, BenchResult] = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, count, call in _scenarios(client, dataset, requests):
+                if only and name not in only:
+                    continue
+                key = f"api:{name}:{dataset_name}:c{concurrency}"
+                # Writes that consume IDs must not outrun the scenario that produced them
+                workers = 1 if name in ("delete", "bulk_delete") else concurrency
+                results[key] = await run_load(key, call, count, workers)
+    return results
@@ -0,0 +1,131 @@
+"""
+JSONPlaceholderClient benchmarks against a local stub of the upstream API.
+"""
+import socket
+import threading
+import time
+from typing import Dict, List
+
+import uvicorn
+from fastapi import FastAPI
+
+from benchmarks.common import BenchResult, run_load
+
+USER = {
+    "id": 1,
+    "name": "Leanne Graham",
+    "username": "Bret",
+    "email": "Sincere@april.biz",
+    "address": {
+        "street": "Kulas Light",
+        "suite": "Apt. 556",
+        "city": "Gwenborough",
+        "zipcode": "92998-3874",
+        "geo": {"lat": "-37.3159", "lng": "81.1496"},
+    },
+    "phone": "1-770-736-8031 x56442",
+    "website": "hildegard.org",
+    "company": {"name": "Romaguera-Crona", "catchPhrase": "Multi-layered client-server neural-net", "bs": "harness"},
+}
+POSTS = [{"id": i, "userId": i % 10 + 1, "title": f"Post {i}", "body": "lorem ipsum " * 20} for i in range(1, 101)]
+
+
+def create_stub_app() -> FastAPI:
+    """
+    Minimal stand-in for the JSONPlaceholder endpoints used by the client
+    """
+    stub = FastAPI()
+
+    @stub.get("/posts")
+    async def get_posts():
+        return POSTS
+
+    @stub.get("/posts/{post_id}")
+    async def get_post(post_id: int):
+        return POSTS[(post_id - 1) % len(POSTS)]
+
+    @stub.post("/posts", status_code=201)
+    async def create_post(post: dict):
+        return {**post, "id": len(POSTS) + 1}
+
+    @stub.get("/users/{user_id}")
+    async def get_user(user_id: int):
+        return {**USER, "id": user_id}
+
+    return stub
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """
+    Serve the stub upstream from a background thread for the duration of a with-block
+    """
+
+    def __init__(self) -> None:
+        self.port = _free_port()
+        config = uvicorn.Config(create_stub_app(), host="127.0.0.1", port=self.port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+async def run(concurrency: int, requests: int, only: List[str]) -> Dict[str, BenchResult]:
+    """
+    Run every JSONPlaceholderClient call against the stub upstream
+    """
+    import httpx
+
+    from app.client.http import create_http_client
+    from app.client.jsonplaceholder_client import JSONPlaceholderClient
+    from app.schemas.jsonplaceholder import PostRequest
+
+    def call(fn):
+        async def wrapped(i: int) -> bool:
+            try:
+                await fn(i)
+                return True
+            except httpx.HTTPError:
+                return False
+        return wrapped
+
+    scenarios = [
+        ("get_posts", lambda i: JSONPlaceholderClient.get_posts()),
+        ("get_post", lambda i: JSONPlaceholderClient.get_post(i % len(POSTS) + 1)),
+        ("get_user", lambda i: JSONPlaceholderClient.get_user(i % 10 + 1)),
+        ("create_post", lambda i: JSONPlaceholderClient.create_post(PostRequest(title="t", body="b", userId=1))),
+    ]
+    results: Dict[str, BenchResult] = {}
+    base_url = JSONPlaceholderClient.BASE_URL
+    with StubServer() as stub:
+        http_client = create_http_client()
+        JSONPlaceholderClient.BASE_URL = stub.url
+        JSONPlaceholderClient.configure(http_client)
+        try:
+            for name, fn in scenarios:
+                if only and name not in only:
+                    continue
+                key = f"client:{name}:c{concurrency}"
+                results[key] = await run_load(key, call(fn), requests, concurrency)
+        finally:
+            JSONPlaceholderClient.BASE_URL = base_url
+            JSONPlaceholderClient.configure(None)
+            await http_client.aclose()
+    return results
@@ -0,0 +1,95 @@
+"""
+Cold start: module import time and time-to-first-response of a fresh server process.
+
+Every start is a new interpreter serving the scratch database that DATABASE_URL
+points at, once per DB_SCHEMA_INIT mode; the first start of each mode is a
+warm-up (it creates the tables and records the schema fingerprint) and is not counted.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import BenchResult
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_INIT_MODES = ("create", "check", "skip")
+POLL_INTERVAL = 0.005
+START_TIMEOUT = 30.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _env(schema_init: str) -> Dict[str, str]:
+    return {**os.environ, "DB_SCHEMA_INIT": schema_init, "DEBUG": "False"}
+
+
+def time_import() -> Optional[float]:
+    """
+    Seconds for a new interpreter to import the application module, or None if it failed
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", "import main"], cwd=PROJECT_ROOT, env=_env("skip"), capture_output=True
+    )
+    elapsed = time.perf_counter() - started
+    return elapsed if completed.returncode == 0 else None
+
+
+def time_first_response(schema_init: str) -> Optional[float]:
+    """
+    Seconds from spawning a server process to its first successful API response, or None on timeout
+    """
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/api/tasks?limit=1"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        env=_env(schema_init),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < START_TIMEOUT and process.poll() is None:
+                try:
+                    if client.get(url).status_code == 200:
+                        return time.perf_counter() - started
+                except (httpx.TransportError, socket.error):
+                    pass
+                time.sleep(POLL_INTERVAL)
+        return None
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _result(key: str, samples: List[Optional[float]]) -> BenchResult:
+    timings = [sample for sample in samples if sample is not None]
+    return BenchResult(
+        name=key, requests=len(samples), errors=len(samples) - len(timings), elapsed=sum(timings), latencies=timings
+    )
+
+
+def run(starts: int, only: List[str]) -> Dict[str, BenchResult]:
+    """
+    Time `starts` imports and server starts per DB_SCHEMA_INIT mode
+    """
+    results: Dict[str, BenchResult] = {}
+    if not only or "import" in only:
+        results["startup:import"] = _result("startup:import", [time_import() for _ in range(starts)])
+    if not only or "first_response" in only:
+        for mode in SCHEMA_INIT_MODES:
+            time_first_response(mode)
+            key = f"startup:first_response:{mode}"
+            results[key] = _result(key, [time_first_response(mode) for _ in range(starts)])
+    return results
@@ -0,0 +1,60 @@
+"""
+Single-task write throughput at several concurrency levels, with and without group commit.
+
+Like bench_api, import this module only after DATABASE_URL points at a scratch database.
+"""
+import random
+from typing import Any, Dict, List, Sequence
+
+import httpx
+
+from benchmarks.bench_api import seed_tasks
+from benchmarks.common import BenchResult, run_load
+
+
+async def run(
+    dataset_name: str, dataset: int, levels: Sequence[int], requests: int, only: List[str]
+) -> Dict[str, BenchResult]:
+    """
+    Create and update tasks at each concurrency level, committing each write
+    on its own ("direct") and through the write batcher ("batched")
+    """
+    import main
+    from app.services.write_batcher import write_batcher
+
+    seed_tasks(dataset)
+    rng = random.Random(42)
+
+    async def create(client: httpx.AsyncClient, i: int) -> bool:
+        response = await client.post("/api/tasks", json={"title": f"Bench {i}", "description": "benchmark"})
+        return response.status_code == 201
+
+    async def update(client: httpx.AsyncClient, i: int) -> bool:
+        response = await client.patch(f"/api/tasks/{rng.randrange(1, dataset + 1)}", json={"completed": i % 2 == 0})
+        return response.status_code == 200
+
+    scenarios = [("create", create), ("update", update)]
+    results: Dict[str, BenchResult] = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for mode in ("direct", "batched"):
+                if mode == "batched":
+                    write_batcher.start()
+                try:
+                    for name, fn in scenarios:
+                        if only and name not in only:
+                            continue
+                        for level in levels:
+                            key = f"writes:{mode}:{name}:{dataset_name}:c{level}"
+
+                            async def call(i: int, fn: Any = fn) -> bool:
+                                try:
+                                    return await fn(client, i)
+                                except httpx.HTTPError:
+                                    return False
+
+                            results[key] = await run_load(key, call, requests, level)
+                finally:
+                    await write_batcher.stop()
+    return results
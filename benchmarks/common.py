@@ -0,0 +1,111 @@
+import asyncio
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List
+
+# Dataset sizes selectable with --dataset
+DATASETS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+
+@dataclass
+class BenchResult:
+    """Latency and throughput of one benchmark scenario"""
+    name: str
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    def percentile(self, q: float) -> float:
+        """Latency percentile in milliseconds (nearest-rank)"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+        return ordered[index] * 1000
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "rps": round(self.rps, 1),
+            "errors": self.errors,
+        }
+
+
+async def run_load(
+    name: str, call: Callable[[int], Awaitable[bool]], requests: int, concurrency: int
+) -> BenchResult:
+    """
+    Issue `requests` calls from `concurrency` workers; call(i) returns False on a failed request
+    """
+    result = BenchResult(name=name, requests=requests, errors=0, elapsed=0.0)
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            started = perf_counter()
+            ok = await call(i)
+            result.latencies.append(perf_counter() - started)
+            if not ok:
+                result.errors += 1
+
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = perf_counter() - started
+    return result
+
+
+def print_results(results: Dict[str, BenchResult]) -> None:
+    print(f"{'scenario':<52} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>10} {'errors':>7}")
+    for key, result in results.items():
+        summary = result.summary()
+        print(
+            f"{key:<52} {summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f} "
+            f"{summary['rps']:>10.1f} {summary['errors']:>7}"
+        )
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, BenchResult]) -> None:
+    baseline = load_baseline(path)
+    baseline.update({key: result.summary() for key, result in results.items()})
+    with open(path, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+
+def compare(
+    results: Dict[str, BenchResult], baseline: Dict[str, Dict[str, float]], tolerance: float
+) -> List[str]:
+    """
+    Describe every scenario whose p95 latency or throughput regressed beyond tolerance
+    """
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        summary = result.summary()
+        if summary["errors"] > expected.get("errors", 0):
+            regressions.append(f"{key}: {summary['errors']} errors (baseline {expected.get('errors', 0)})")
+        if summary["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {summary['p95_ms']:.2f} ms > baseline {expected['p95_ms']:.2f} ms")
+        if summary["rps"] < expected["rps"] * (1 - tolerance):
+            regressions.append(f"{key}: {summary['rps']:.1f} req/s < baseline {expected['rps']:.1f} req/s")
+    return regressions
+
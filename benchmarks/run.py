@@ -0,0 +1,83 @@
+"""
+Benchmark runner: python -m benchmarks.run [--suite api|client|writes|startup|all] [--dataset 1k|100k|1m] ...
+
+Results are compared against the baseline file and the run exits with status 1
+when any scenario regressed beyond --tolerance.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Dict
+
+from benchmarks.common import DATASETS, BenchResult, compare, load_baseline, print_results, save_baseline
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the task API, the upstream client and cold starts")
+    parser.add_argument("--suite", choices=["api", "client", "writes", "startup", "all"], default="all")
+    parser.add_argument("--dataset", choices=sorted(DATASETS), default="1k", help="Tasks seeded before the API suite")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight requests")
+    parser.add_argument(
+        "--write-concurrency", default="1,10,50,100", help="Comma-separated concurrency levels of the writes suite"
+    )
+    parser.add_argument("--starts", type=int, default=5, help="Server starts per mode of the startup suite")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--only", nargs="*", default=[], help="Run only these scenarios (e.g. get list_cursor)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> Dict[str, BenchResult]:
+    results: Dict[str, BenchResult] = {}
+    if args.suite in ("api", "all"):
+        from benchmarks import bench_api
+
+        results.update(
+            await bench_api.run(args.dataset, DATASETS[args.dataset], args.concurrency, args.requests, args.only)
+        )
+    if args.suite in ("client", "all"):
+        from benchmarks import bench_client
+
+        results.update(await bench_client.run(args.concurrency, args.requests, args.only))
+    if args.suite in ("writes", "all"):
+        from benchmarks import bench_writes
+
+        levels = [int(level) for level in args.write_concurrency.split(",")]
+        results.update(
+            await bench_writes.run(args.dataset, DATASETS[args.dataset], levels, args.requests, args.only)
+        )
+    if args.suite in ("startup", "all"):
+        from benchmarks import bench_startup
+
+        results.update(await asyncio.to_thread(bench_startup.run, args.starts, args.only))
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app reads its settings on import: point it at a scratch database first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        # Lock waits under concurrent writes would otherwise flood the output with slow-query warnings
+        os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "0")
+        results = asyncio.run(main(args))
+
+    print_results(results)
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline updated: {args.baseline}")
+        sys.exit(0)
+
+    regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline")
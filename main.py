@@ -1,24 +1,70 @@
-import uvicorn
+from contextlib import asynccontextmanager
+import sys
+from typing import AsyncIterator, Callable, Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_healthz import (
-    HealthCheckRegistry,
-    HealthCheckDatabase,
-    health_check_route
-)
+from fastapi.responses import JSONResponse
 
 from app.config.settings import settings
-from app.config.database import engine, Base
-from app.routes import task_router
+from app.config.database import async_engine, init_schema
+from app.services.task_events import task_events
+from app.services.write_batcher import write_batcher
+from app.routes import task_router, metrics_router, profiling_router
+from app.middleware import (
+    AdmissionControlMiddleware, CompressionMiddleware, MetricsMiddleware, ProfilingMiddleware, RequestContextMiddleware
+)
+from app.utils.admission import PriorityLimiter, TokenBucketLimiter
 from app.utils.error_handler import add_exception_handlers
+from app.utils.responses import default_response_class
 from app.config.logger import logger
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Manage resources shared across requests for the application lifetime
+    """
+    if settings.WRITE_BATCH_ENABLED:
+        write_batcher.start()
+    await task_events.broker.start()
+    try:
+        yield
+    finally:
+        # Ends the open change feed streams
+        await task_events.broker.stop()
+        await write_batcher.stop()
+        # The upstream client (and its pooled HTTP client) is only loaded once something uses it
+        upstream = sys.modules.get("app.client.jsonplaceholder_client")
+        if upstream is not None:
+            await upstream.JSONPlaceholderClient.close()
+        if async_engine is not None:
+            await async_engine.dispose()
+
+def health_check() -> Callable[[], JSONResponse]:
+    """
+    /healthz endpoint; the health check library is imported on the first check, not at startup
+    """
+    endpoint: Optional[Callable[[], JSONResponse]] = None
+
+    def check() -> JSONResponse:
+        nonlocal endpoint
+        if endpoint is None:
+            from fastapi_healthz import HealthCheckDatabase, HealthCheckRegistry, health_check_route
+
+            health_registry = HealthCheckRegistry()
+            # Add SQLite database health check
+            health_registry.add(HealthCheckDatabase(uri=settings.DATABASE_URL))
+            endpoint = health_check_route(registry=health_registry)
+        return endpoint()
+
+    return check
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application
     """
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
+    # Create or check the database tables (the multi-worker launcher does it once, before the workers start)
+    init_schema(settings.DB_SCHEMA_INIT)
     
     app = FastAPI(
         title=settings.PROJECT_NAME,
@@ -26,33 +72,75 @@ def create_app() -> FastAPI:
         version=settings.VERSION,
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=default_response_class(settings.DEFAULT_RESPONSE_CLASS),
+        lifespan=lifespan,
     )
 
-    # Configure CORS
+    # Compress large and streamed responses
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            encodings=[encoding.strip() for encoding in settings.COMPRESSION_ENCODINGS],
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            content_types=[media_type.strip() for media_type in settings.COMPRESSION_CONTENT_TYPES],
+            levels={
+                "gzip": settings.COMPRESSION_GZIP_LEVEL,
+                "br": settings.COMPRESSION_BROTLI_QUALITY,
+                "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+            },
+        )
+
+    # Server-Timing breakdowns and on-demand request profiles
+    if settings.SERVER_TIMING_ENABLED or settings.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+
+    # Shed load beyond the concurrency limit or a client's rate limit, before any work is done
+    if settings.ADMISSION_ENABLED or settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            limiter=PriorityLimiter(
+                settings.ADMISSION_MAX_CONCURRENCY, settings.ADMISSION_MAX_QUEUE, settings.ADMISSION_QUEUE_TIMEOUT
+            ) if settings.ADMISSION_ENABLED else None,
+            rate_limiter=TokenBucketLimiter(
+                settings.RATE_LIMIT_RATE, settings.RATE_LIMIT_BURST, settings.RATE_LIMIT_MAX_KEYS
+            ) if settings.RATE_LIMIT_ENABLED else None,
+            bypass_paths=[path.strip() for path in settings.ADMISSION_BYPASS_PATHS],
+            stream_paths=["/api/tasks/events"],
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+            key_header=settings.RATE_LIMIT_KEY_HEADER,
+        )
+
+    # Configure CORS (added after admission control so its 429/503 rejections carry the CORS headers)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.ALLOWED_ORIGINS,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "X-Request-ID", "Retry-After"],
     )
 
+    # Record request metrics
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    # Request IDs for the logs (added last so it wraps every other middleware)
+    app.add_middleware(RequestContextMiddleware, access_log=settings.ACCESS_LOG_ENABLED)
+
     # Add routers
     app.include_router(task_router, prefix="/api")
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
+    if settings.PROFILING_ENABLED:
+        app.include_router(profiling_router)
 
     # Add exception handlers
     add_exception_handlers(app)
 
-    # Add health check endpoints
-    health_registry = HealthCheckRegistry()
-    
-    # Add SQLite database health check
-    health_registry.add(HealthCheckDatabase(uri=settings.DATABASE_URL))
-    
     # Add health check route
     app.add_api_route(
         "/healthz", 
-        endpoint=health_check_route(registry=health_registry),
+        endpoint=health_check(),
         tags=["Health"],
         summary="Health Check",
         description="Checks the health status of the application and its dependencies"
@@ -64,10 +152,6 @@ def create_app() -> FastAPI:
 app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=settings.DEBUG,
-        log_level="info"
-    )
+    from app.server import main
+
+    main()
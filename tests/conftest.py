@@ -0,0 +1,63 @@
+import os
+import tempfile
+from typing import Any, Callable, Iterator, List
+
+import pytest
+
+# The settings and the database engines are created on import: point them at a
+# scratch database before anything from the app is imported
+_DATA_DIR = tempfile.mkdtemp(prefix="fastapi-template-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DATA_DIR, 'tasks.db')}"
+os.environ.setdefault("LOG_QUEUE_ENABLED", "False")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from main import app, create_app  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    """
+    Client for the application configured from the environment, lifespan included
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[..., TestClient]]:
+    """
+    Build a client for an application created with some settings overridden
+    """
+    clients = []
+
+    def make(**overrides: Any) -> TestClient:
+        for name, value in overrides.items():
+            monkeypatch.setattr(settings, name, value)
+        test_client = TestClient(create_app())
+        clients.append(test_client)
+        return test_client.__enter__()
+
+    yield make
+    for test_client in clients:
+        test_client.__exit__(None, None, None)
+
+
+@pytest.fixture
+def create_tasks(client: TestClient) -> Callable[..., List[int]]:
+    """
+    Create tasks through the bulk API and return their IDs
+    """
+    def create(count: int, prefix: str = "Task") -> List[int]:
+        items = [{"title": f"{prefix} {i}"} for i in range(count)]
+        response = client.post("/api/tasks/bulk", json={"items": items})
+        assert response.status_code == 201
+        return [result["id"] for result in response.json()["results"]]
+
+    return create
@@ -0,0 +1,138 @@
+import asyncio
+from typing import Callable
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.types import Receive, Scope, Send
+
+from app.middleware.admission import AdmissionControlMiddleware
+from app.utils.admission import PRIORITY_READ, PRIORITY_WRITE, AdmissionRejected, PriorityLimiter, TokenBucketLimiter
+
+
+def test_token_bucket_allows_bursts_then_reports_the_wait() -> None:
+    limiter = TokenBucketLimiter(rate=2, burst=3)
+    assert [limiter.acquire("client", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("client", now=0.0) == pytest.approx(0.5)
+    assert limiter.acquire("other", now=0.0) == 0.0
+    # Half a second refills one token
+    assert limiter.acquire("client", now=0.5) == 0.0
+
+
+def test_token_bucket_needs_a_positive_rate_and_burst() -> None:
+    for rate, burst in ((0, 10), (-1, 10), (1, 0)):
+        with pytest.raises(ValueError):
+            TokenBucketLimiter(rate=rate, burst=burst)
+
+
+def test_token_bucket_forgets_the_least_recent_keys() -> None:
+    limiter = TokenBucketLimiter(rate=1, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key, now=0.0)
+    # "a" was evicted, so it starts again with a full bucket
+    assert limiter.acquire("a", now=0.0) == 0.0
+    assert limiter.acquire("c", now=0.0) > 0
+
+
+@pytest.mark.anyio
+async def test_priority_limiter_hands_slots_to_reads_before_writes() -> None:
+    limiter = PriorityLimiter(max_concurrency=1, max_queue=10, timeout=1)
+    await limiter.acquire(PRIORITY_WRITE)
+    order = []
+
+    async def waiter(priority: int, name: str) -> None:
+        await limiter.acquire(priority)
+        order.append(name)
+        limiter.release()
+
+    tasks = [asyncio.create_task(waiter(PRIORITY_WRITE, "write")), asyncio.create_task(waiter(PRIORITY_READ, "read"))]
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.gather(*tasks)
+    assert order == ["read", "write"]
+    assert limiter.active == 0
+
+
+@pytest.mark.anyio
+async def test_priority_limiter_sheds_when_the_queue_is_full_or_the_wait_times_out() -> None:
+    limiter = PriorityLimiter(max_concurrency=1, max_queue=1, timeout=0.05)
+    await limiter.acquire(PRIORITY_READ)
+    queued = asyncio.create_task(limiter.acquire(PRIORITY_WRITE))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as full:
+        await limiter.acquire(PRIORITY_WRITE)
+    assert full.value.reason == "queue_full"
+
+    # A read outranks the queued write and pushes it out
+    evicting = asyncio.create_task(limiter.acquire(PRIORITY_READ))
+    with pytest.raises(AdmissionRejected) as evicted:
+        await queued
+    assert evicted.value.reason == "evicted"
+    with pytest.raises(AdmissionRejected) as timed_out:
+        await evicting
+    assert timed_out.value.reason == "queue_timeout"
+    assert limiter.queued == 0
+
+
+def test_clients_over_their_rate_limit_get_429(make_client: Callable[..., TestClient]) -> None:
+    client = make_client(RATE_LIMIT_ENABLED=True, RATE_LIMIT_RATE=0.001, RATE_LIMIT_BURST=2)
+    assert client.get("/api/tasks/stats").status_code == 200
+    assert client.get("/api/tasks/stats").status_code == 200
+
+    limited = client.get("/api/tasks/stats")
+    assert limited.status_code == 429
+    assert limited.json()["code"] == "RATE_LIMITED"
+    assert int(limited.headers["Retry-After"]) >= 1
+    # Health checks are never limited
+    assert client.get("/healthz").status_code == 200
+
+
+def test_rejections_carry_cors_headers(make_client: Callable[..., TestClient]) -> None:
+    client = make_client(RATE_LIMIT_ENABLED=True, RATE_LIMIT_RATE=0.001, RATE_LIMIT_BURST=1)
+    origin = {"Origin": "http://localhost:3000"}
+    assert client.get("/api/tasks/stats", headers=origin).status_code == 200
+
+    limited = client.get("/api/tasks/stats", headers=origin)
+    assert limited.status_code == 429
+    # A browser can only read the rejection, and when to retry, with these
+    assert limited.headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+    assert "retry-after" in limited.headers["Access-Control-Expose-Headers"].lower()
+
+
+def test_a_zero_rate_limit_is_rejected_at_startup(make_client: Callable[..., TestClient]) -> None:
+    with pytest.raises(ValueError):
+        make_client(RATE_LIMIT_ENABLED=True, RATE_LIMIT_RATE=0)
+
+
+async def _run_concurrently(app: AdmissionControlMiddleware, first_path: str, second_path: str, headers: dict):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.get(first_path))
+        await asyncio.sleep(0.01)
+        second = await client.get(second_path, headers=headers)
+        return await first, second
+
+
+def _slow_app(release: asyncio.Event):
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app
+
+
+@pytest.mark.anyio
+async def test_requests_beyond_the_limit_get_503_whatever_their_accept_header() -> None:
+    release = asyncio.Event()
+    app = AdmissionControlMiddleware(
+        _slow_app(release), limiter=PriorityLimiter(1, 0, 0.05), stream_paths=["/api/tasks/events"]
+    )
+    asyncio.get_running_loop().call_later(0.2, release.set)
+
+    first, second = await _run_concurrently(app, "/api/tasks", "/api/tasks/export", {"Accept": "text/event-stream"})
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert second.json()["code"] == "SERVICE_OVERLOADED"
+    assert "Retry-After" in second.headers
@@ -0,0 +1,45 @@
+from typing import Callable, List
+
+from fastapi.testclient import TestClient
+
+
+def test_bulk_update_and_delete_report_missing_ids(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    first, second = create_tasks(2, "Bulk")
+    missing = 10_000_000
+
+    updated = client.patch(
+        "/api/tasks/bulk",
+        json={"items": [{"id": first, "completed": True}, {"id": missing, "completed": True}]},
+    )
+    assert updated.status_code == 200
+    results = updated.json()["results"]
+    assert [(result["id"], result["status"]) for result in results] == [(first, "updated"), (missing, "not_found")]
+    assert results[0]["task"]["completed"] is True
+
+    deleted = client.request("DELETE", "/api/tasks/bulk", json={"ids": [second, missing]})
+    assert [result["status"] for result in deleted.json()["results"]] == ["deleted", "not_found"]
+    assert client.get(f"/api/tasks/{first}").status_code == 200
+    assert client.get(f"/api/tasks/{second}").status_code == 404
+
+
+def test_bulk_create_with_an_invalid_item_creates_nothing(client: TestClient) -> None:
+    before = client.get("/api/tasks/stats").json()["total"]
+    response = client.post("/api/tasks/bulk", json={"items": [{"title": "Valid"}, {"title": ""}]})
+    assert response.status_code == 422
+    assert client.get("/api/tasks/stats").json()["total"] == before
+
+
+def test_bulk_update_items_without_changes_are_reported_unchanged(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    changed, untouched = create_tasks(2, "Bulk unchanged")
+    version = client.get(f"/api/tasks/{untouched}").json()["version"]
+
+    response = client.patch("/api/tasks/bulk", json={"items": [{"id": changed, "completed": True}, {"id": untouched}]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(result["id"], result["status"]) for result in results] == [(changed, "updated"), (untouched, "unchanged")]
+    assert results[1]["task"]["version"] == version
+    assert client.get(f"/api/tasks/{untouched}").json()["version"] == version
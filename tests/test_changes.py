@@ -0,0 +1,109 @@
+from typing import Callable, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _watermark(client: TestClient) -> int:
+    watermark = 0
+    while True:
+        response = client.get("/api/tasks/changes", params={"since": watermark, "limit": 10000}).json()
+        watermark = response["watermark"]
+        if not response["has_more"]:
+            return watermark
+
+
+def test_changes_since_a_watermark(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    kept, edited, removed = create_tasks(3, "Synced")
+    watermark = _watermark(client)
+
+    client.patch(f"/api/tasks/{edited}", json={"completed": True})
+    added = create_tasks(1, "Synced later")[0]
+    client.delete(f"/api/tasks/{removed}")
+
+    changes = client.get("/api/tasks/changes", params={"since": watermark}).json()
+    assert changes["inserted"] == [added]
+    assert changes["updated"] == [edited]
+    assert changes["deleted"] == [removed]
+    assert changes["watermark"] > watermark and changes["has_more"] is False
+    assert kept not in changes["inserted"] + changes["updated"] + changes["deleted"]
+
+    unchanged = client.get("/api/tasks/changes", params={"since": changes["watermark"]}).json()
+    assert unchanged == {
+        "inserted": [], "updated": [], "deleted": [], "watermark": changes["watermark"], "has_more": False
+    }
+
+
+def test_deleted_tasks_stay_as_tombstones(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    watermark = _watermark(client)
+    task_ids = create_tasks(2, "Tombstoned")
+    client.request("DELETE", "/api/tasks/bulk", json={"ids": task_ids})
+
+    # Deletions are reported even for tasks created after the watermark
+    changes = client.get("/api/tasks/changes", params={"since": watermark}).json()
+    assert sorted(changes["deleted"]) == sorted(task_ids)
+    assert changes["inserted"] == [] and changes["updated"] == []
+    # and still from the beginning of the history
+    assert set(task_ids) <= set(_all_deleted(client))
+
+
+def _all_deleted(client: TestClient) -> List[int]:
+    deleted: List[int] = []
+    watermark = 0
+    while True:
+        response = client.get("/api/tasks/changes", params={"since": watermark, "limit": 10000}).json()
+        deleted.extend(response["deleted"])
+        watermark = response["watermark"]
+        if not response["has_more"]:
+            return deleted
+
+
+def test_rows_written_by_one_statement_get_distinct_versions(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    watermark = _watermark(client)
+    task_ids = create_tasks(5, "Paged")
+    client.patch("/api/tasks/bulk", json={"items": [{"id": task_id, "completed": True} for task_id in task_ids]})
+
+    # Paging two at a time neither repeats nor skips a task
+    seen: List[int] = []
+    pages = 0
+    while True:
+        response = client.get("/api/tasks/changes", params={"since": watermark, "limit": 2}).json()
+        seen.extend(response["inserted"] + response["updated"] + response["deleted"])
+        watermark = response["watermark"]
+        pages += 1
+        if not response["has_more"]:
+            break
+    assert sorted(seen) == sorted(task_ids)
+    assert pages == 3
+
+
+def test_reused_ids_are_reported_as_inserted(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    highest = create_tasks(1, "Reused")[0]
+    watermark = _watermark(client)
+    client.delete(f"/api/tasks/{highest}")
+    # SQLite hands the highest ID out again: the client must replace its copy
+    assert create_tasks(1, "Reused again")[0] == highest
+
+    changes = client.get("/api/tasks/changes", params={"since": watermark}).json()
+    assert changes["inserted"] == [highest] and changes["deleted"] == []
+
+
+def test_negative_watermark_is_rejected(client: TestClient) -> None:
+    assert client.get("/api/tasks/changes", params={"since": -1}).status_code == 422
+
+
+def test_imported_tasks_are_reported_as_inserted(client: TestClient) -> None:
+    watermark = _watermark(client)
+    body = b'{"title": "Imported one"}\n{"title": "Imported two"}\n'
+    assert client.post("/api/tasks/import", params={"format": "ndjson"}, content=body).json()["imported"] == 2
+
+    changes = client.get("/api/tasks/changes", params={"since": watermark}).json()
+    titles = {client.get(f"/api/tasks/{task_id}").json()["title"] for task_id in changes["inserted"]}
+    assert titles == {"Imported one", "Imported two"}
+
+
+@pytest.mark.parametrize("limit", [0, 10001])
+def test_page_size_is_bounded(client: TestClient, limit: int) -> None:
+    assert client.get("/api/tasks/changes", params={"limit": limit}).status_code == 422
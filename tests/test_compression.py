@@ -0,0 +1,94 @@
+import zlib
+from typing import Callable, List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+from starlette.types import Message, Receive, Scope, Send
+
+from app.middleware.compression import CompressionMiddleware
+from app.utils.compression import negotiate_encoding
+
+
+def _streaming_app(chunks: List[bytes], content_type: str = "application/x-ndjson", status: int = 200):
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        headers = [(b"content-type", content_type.encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        for n, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": n < len(chunks) - 1})
+
+    return app
+
+
+async def _call(app: Callable, accept_encoding: Optional[str] = "gzip") -> List[Message]:
+    messages: List[Message] = []
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": headers}
+
+    async def receive() -> Message:
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await CompressionMiddleware(app, encodings=["gzip"], minimum_size=100, content_types=["application/x-ndjson"])(
+        scope, receive, send
+    )
+    return messages
+
+
+def _headers(messages: List[Message]) -> Headers:
+    return Headers(raw=messages[0]["headers"])
+
+
+@pytest.mark.anyio
+async def test_streamed_chunks_are_compressed_and_flushed_one_by_one() -> None:
+    chunks = [b'{"id": %d}\n' % n * 20 for n in range(3)]
+    messages = await _call(_streaming_app(chunks))
+    headers = _headers(messages)
+    assert headers["content-encoding"] == "gzip" and "content-length" not in headers
+    assert "Accept-Encoding" in headers["vary"]
+
+    # Each chunk can be decoded as soon as it arrives, without waiting for the next
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    bodies = [message for message in messages[1:] if message["type"] == "http.response.body"]
+    assert [decoder.decompress(message["body"]) for message in bodies] == chunks
+    assert bodies[-1]["more_body"] is False and decoder.eof
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "chunks, content_type, status, accept_encoding",
+    [
+        ([b"x" * 50], "application/x-ndjson", 200, "gzip"),  # below minimum_size
+        ([b"x" * 500], "image/png", 200, "gzip"),  # media type not listed
+        ([b""], "application/x-ndjson", 304, "gzip"),
+        ([b"x" * 500], "application/x-ndjson", 200, None),
+        ([b"x" * 500], "application/x-ndjson", 200, "gzip;q=0, identity"),
+    ],
+)
+async def test_responses_left_uncompressed(
+    chunks: List[bytes], content_type: str, status: int, accept_encoding: Optional[str]
+) -> None:
+    messages = await _call(_streaming_app(chunks, content_type, status), accept_encoding)
+    assert "content-encoding" not in _headers(messages)
+    assert b"".join(message.get("body", b"") for message in messages[1:]) == b"".join(chunks)
+
+
+def test_negotiation_prefers_the_highest_q_value_then_the_server_order() -> None:
+    encodings = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, br", encodings) == "br"
+    assert negotiate_encoding("gzip;q=0.5, identity", encodings) == "gzip"
+    assert negotiate_encoding("*", encodings) == "zstd"
+    assert negotiate_encoding("identity", encodings) is None
+
+
+def test_streamed_export_is_compressed_end_to_end(client: TestClient) -> None:
+    client.post("/api/tasks/bulk", json={"items": [{"title": f"Compressed {n}"} for n in range(50)]})
+    plain = client.get("/api/tasks/export", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/tasks/export", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    # httpx decodes the body transparently
+    assert compressed.content == plain.content
+    assert int(compressed.num_bytes_downloaded) < len(plain.content)
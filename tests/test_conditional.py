@@ -0,0 +1,67 @@
+from typing import Callable, List
+
+from fastapi.testclient import TestClient
+
+
+def test_stale_if_match_is_rejected(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    task_id = create_tasks(1, "Guarded")[0]
+    etag = client.get(f"/api/tasks/{task_id}").headers["ETag"]
+
+    assert client.patch(f"/api/tasks/{task_id}", json={"title": "First"}, headers={"If-Match": etag}).status_code == 200
+    stale = client.patch(f"/api/tasks/{task_id}", json={"title": "Second"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert stale.json()["code"] == "PRECONDITION_FAILED"
+    assert client.delete(f"/api/tasks/{task_id}", headers={"If-Match": etag}).status_code == 412
+    assert client.get(f"/api/tasks/{task_id}").json()["title"] == "First"
+
+
+def test_if_none_match_returns_not_modified_until_the_task_changes(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    task_id = create_tasks(1, "Cached")[0]
+    etag = client.get(f"/api/tasks/{task_id}").headers["ETag"]
+
+    not_modified = client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    client.patch(f"/api/tasks/{task_id}", json={"completed": True})
+    assert client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_etag_changes_with_every_write(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    etag = client.get("/api/tasks").headers["ETag"]
+    assert client.get("/api/tasks", headers={"If-None-Match": etag}).status_code == 304
+    create_tasks(1, "Listed")
+    assert client.get("/api/tasks", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_if_modified_since_uses_the_last_modified_date(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    task_id = create_tasks(1, "Dated")[0]
+    last_modified = client.get(f"/api/tasks/{task_id}").headers["Last-Modified"]
+    assert client.get(f"/api/tasks/{task_id}", headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(
+        f"/api/tasks/{task_id}", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}
+    ).status_code == 200
+    # If-None-Match takes precedence over If-Modified-Since
+    assert client.get(
+        f"/api/tasks/{task_id}", headers={"If-Modified-Since": last_modified, "If-None-Match": '"0-0"'}
+    ).status_code == 200
+
+
+def test_if_match_accepts_any_listed_etag_or_a_wildcard(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    task_id = create_tasks(1, "Matched")[0]
+    etag = client.get(f"/api/tasks/{task_id}").headers["ETag"]
+    listed = client.patch(
+        f"/api/tasks/{task_id}", json={"completed": True}, headers={"If-Match": f'"{task_id}-99", {etag}'}
+    )
+    assert listed.status_code == 200
+    # Weak tags never match for writes
+    weak_etag = f"W/{listed.headers['ETag']}"
+    weak = client.patch(f"/api/tasks/{task_id}", json={"title": "Weak"}, headers={"If-Match": weak_etag})
+    assert weak.status_code == 412
+    assert client.delete(f"/api/tasks/{task_id}", headers={"If-Match": "*"}).status_code == 204
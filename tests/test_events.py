@@ -0,0 +1,142 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.config.settings import settings
+from app.controllers.task_controller import TaskController
+from app.services.task_events import DatabaseEventBroker, task_events
+from app.utils.events import RESET_EVENT, Event, InMemoryEventBroker, SubscriptionClosed, format_sse
+from main import create_app
+
+
+async def _publish(broker, count: int, event_type: str = "task.updated") -> None:
+    await broker.publish([(event_type, {"n": n}) for n in range(count)])
+
+
+def test_format_sse() -> None:
+    assert format_sse(Event(7, "task.deleted", {"id": 3})) == b'id: 7\nevent: task.deleted\ndata: {"id": 3}\n\n'
+
+
+@pytest.mark.anyio
+async def test_subscribers_receive_published_events_in_order() -> None:
+    broker = InMemoryEventBroker(buffer_size=10, history_size=10)
+    async with broker.subscribe() as subscription:
+        await _publish(broker, 3)
+        assert [(await subscription.get()).id for _ in range(3)] == [1, 2, 3]
+    assert broker.subscribers == 0
+
+
+@pytest.mark.anyio
+async def test_resuming_replays_the_events_after_last_event_id() -> None:
+    broker = InMemoryEventBroker(buffer_size=10, history_size=10)
+    await _publish(broker, 5)
+    async with broker.subscribe(last_event_id=3) as subscription:
+        await _publish(broker, 1, "task.deleted")
+        events = [await subscription.get() for _ in range(3)]
+    assert [(event.id, event.type) for event in events] == [(4, "task.updated"), (5, "task.updated"), (6, "task.deleted")]
+
+
+@pytest.mark.anyio
+async def test_resuming_past_the_history_sends_a_reset() -> None:
+    broker = InMemoryEventBroker(buffer_size=10, history_size=3)
+    await _publish(broker, 6)
+    for last_event_id in (1, 999):
+        async with broker.subscribe(last_event_id=last_event_id) as subscription:
+            event = await subscription.get()
+            assert (event.type, event.id) == (RESET_EVENT, 6)
+
+
+@pytest.mark.anyio
+async def test_slow_consumers_are_disconnected() -> None:
+    broker = InMemoryEventBroker(buffer_size=2, history_size=10)
+    async with broker.subscribe() as slow, broker.subscribe() as fast:
+        await _publish(broker, 2)
+        assert [(await fast.get()).id for _ in range(2)] == [1, 2]
+        await _publish(broker, 1)
+
+        with pytest.raises(SubscriptionClosed) as closed:
+            await slow.get()
+        assert closed.value.reason == "slow_consumer"
+        assert (await fast.get()).id == 3
+    assert broker.dropped == 1
+
+
+@pytest.mark.anyio
+async def test_database_broker_replays_from_the_shared_table() -> None:
+    publisher = DatabaseEventBroker(buffer_size=10, history_size=100, poll_interval=0.01)
+    await publisher.start()
+    try:
+        start = publisher.last_id
+        await _publish(publisher, 3)
+        # Another worker's broker sees the same IDs
+        reader = DatabaseEventBroker(buffer_size=10, history_size=100, poll_interval=0.01)
+        await reader.start()
+        try:
+            async with reader.subscribe(last_event_id=start + 1) as subscription:
+                events = [await subscription.get() for _ in range(2)]
+            assert [event.id for event in events] == [start + 2, start + 3]
+            async with reader.subscribe(last_event_id=start + 1000) as subscription:
+                assert (await subscription.get()).type == RESET_EVENT
+        finally:
+            await reader.stop()
+    finally:
+        await publisher.stop()
+
+
+@pytest.mark.anyio
+async def test_sse_stream_resumes_after_last_event_id_and_ends_on_shutdown() -> None:
+    broker = InMemoryEventBroker(buffer_size=10, history_size=10)
+    await _publish(broker, 3)
+    stream = TaskController._event_stream(broker.subscribe(last_event_id=1))
+    assert [await stream.__anext__() for _ in range(2)] == [
+        format_sse(Event(2, "task.updated", {"n": 1})),
+        format_sse(Event(3, "task.updated", {"n": 2})),
+    ]
+    await broker.stop()
+    assert [chunk async for chunk in stream] == []
+
+
+def test_websocket_feed_resumes_after_last_event_id(client: TestClient) -> None:
+    with client.websocket_connect("/api/tasks/events/ws") as websocket:
+        task = client.post("/api/tasks", json={"title": "Streamed"}).json()
+        created = websocket.receive_json()
+        assert created["type"] == "task.created" and created["data"]["id"] == task["id"]
+
+    client.patch(f"/api/tasks/{task['id']}", json={"completed": True})
+    client.delete(f"/api/tasks/{task['id']}")
+    with client.websocket_connect(f"/api/tasks/events/ws?last_event_id={created['id']}") as websocket:
+        updated, deleted = websocket.receive_json(), websocket.receive_json()
+    assert (updated["type"], updated["data"]["completed"]) == ("task.updated", True)
+    assert (deleted["type"], deleted["data"]) == ("task.deleted", {"id": task["id"]})
+    assert deleted["id"] == updated["id"] + 1 == created["id"] + 2
+
+
+def test_disabled_feed_refuses_subscribers(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(task_events, "enabled", False)
+    assert client.get("/api/tasks/events").status_code == 404
+    with pytest.raises(WebSocketDisconnect) as refused:
+        with client.websocket_connect("/api/tasks/events/ws"):
+            pass
+    assert refused.value.code == 1008
+
+
+@pytest.mark.anyio
+async def test_open_event_streams_leave_the_admission_slots_to_other_requests(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMISSION_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "ADMISSION_MAX_QUEUE", 0)
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # The response of an open stream never completes: keep it running in the background
+        stream = asyncio.create_task(client.get("/api/tasks/events"))
+        await asyncio.sleep(0.05)
+        try:
+            assert not stream.done()
+            assert (await client.get("/api/tasks/stats")).status_code == 200
+        finally:
+            stream.cancel()
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi.testclient import TestClient
+
+
+def _ids(client: TestClient, **params: object) -> List[int]:
+    response = client.get("/api/tasks", params={"limit": 100, **params})
+    assert response.status_code == 200
+    return [task["id"] for task in response.json()]
+
+
+def test_date_ranges_include_their_start_and_exclude_their_end(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    task_id = create_tasks(1, "Dated")[0]
+    created_at = datetime.fromisoformat(client.get(f"/api/tasks/{task_id}").json()["created_at"])
+    start, end = created_at.isoformat(), (created_at + timedelta(seconds=1)).isoformat()
+
+    assert task_id in _ids(client, created_after=start, created_before=end, sort="-created_at")
+    assert task_id not in _ids(client, created_before=start, sort="-created_at")
+    assert task_id not in _ids(client, created_after=end)
+    # Never updated: no updated_at to match
+    assert task_id not in _ids(client, updated_after=start, sort="-created_at")
+
+    client.patch(f"/api/tasks/{task_id}", json={"completed": True})
+    assert task_id in _ids(client, updated_after=start, completed=True, sort="-created_at")
+    assert task_id not in _ids(client, updated_after=start, completed=False, sort="-created_at")
+
+
+def _all_pages(client: TestClient, sort: str) -> List[dict]:
+    tasks: List[dict] = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/api/tasks", params={"cursor": cursor, "limit": 7, "sort": sort})
+        tasks.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+    return tasks
+
+
+def test_sorting_by_title_breaks_ties_by_id(client: TestClient) -> None:
+    items = [{"title": title} for title in ("Sort b", "Sort a", "Sort b", "Sort c")]
+    created = client.post("/api/tasks/bulk", json={"items": items}).json()["results"]
+    ids = {result["id"] for result in created}
+
+    skip_page = client.get("/api/tasks", params={"sort": "-title", "limit": 100}).json()
+    for sort in ("title", "-title"):
+        # Cursor pages neither repeat nor skip a row
+        keys = [(task["title"], task["id"]) for task in _all_pages(client, sort)]
+        assert keys == sorted(set(keys), reverse=sort.startswith("-"))
+        assert [key for key in keys if key[1] in ids] == sorted(
+            [(item["title"], result["id"]) for item, result in zip(items, created)], reverse=sort.startswith("-")
+        )
+    assert skip_page == _all_pages(client, "-title")[:100]
+
+
+def test_a_cursor_only_works_with_its_own_sort(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    create_tasks(3, "Mismatched")
+    by_title = client.get("/api/tasks", params={"cursor": "", "limit": 1, "sort": "title"})
+    by_id = client.get("/api/tasks", params={"cursor": "", "limit": 1})
+    title_cursor, id_cursor = by_title.headers["X-Next-Cursor"], by_id.headers["X-Next-Cursor"]
+
+    for cursor, sort in ((title_cursor, "id"), (title_cursor, "-title"), (id_cursor, "-created_at")):
+        response = client.get("/api/tasks", params={"cursor": cursor, "sort": sort})
+        assert response.status_code == 400
+        assert response.json()["code"] == "INVALID_CURSOR"
+
+
+def test_stats_follow_writes(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    before = client.get("/api/tasks/stats").json()
+    task_id = create_tasks(1, "Counted")[0]
+    client.patch(f"/api/tasks/{task_id}", json={"completed": True})
+    after = client.get("/api/tasks/stats").json()
+    assert after["total"] == before["total"] + 1
+    assert after["completed"] == before["completed"] + 1
+    assert after["pending"] == after["total"] - after["completed"]
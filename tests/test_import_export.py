@@ -0,0 +1,65 @@
+import csv
+import io
+from typing import AsyncIterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.utils.streaming import iter_csv_rows
+
+
+def _import(client: TestClient, body: bytes, file_format: str) -> dict:
+    response = client.post("/api/tasks/import", params={"format": file_format}, content=body)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_csv_round_trip_keeps_multi_line_and_comma_fields(client: TestClient) -> None:
+    tasks = [
+        {"title": "Commas, quotes and \"escapes\"", "description": "first line\nsecond line\r\n\nfourth, after a blank"},
+        {"title": "Plain", "description": "single line"},
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["title", "description"])
+    writer.writerows([task["title"], task["description"]] for task in tasks)
+    assert _import(client, buffer.getvalue().encode(), "csv") == {"imported": 2, "failed": 0, "errors": []}
+
+    exported = client.get("/api/tasks/export", params={"format": "csv"}).text
+    rows = list(csv.DictReader(io.StringIO(exported, newline="")))
+    imported = [row for row in rows if row["title"] in {task["title"] for task in tasks}]
+    assert [{"title": row["title"], "description": row["description"]} for row in imported] == tasks
+
+    # Importing the export again creates the same tasks (the id column is ignored)
+    before = client.get("/api/tasks/stats").json()["total"]
+    assert _import(client, exported.encode(), "csv")["imported"] == len(rows)
+    assert client.get("/api/tasks/stats").json()["total"] == before + len(rows)
+
+
+def test_csv_errors_report_the_row_line_numbers(client: TestClient) -> None:
+    body = b'title,completed\r\n"Spans\r\ntwo lines",true\r\n\r\n"Bad\r\nflag",maybe\r\n,false\r\n'
+    result = _import(client, body, "csv")
+    assert (result["imported"], result["failed"]) == (1, 2)
+    assert [error["line"] for error in result["errors"]] == [6, 7]
+
+
+def test_ndjson_import_skips_and_reports_invalid_lines(client: TestClient) -> None:
+    body = b'{"title": "Imported"}\n\n{"title": ""}\nnot json\n{"title": "Imported too"}'
+    result = _import(client, body, "ndjson")
+    assert (result["imported"], result["failed"]) == (2, 2)
+    assert [error["line"] for error in result["errors"]] == [3, 4]
+
+
+async def _lines(*lines: str) -> AsyncIterator[str]:
+    for line in lines:
+        yield line
+
+
+@pytest.mark.anyio
+async def test_an_unterminated_quote_is_reported_and_parsing_resumes() -> None:
+    lines = ["title\n", '"Never closed\n', "swallowed\n", "past the cap\n", "Next\n", '"Quoted",ok\n']
+    rows = [row async for row in iter_csv_rows(_lines(*lines), max_row_size=30)]
+    assert rows[0] == (1, ["title"])
+    line, error = rows[1]
+    assert line == 4 and isinstance(error, csv.Error)
+    assert rows[2:] == [(5, ["Next"]), (6, ["Quoted", "ok"])]
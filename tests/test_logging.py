@@ -0,0 +1,76 @@
+import json
+import logging
+import queue
+from time import perf_counter
+from typing import List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import logger as log_config
+from app.config.logger import (
+    DeferredQueueHandler, JsonFormatter, RateLimitFilter, RequestContextFilter, dropped_records
+)
+from app.utils.request_context import RequestContext, current_request
+
+
+def _record(message: str = "Failed", category: Optional[str] = None, **extra: object) -> logging.LogRecord:
+    fields = {"category": category, **extra} if category else extra
+    return logging.makeLogRecord({"name": "app", "levelname": "ERROR", "msg": message, **fields})
+
+
+def _dropped(reason: str) -> float:
+    return sum(value for _, labels, value in dropped_records.samples() if ("reason", reason) in labels)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    now = [1000.0]
+    monkeypatch.setattr(log_config, "monotonic", lambda: now[0])
+    return now
+
+
+def test_rate_limit_applies_per_category_and_reports_what_it_dropped(clock: List[float]) -> None:
+    limit = RateLimitFilter(limit=2, window=1)
+    dropped = _dropped("rate_limited")
+    assert [limit.filter(_record(category="DB_ERROR")) for _ in range(4)] == [True, True, False, False]
+    # Other categories and uncategorized records have their own budget
+    assert limit.filter(_record(category="NOT_FOUND"))
+    assert all(limit.filter(_record()) for _ in range(10))
+    assert _dropped("rate_limited") == dropped + 2
+
+    clock[0] += 1
+    record = _record(category="DB_ERROR")
+    assert limit.filter(record)
+    assert record.suppressed == 2
+    assert not hasattr(_record(category="DB_ERROR"), "suppressed")
+
+
+def test_a_full_queue_drops_records_instead_of_blocking() -> None:
+    handler = DeferredQueueHandler(queue.Queue(maxsize=1))
+    dropped = _dropped("queue_full")
+    handler.handle(_record("First"))
+    handler.handle(_record("Second"))
+    assert handler.queue.get_nowait().msg == "First"
+    assert _dropped("queue_full") == dropped + 1
+
+
+def test_json_records_carry_the_request_context_and_extras() -> None:
+    token = current_request.set(RequestContext(request_id="req-42", started=perf_counter()))
+    try:
+        record = _record("Task %s failed", category="DB_ERROR", task_id=7)
+        record.args = (7,)
+        RequestContextFilter().filter(record)
+    finally:
+        current_request.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert (entry["level"], entry["logger"], entry["message"]) == ("ERROR", "app", "Task 7 failed")
+    assert (entry["request_id"], entry["category"], entry["task_id"]) == ("req-42", "DB_ERROR", 7)
+    assert entry["elapsed_ms"] >= 0
+
+
+def test_responses_echo_a_well_formed_request_id(client: TestClient) -> None:
+    assert client.get("/healthz", headers={"X-Request-ID": "trace-1"}).headers["X-Request-ID"] == "trace-1"
+    generated = client.get("/healthz", headers={"X-Request-ID": "bad id\n"}).headers["X-Request-ID"]
+    assert generated != "bad id\n" and len(generated) == 32
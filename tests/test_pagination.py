@@ -0,0 +1,41 @@
+from typing import Callable, List
+
+from fastapi.testclient import TestClient
+
+
+def test_cursor_pages_have_no_duplicates_or_gaps_under_concurrent_inserts(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    existing = set(create_tasks(25, "Paged"))
+    seen: List[int] = []
+    cursor = ""
+    while True:
+        response = client.get("/api/tasks", params={"cursor": cursor, "limit": 7})
+        assert response.status_code == 200
+        seen.extend(task["id"] for task in response.json())
+        # Rows inserted between pages land after the cursor and must not shift it
+        create_tasks(3, "Concurrent")
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert existing <= set(seen)
+    assert seen == sorted(seen)
+
+
+def test_cursor_keeps_descending_sort_order(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    create_tasks(5, "Sorted")
+    first = client.get("/api/tasks", params={"cursor": "", "limit": 3, "sort": "-created_at"})
+    second = client.get(
+        "/api/tasks", params={"cursor": first.headers["X-Next-Cursor"], "limit": 3, "sort": "-created_at"}
+    )
+    pages = first.json() + second.json()
+    keys = [(task["created_at"], task["id"]) for task in pages]
+    assert keys == sorted(keys, reverse=True)
+    assert len({task["id"] for task in pages}) == 6
+
+
+def test_invalid_cursor_is_rejected(client: TestClient) -> None:
+    response = client.get("/api/tasks", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
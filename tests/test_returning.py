@@ -0,0 +1,44 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.task_service import TaskService
+
+
+@pytest.fixture(params=[True, False], ids=["returning", "fallback"])
+def returning(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    """
+    Run a test with RETURNING and again as on a database without it
+    """
+    if not request.param:
+        monkeypatch.setattr(TaskService, "_supports_returning", staticmethod(lambda db, statement: False))
+    return request.param
+
+
+def test_single_task_writes(client: TestClient, returning: bool) -> None:
+    created = client.post("/api/tasks", json={"title": "Returned", "description": "Row"})
+    assert created.status_code == 201
+    task = created.json()
+    assert (task["title"], task["completed"], task["version"]) == ("Returned", False, 1)
+    assert task["created_at"] is not None
+    assert client.get(f"/api/tasks/{task['id']}").json() == task
+
+    updated = client.patch(f"/api/tasks/{task['id']}", json={"completed": True})
+    assert updated.status_code == 200
+    assert (updated.json()["completed"], updated.json()["version"]) == (True, 2)
+    assert updated.json()["updated_at"] is not None
+
+    assert client.delete(f"/api/tasks/{task['id']}").status_code == 204
+    assert client.get(f"/api/tasks/{task['id']}").status_code == 404
+
+
+def test_missing_and_modified_tasks_are_told_apart(client: TestClient, returning: bool) -> None:
+    task = client.post("/api/tasks", json={"title": "Guarded"}).json()
+    stale = {"If-Match": f'"{task["id"]}-{task["version"] + 1}"'}
+
+    assert client.patch(f"/api/tasks/{task['id']}", json={"title": "New"}, headers=stale).status_code == 412
+    assert client.delete(f"/api/tasks/{task['id']}", headers=stale).status_code == 412
+    assert client.get(f"/api/tasks/{task['id']}").json()["title"] == "Guarded"
+
+    missing = 10_000_000
+    assert client.patch(f"/api/tasks/{missing}", json={"title": "New"}).status_code == 404
+    assert client.delete(f"/api/tasks/{missing}").status_code == 404
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from app.config import database
+from app.config.database import engine, init_schema, schema_fingerprint
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _user_version() -> int:
+    with engine.connect() as connection:
+        return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def _set_user_version(value: int) -> None:
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"PRAGMA user_version = {value}")
+
+
+@pytest.fixture
+def created(monkeypatch: pytest.MonkeyPatch) -> List[bool]:
+    """
+    Record the calls init_schema makes to create_tables
+    """
+    calls: List[bool] = []
+    create_tables = database.create_tables
+
+    def record() -> None:
+        calls.append(True)
+        create_tables()
+
+    monkeypatch.setattr(database, "create_tables", record)
+    return calls
+
+
+def test_check_mode_only_runs_the_ddl_when_the_fingerprint_changes(created: List[bool]) -> None:
+    _set_user_version(0)
+    init_schema("check")
+    assert _user_version() == schema_fingerprint()
+    assert created == [True]
+
+    # Up to date: a single pragma read, no DDL
+    init_schema("check")
+    assert created == [True]
+
+    # A model change shows up as a different fingerprint
+    _set_user_version(schema_fingerprint() ^ 1)
+    init_schema("check")
+    assert created == [True, True]
+    assert _user_version() == schema_fingerprint()
+
+
+def test_other_modes(created: List[bool]) -> None:
+    init_schema("skip")
+    assert created == []
+    init_schema("create")
+    assert created == [True]
+    with pytest.raises(ValueError):
+        init_schema("migrate")
+
+
+def test_fingerprint_is_stable_and_fits_user_version() -> None:
+    assert schema_fingerprint() == schema_fingerprint()
+    assert 0 <= schema_fingerprint() < 2**31
+
+
+def test_importing_the_app_defers_the_optional_modules(tmp_path: Path) -> None:
+    lazy = ("app.client.jsonplaceholder_client", "fastapi_healthz")
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'cold.db'}", "DB_SCHEMA_INIT": "skip"}
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, main; print([m for m in {lazy!r} if m in sys.modules])"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+    # Skipping the schema setup leaves a new database untouched
+    assert not (tmp_path / "cold.db").exists() or (tmp_path / "cold.db").stat().st_size == 0
@@ -0,0 +1,55 @@
+from typing import List
+
+from fastapi.testclient import TestClient
+
+
+def _search(client: TestClient, q: str, **params: object) -> List[dict]:
+    response = client.get("/api/tasks/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_title_matches_rank_before_description_matches(client: TestClient) -> None:
+    in_description = client.post(
+        "/api/tasks", json={"title": "Quarterly", "description": "Write the plumbago report"}
+    ).json()
+    in_title = client.post("/api/tasks", json={"title": "Plumbago report", "description": "Quarterly"}).json()
+    client.post("/api/tasks", json={"title": "Plumbago only"})
+
+    # Every word must match, as a prefix
+    assert [task["id"] for task in _search(client, "plumb rep")] == [in_title["id"], in_description["id"]]
+    assert _search(client, "plumbago missingword") == []
+
+
+def test_the_index_follows_updates_and_deletes(client: TestClient) -> None:
+    task = client.post("/api/tasks", json={"title": "Cormorant survey"}).json()
+    assert [found["id"] for found in _search(client, "cormorant")] == [task["id"]]
+
+    client.patch(f"/api/tasks/{task['id']}", json={"title": "Pelican survey"})
+    assert _search(client, "cormorant") == []
+    assert _search(client, "pelican")[0] == client.get(f"/api/tasks/{task['id']}").json()
+
+    client.delete(f"/api/tasks/{task['id']}")
+    assert _search(client, "pelican") == []
+
+
+def test_search_cursor_pages_follow_the_ranking(client: TestClient) -> None:
+    for n in range(5):
+        client.post("/api/tasks", json={"title": f"Heron count {n}", "description": "heron " * n})
+    expected = [task["id"] for task in _search(client, "heron")]
+    assert len(expected) == 5
+
+    seen: List[int] = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/api/tasks/search", params={"q": "heron", "cursor": cursor, "limit": 2})
+        seen.extend(task["id"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+    assert seen == expected
+    assert client.get("/api/tasks/search", params={"q": "heron", "cursor": "bogus"}).status_code == 400
+
+
+def test_query_syntax_is_not_interpreted(client: TestClient) -> None:
+    client.post("/api/tasks", json={"title": "Egret NOT ignored"})
+    assert len(_search(client, 'egret "NOT*" (')) == 1
+    assert _search(client, "*** ()") == []
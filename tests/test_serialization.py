@@ -0,0 +1,53 @@
+import json
+from datetime import datetime, timezone
+from typing import Callable, List
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.utils import responses
+from app.utils.responses import FastJSONResponse, default_response_class, json_dumps
+
+ROW = {
+    "id": 1,
+    "title": "Ünïcode",
+    "description": None,
+    "completed": True,
+    "created_at": datetime(2024, 5, 1, 12, 30, 15, 250000),
+    "updated_at": datetime(2024, 5, 2, tzinfo=timezone.utc),
+    "version": 3,
+}
+
+
+def test_json_dumps_matches_with_and_without_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    fast = json.loads(json_dumps([ROW]))
+    monkeypatch.setattr(responses, "orjson", None)
+    stdlib = json.loads(json_dumps([ROW]))
+    assert fast[0]["created_at"] == stdlib[0]["created_at"] == "2024-05-01T12:30:15.250000"
+    assert fast[0]["title"] == stdlib[0]["title"] == "Ünïcode"
+    assert fast[0]["updated_at"].startswith("2024-05-02T00:00:00")
+    assert {key: value for key, value in fast[0].items() if key != "updated_at"} == {
+        key: value for key, value in stdlib[0].items() if key != "updated_at"
+    }
+
+
+def test_default_response_class_setting() -> None:
+    assert default_response_class("fast") is FastJSONResponse
+    assert default_response_class("json") is JSONResponse
+    with pytest.raises(ValueError):
+        default_response_class("xml")
+
+
+def test_list_rows_are_rendered_like_the_task_model(
+    client: TestClient, create_tasks: Callable[..., List[int]]
+) -> None:
+    task_id = create_tasks(1, "Serialized")[0]
+    client.patch(f"/api/tasks/{task_id}", json={"description": "Set, so updated_at is too"})
+    # The single-task route goes through TaskResponse, the list routes render rows directly
+    expected = client.get(f"/api/tasks/{task_id}").json()
+
+    offset_page = client.get("/api/tasks", params={"skip": 0, "limit": 100, "sort": "-created_at"}).json()
+    cursor_page = client.get("/api/tasks", params={"cursor": "", "limit": 100, "sort": "-created_at"}).json()
+    for page in (offset_page, cursor_page):
+        assert next(task for task in page if task["id"] == task_id) == expected
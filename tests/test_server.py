@@ -0,0 +1,49 @@
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from app import server
+from app.config.logger import logger
+from app.config.settings import settings
+
+
+def test_migrating_keeps_the_launcher_logging(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    database = tmp_path / "migrated.db"
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{database}")
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "TASK_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "EVENTS_ENABLED", True)
+    monkeypatch.setattr(settings, "EVENTS_BROKER", "memory")
+    # The launcher passes its decisions to the workers through the environment
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    served: Dict[str, Any] = {}
+    monkeypatch.setattr(server.uvicorn, "run", lambda app, **options: served.update(app=app, **options))
+
+    with caplog.at_level(logging.INFO, logger="app"):
+        server.run(workers=3, migrate=True)
+
+    assert not logger.disabled
+    messages = [record.getMessage() for record in caplog.records if record.name == "app"]
+    assert any("Task read cache disabled" in message for message in messages)
+    assert any("Task change feed shared through the database" in message for message in messages)
+    assert any(message.startswith("Starting 3 worker(s)") for message in messages)
+
+    assert (served["app"], served["workers"]) == ("main:app", 3)
+    assert os.environ["DB_SCHEMA_INIT"] == "skip"
+    assert os.environ["TASK_CACHE_ENABLED"] == "False" and os.environ["EVENTS_BROKER"] == "database"
+    tables = {name for (name,) in sqlite3.connect(database).execute("SELECT name FROM sqlite_master")}
+    assert {"alembic_version", "tasks", "task_changes"} <= tables
+
+
+def test_worker_count_prefers_the_request_then_the_setting(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "WORKERS", 2)
+    assert server.worker_count(5) == 5
+    assert server.worker_count() == 2
+    monkeypatch.setattr(settings, "WORKERS", 0)
+    assert server.worker_count() == (os.cpu_count() or 1)
@@ -0,0 +1,68 @@
+from typing import Any, Callable, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.task_cache import TaskCache, task_cache
+from app.utils.cache import InMemoryCacheBackend
+
+
+def _loader(*values: Any) -> Callable[[], Any]:
+    remaining = list(values)
+
+    async def load() -> Any:
+        return remaining.pop(0)
+
+    return load
+
+
+@pytest.mark.anyio
+async def test_reads_are_cached_until_the_task_is_written() -> None:
+    cache = TaskCache(InMemoryCacheBackend(100), ttl=60)
+    load = _loader("v1", "v2")
+    assert await cache.get_task(1, load) == "v1"
+    assert await cache.get_task(1, load) == "v1"
+
+    await cache.invalidate([1])
+    assert await cache.get_task(1, load) == "v2"
+    assert (cache.stats()["task"]["hits"], cache.stats()["task"]["misses"]) == (1, 2)
+
+
+@pytest.mark.anyio
+async def test_any_write_invalidates_every_list_page() -> None:
+    cache = TaskCache(InMemoryCacheBackend(100), ttl=60)
+    load = _loader(["page 1"], ["page 1 after the write"])
+    assert await cache.get_list("limit=10", load) == ["page 1"]
+    assert await cache.get_list("limit=10", load) == ["page 1"]
+
+    # A write to an unrelated task still changes what the list shows
+    await cache.invalidate([42])
+    assert await cache.get_list("limit=10", load) == ["page 1 after the write"]
+
+
+@pytest.mark.anyio
+async def test_a_read_racing_a_write_is_not_cached() -> None:
+    cache = TaskCache(InMemoryCacheBackend(100), ttl=60)
+
+    async def read_then_write() -> str:
+        # The write commits (and invalidates) after this read saw the old row
+        await cache.invalidate([1])
+        return "stale"
+
+    assert await cache.get_task(1, read_then_write) == "stale"
+    assert await cache.get_task(1, _loader("fresh")) == "fresh"
+
+
+def test_api_reads_see_every_write(client: TestClient, create_tasks: Callable[..., List[int]]) -> None:
+    task_id = create_tasks(1, "Cached read")[0]
+    hits = task_cache.stats().get("task", {}).get("hits", 0)
+    assert client.get(f"/api/tasks/{task_id}").json()["completed"] is False
+    assert client.get(f"/api/tasks/{task_id}").json()["completed"] is False
+    assert task_cache.stats()["task"]["hits"] == hits + 1
+
+    client.patch(f"/api/tasks/{task_id}", json={"completed": True})
+    assert client.get(f"/api/tasks/{task_id}").json()["completed"] is True
+    client.patch("/api/tasks/bulk", json={"items": [{"id": task_id, "title": "Renamed in bulk"}]})
+    assert client.get(f"/api/tasks/{task_id}").json()["title"] == "Renamed in bulk"
+    client.request("DELETE", "/api/tasks/bulk", json={"ids": [task_id]})
+    assert client.get(f"/api/tasks/{task_id}").status_code == 404
@@ -0,0 +1,17 @@
+from fastapi.testclient import TestClient
+
+
+def test_create_get_update_delete(client: TestClient) -> None:
+    created = client.post("/api/tasks", json={"title": "Write tests", "description": "CRUD"})
+    assert created.status_code == 201
+    task = created.json()
+    assert task["completed"] is False and task["version"] == 1
+
+    updated = client.patch(f"/api/tasks/{task['id']}", json={"completed": True})
+    assert updated.status_code == 200
+    assert updated.json()["completed"] is True and updated.json()["version"] == 2
+
+    assert client.delete(f"/api/tasks/{task['id']}").status_code == 204
+    missing = client.get(f"/api/tasks/{task['id']}")
+    assert missing.status_code == 404
+    assert missing.json()["code"] == "NOT_FOUND"
@@ -0,0 +1,124 @@
+import asyncio
+from typing import Iterator, List, Optional
+
+import httpx
+import pytest
+
+from app.client.cache import NOT_MODIFIED, UpstreamCache
+from app.client.jsonplaceholder_client import JSONPlaceholderClient
+from app.config.settings import settings
+
+POST = {"userId": 1, "id": 1, "title": "Cached", "body": "From the stub"}
+
+
+class _Loader:
+    """Loader that records the validators it was called with and answers from a script"""
+
+    def __init__(self, *results: object, delay: float = 0) -> None:
+        self.results = list(results)
+        self.etags: List[Optional[str]] = []
+        self.delay = delay
+
+    async def __call__(self, etag: Optional[str]) -> object:
+        self.etags.append(etag)
+        await asyncio.sleep(self.delay)
+        return self.results.pop(0)
+
+
+@pytest.mark.anyio
+async def test_fresh_entries_are_served_from_memory() -> None:
+    cache = UpstreamCache(max_entries=10)
+    loader = _Loader(({"n": 1}, '"v1"'))
+    assert await cache.fetch("/posts", 60, loader) == {"n": 1}
+    assert await cache.fetch("/posts", 60, loader) == {"n": 1}
+    assert loader.etags == [None]
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_share_one_upstream_request() -> None:
+    cache = UpstreamCache(max_entries=10)
+    loader = _Loader(({"n": 1}, None), delay=0.05)
+    results = await asyncio.gather(*(cache.fetch("/posts", 60, loader) for _ in range(5)))
+    assert results == [{"n": 1}] * 5
+    assert len(loader.etags) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+@pytest.mark.anyio
+async def test_a_cancelled_caller_does_not_cancel_the_shared_load() -> None:
+    cache = UpstreamCache(max_entries=10)
+    loader = _Loader(({"n": 1}, None), delay=0.05)
+    first = asyncio.create_task(cache.fetch("/posts", 60, loader))
+    second = asyncio.create_task(cache.fetch("/posts", 60, loader))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == {"n": 1}
+    assert first.cancelled() and len(loader.etags) == 1
+
+
+@pytest.mark.anyio
+async def test_expired_entries_are_revalidated_with_their_etag() -> None:
+    cache = UpstreamCache(max_entries=10)
+    loader = _Loader(({"n": 1}, '"v1"'), NOT_MODIFIED, ({"n": 2}, '"v2"'))
+    assert await cache.fetch("/posts", 0, loader) == {"n": 1}
+    # 304: the stale payload is served again
+    assert await cache.fetch("/posts", 0, loader) == {"n": 1}
+    assert await cache.fetch("/posts", 0, loader) == {"n": 2}
+    assert loader.etags == [None, '"v1"', '"v1"']
+    assert cache.stats()["revalidated"] == 1
+
+
+@pytest.mark.anyio
+async def test_a_304_without_a_cached_copy_is_fetched_again_in_full() -> None:
+    cache = UpstreamCache(max_entries=10)
+    loader = _Loader(NOT_MODIFIED, ({"n": 1}, '"v1"'))
+    assert await cache.fetch("/posts", 60, loader) == {"n": 1}
+    assert loader.etags == [None, None]
+    assert cache.stats()["revalidated"] == 0
+
+    with pytest.raises(RuntimeError):
+        await cache.fetch("/other", 60, _Loader(NOT_MODIFIED, NOT_MODIFIED))
+
+
+@pytest.mark.anyio
+async def test_lru_eviction_and_invalidation() -> None:
+    cache = UpstreamCache(max_entries=2)
+    for key in ("/a", "/b", "/c"):
+        await cache.fetch(key, 60, _Loader((key, None)))
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
+
+    cache.invalidate("/c")
+    loader = _Loader(("/c again", None))
+    assert await cache.fetch("/c", 60, loader) == "/c again"
+
+
+@pytest.fixture
+def upstream(monkeypatch: pytest.MonkeyPatch) -> Iterator[List[httpx.Request]]:
+    """
+    Route JSONPlaceholderClient to a stub answering with ETags and 304s, with an empty cache
+    """
+    requests: List[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"post-1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=POST, headers={"ETag": '"post-1"'})
+
+    monkeypatch.setattr(JSONPlaceholderClient, "_cache", UpstreamCache(max_entries=10))
+    JSONPlaceholderClient.configure(httpx.AsyncClient(transport=httpx.MockTransport(handle)))
+    yield requests
+    JSONPlaceholderClient.configure(None)
+
+
+@pytest.mark.anyio
+async def test_client_revalidates_expired_posts(
+    upstream: List[httpx.Request], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "UPSTREAM_CACHE_TTL_POST", 0)
+    first = await JSONPlaceholderClient.get_post(1)
+    second = await JSONPlaceholderClient.get_post(1)
+    assert first == second and first.title == "Cached"
+    assert [request.headers.get("If-None-Match") for request in upstream] == [None, '"post-1"']
+    assert JSONPlaceholderClient.cache_stats()["revalidated"] == 1
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+from app.config.database import DbSession, session_scope
+from app.models.task import Task
+from app.services.write_batcher import WriteBatcher, batch_size, write_batcher
+
+
+def _insert(title: str, error: Optional[Exception] = None):
+    async def op(db: DbSession) -> int:
+        task_id = await db.scalar(insert(Task).values(title=title).returning(Task.id))
+        if error is not None:
+            raise error
+        return task_id
+
+    return op
+
+
+async def _titles(prefix: str) -> set:
+    async with session_scope() as db:
+        return set(await db.scalars(select(Task.title).where(Task.title.startswith(prefix))))
+
+
+@pytest.mark.anyio
+async def test_concurrent_writes_are_committed_together() -> None:
+    batcher = WriteBatcher(max_size=10, window=0.05)
+    batcher.start()
+    try:
+        ids = await asyncio.gather(*(batcher.submit(_insert(f"Grouped {i}")) for i in range(5)))
+    finally:
+        await batcher.stop()
+    assert len(set(ids)) == 5
+    assert await _titles("Grouped") == {f"Grouped {i}" for i in range(5)}
+
+
+@pytest.mark.anyio
+async def test_a_failing_write_only_rolls_back_itself() -> None:
+    batcher = WriteBatcher(max_size=10, window=0.05)
+    batcher.start()
+    try:
+        results = await asyncio.gather(
+            batcher.submit(_insert("Isolated ok 1")),
+            batcher.submit(_insert("Isolated failing", ValueError("rejected"))),
+            batcher.submit(_insert("Isolated ok 2")),
+            return_exceptions=True,
+        )
+    finally:
+        await batcher.stop()
+
+    assert isinstance(results[0], int) and isinstance(results[2], int)
+    assert isinstance(results[1], ValueError)
+    # The failing write's insert ran inside its own savepoint and is gone; the others are committed
+    assert await _titles("Isolated") == {"Isolated ok 1", "Isolated ok 2"}
+
+
+@pytest.mark.anyio
+async def test_stop_flushes_the_queued_writes() -> None:
+    batcher = WriteBatcher(max_size=100, window=10)
+    batcher.start()
+    pending = [asyncio.create_task(batcher.submit(_insert(f"Flushed {i}"))) for i in range(3)]
+    await asyncio.sleep(0)
+    await batcher.stop()
+    assert all(isinstance(task_id, int) for task_id in await asyncio.gather(*pending))
+    assert len(await _titles("Flushed")) == 3
+
+
+def _batches_and_writes() -> Tuple[float, float]:
+    samples = {suffix: value for suffix, _, value in batch_size.samples() if suffix in ("_count", "_sum")}
+    return samples.get("_count", 0), samples.get("_sum", 0)
+
+
+def test_api_writes_share_commits_and_keep_their_own_outcome(
+    make_client: Callable[..., TestClient], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(write_batcher, "window", 0.05)
+    client = make_client(WRITE_BATCH_ENABLED=True)
+    assert write_batcher.running
+    guarded = client.post("/api/tasks", json={"title": "Batched guarded"}).json()
+    batches, writes = _batches_and_writes()
+
+    requests = [lambda n=n: client.post("/api/tasks", json={"title": f"Batched {n}"}) for n in range(10)]
+    requests.append(
+        lambda: client.patch(
+            f"/api/tasks/{guarded['id']}", json={"title": "Lost"}, headers={"If-Match": f'"{guarded["id"]}-9"'}
+        )
+    )
+    requests.append(lambda: client.delete("/api/tasks/10000000"))
+    barrier = threading.Barrier(len(requests))
+
+    def send(request: Callable[[], httpx.Response]) -> httpx.Response:
+        barrier.wait()
+        return request()
+
+    with ThreadPoolExecutor(len(requests)) as pool:
+        responses = list(pool.map(send, requests))
+
+    assert [response.status_code for response in responses] == [201] * 10 + [412, 404]
+    assert len({response.json()["id"] for response in responses[:10]}) == 10
+    assert client.get(f"/api/tasks/{guarded['id']}").json()["title"] == "Batched guarded"
+    after_batches, after_writes = _batches_and_writes()
+    assert after_writes - writes == len(requests)
+    assert after_batches - batches < len(requests)